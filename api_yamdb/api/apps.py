@@ -3,3 +3,11 @@ from django.apps import AppConfig
 
 class ApiConfig(AppConfig):
     name = 'api'
+
+    def ready(self):
+        from django.core.signals import request_started
+
+        from . import signals  # noqa: F401
+        from .connections import check_connections
+
+        request_started.connect(check_connections)
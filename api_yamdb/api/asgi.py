@@ -0,0 +1,170 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.urls import Resolver404, resolve
+
+# Эндпоинты чтения с отдельным пулом потоков
+READ_VIEWS = {'title-list', 'title-detail', 'review-list', 'comments-list'}
+READ_METHODS = {'GET', 'HEAD'}
+# Сколько частей потокового ответа ждут отправки, пока поток не встанет
+STREAM_BUFFER = 8
+END = object()
+
+
+def build_environ(scope, body):
+    """WSGI environ из ASGI scope, как в asgiref.wsgi."""
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode().decode('latin1'),
+        'PATH_INFO': scope['path'].encode().decode('latin1'),
+        'QUERY_STRING': scope['query_string'].decode('ascii'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f'HTTP/{scope["http_version"]}',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': BytesIO(),
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin1').upper().replace('-', '_')
+        if name not in ('CONTENT_LENGTH', 'CONTENT_TYPE'):
+            name = f'HTTP_{name}'
+        value = value.decode('latin1')
+        environ[name] = (
+            f'{environ[name]},{value}' if name in environ else value
+        )
+    return environ
+
+
+def is_read(scope):
+    if scope['method'] not in READ_METHODS:
+        return False
+    try:
+        match = resolve(scope['path'])
+    except Resolver404:
+        return False
+    return match.url_name in READ_VIEWS
+
+
+class ThreadPoolASGIHandler:
+    """ASGI-приложение поверх синхронного WSGI-обработчика Django.
+
+    Django 2.2 не поддерживает асинхронные представления, поэтому запрос
+    целиком (middleware, представление, ORM) выполняется в пуле потоков,
+    а приём запроса и отправка ответа идут в цикле событий. Поток
+    освобождается, как только ответ готов, и медленный клиент его не
+    держит. Чтение из READ_VIEWS получает свой пул ASGI_READ_THREADS,
+    остальные запросы — пул ASGI_THREADS. Если клиент отключился,
+    поток перестаёт читать потоковый ответ и закрывает его.
+    """
+
+    def __init__(self, wsgi_application):
+        self.wsgi_application = wsgi_application
+        self.read_pool = ThreadPoolExecutor(
+            settings.ASGI_READ_THREADS, thread_name_prefix='asgi-read'
+        )
+        self.pool = ThreadPoolExecutor(
+            settings.ASGI_THREADS, thread_name_prefix='asgi'
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        if scope['type'] != 'http':
+            raise ValueError(f'Unsupported ASGI scope type {scope["type"]}')
+        body = BytesIO()
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body.write(message.get('body', b''))
+            if not message.get('more_body'):
+                break
+        body.seek(0)
+
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=STREAM_BUFFER)
+        disconnected = threading.Event()
+        task = loop.run_in_executor(
+            self.read_pool if is_read(scope) else self.pool,
+            self.run_wsgi, build_environ(scope, body), queue, loop,
+            disconnected,
+        )
+        watcher = asyncio.ensure_future(
+            self.wait_disconnect(receive, disconnected)
+        )
+        try:
+            message = await queue.get()
+            while message is not END:
+                await send(message)
+                message = await queue.get()
+        except BaseException:
+            # Поток перестаёт читать ответ и закрывает его; очередь
+            # дочитывается только до этого, чтобы освободить его put
+            disconnected.set()
+            while await queue.get() is not END:
+                pass
+            raise
+        finally:
+            watcher.cancel()
+        await task
+
+    @staticmethod
+    async def wait_disconnect(receive, disconnected):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+        disconnected.set()
+
+    def run_wsgi(self, environ, queue, loop, disconnected):
+        def put(message):
+            asyncio.run_coroutine_threadsafe(queue.put(message), loop).result()
+
+        start = {'type': 'http.response.start'}
+
+        def start_response(status, headers, exc_info=None):
+            start['status'] = int(status.split(' ', 1)[0])
+            start['headers'] = [
+                (name.lower().encode('latin1'), value.encode('latin1'))
+                for name, value in headers
+            ]
+
+        try:
+            response = self.wsgi_application(environ, start_response)
+            send_body = environ['REQUEST_METHOD'] != 'HEAD'
+            try:
+                put(start)
+                for chunk in response:
+                    if disconnected.is_set():
+                        # Клиент ушёл: остаток потокового ответа не нужен
+                        return
+                    if chunk and send_body:
+                        put({'type': 'http.response.body', 'body': chunk,
+                             'more_body': True})
+            finally:
+                # Сигнал request_finished закрывает соединения с БД
+                # этого потока
+                response.close()
+            put({'type': 'http.response.body'})
+        finally:
+            put(END)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.read_pool.shutdown(wait=False)
+                self.pool.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
@@ -0,0 +1,102 @@
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import Roles
+
+from .cache import get_state, invalidate
+
+# Утверждения токена, которых достаточно классам разрешений API
+USER_CLAIMS = ('role', 'is_superuser', 'is_staff')
+TOKEN_VERSION_CLAIM = 'token_version'
+
+
+def tokens_group(user_id):
+    return f'tokens:{user_id}'
+
+
+def get_access_token(user):
+    """Access-токен с ролью, флагами и версией токенов пользователя."""
+    token = AccessToken.for_user(user)
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    token[TOKEN_VERSION_CLAIM] = get_state((tokens_group(user.pk),))[0][0]
+    return token
+
+
+def revoke_user_tokens(user_id):
+    """Отзывает все выданные пользователю токены.
+
+    Версия увеличивается в таблице CacheVersion и после фиксации
+    записывается в общий кеш версий, поэтому отзыв виден всем воркерам,
+    а токены, выданные после него, действуют.
+    """
+    invalidate(tokens_group(user_id))
+
+
+def is_revoked(token):
+    """Отозван ли токен: версия из кеша версий, при промахе — из БД."""
+    if TOKEN_VERSION_CLAIM not in token:
+        # Токены без версии выданы до её появления и проверяются по БД
+        return False
+    versions, _ = get_state((tokens_group(token[api_settings.USER_ID_CLAIM]),))
+    return token[TOKEN_VERSION_CLAIM] != versions[0]
+
+
+class ClaimsUser(TokenUser):
+    """Пользователь, собранный из утверждений токена без запроса к БД."""
+
+    def __eq__(self, other):
+        return self.id == getattr(other, 'pk', None)
+
+    def __hash__(self):
+        return hash(self.id)
+
+    @cached_property
+    def role(self):
+        return self.token['role']
+
+    @property
+    def is_admin(self):
+        return self.role == Roles.ADMIN
+
+    @property
+    def is_moderator(self):
+        return self.role == Roles.MODERATOR
+
+    @property
+    def is_user(self):
+        return self.role == Roles.USER
+
+    @cached_property
+    def model(self):
+        """Полная модель пользователя, загружается при первом обращении."""
+        return get_user_model().objects.get(pk=self.id)
+
+
+def get_full_user(user):
+    """Модель пользователя для мест, где утверждений токена недостаточно."""
+    return user.model if isinstance(user, ClaimsUser) else user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация без загрузки пользователя из БД.
+
+    Токены без утверждений о роли (выданные до появления этого класса)
+    проверяются по-старому, через запрос пользователя.
+    """
+
+    def get_user(self, validated_token):
+        if is_revoked(validated_token):
+            raise InvalidToken('Token has been revoked')
+        if not all(claim in validated_token for claim in USER_CLAIMS):
+            return super().get_user(validated_token)
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(
+                'Token contained no recognizable user identification'
+            )
+        return ClaimsUser(validated_token)
@@ -0,0 +1,81 @@
+from django.db import connection, transaction
+
+from reviews.models import Category, Genre, GenreTitle, Title
+
+from .cache import TITLES_LIST, invalidate
+from .serializers import TitleWriteSerializer
+
+BATCH_SIZE = 500
+
+
+def collect_slugs(items, name):
+    """Строковые slug поля name из всех элементов пачки."""
+    slugs = set()
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        value = item.get(name)
+        for slug in value if isinstance(value, list) else [value]:
+            if isinstance(slug, str):
+                slugs.add(slug)
+    return slugs
+
+
+def prefetch_slugs(items):
+    """Категории и жанры пачки, по одному запросу на модель."""
+    return {
+        model: {
+            obj.slug: obj for obj in model.objects.filter(
+                slug__in=collect_slugs(items, name)
+            )
+        }
+        for model, name in ((Category, 'category'), (Genre, 'genre'))
+    }
+
+
+def save_titles(titles):
+    if connection.features.can_return_ids_from_bulk_insert:
+        return Title.objects.bulk_create(titles, batch_size=BATCH_SIZE)
+    # Без RETURNING (SQLite) id новых строк неизвестны, а они нужны
+    # для связей с жанрами
+    for title in titles:
+        title.save()
+    return titles
+
+
+def create_titles(items, context):
+    """Создаёт произведения пачкой, возвращает результат по каждому.
+
+    Элементы проверяются TitleWriteSerializer; slug категорий и жанров
+    разрешаются заранее, а корректные элементы записываются через
+    bulk_create в одной транзакции. Некорректные элементы пропускаются
+    и возвращаются с ошибками.
+    """
+    context = {**context, 'prefetched': prefetch_slugs(items)}
+    results = []
+    valid = []
+    for index, item in enumerate(items):
+        serializer = TitleWriteSerializer(data=item, context=context)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            results.append({'index': index, 'status': 400,
+                            'errors': serializer.errors})
+    if not valid:
+        return results
+    with transaction.atomic():
+        titles = save_titles([
+            Title(**{field: value for field, value in data.items()
+                     if field != 'genre'})
+            for _, data in valid
+        ])
+        GenreTitle.objects.bulk_create([
+            GenreTitle(title_id=title, genre_id=genre)
+            for title, (_, data) in zip(titles, valid)
+            for genre in dict.fromkeys(data['genre'])
+        ], batch_size=BATCH_SIZE)
+        # bulk_create не отправляет сигналы, списки сбрасываются здесь
+        invalidate(TITLES_LIST)
+    results.extend({'index': index, 'status': 201, 'id': title.id}
+                   for title, (index, _) in zip(titles, valid))
+    return sorted(results, key=lambda result: result['index'])
@@ -0,0 +1,188 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.response import Response
+
+from reviews.models import CacheVersion
+
+KEY_PREFIX = 'api-cache'
+COUNTERS = ('hits', 'misses')
+
+# Группы ключей: ответы хранятся под текущими версиями своих групп,
+# и инвалидация группы — это увеличение её версии. Версии лежат в БД и
+# в общем кеше CACHE_VERSION_ALIAS, а сами ответы — в кеше
+# API_CACHE_ALIAS, который может быть своим у каждого воркера:
+# устаревшие записи просто перестают читаться.
+CATEGORIES = 'categories'
+GENRES = 'genres'
+TITLES_LIST = 'titles-list'
+TITLES_ALL = 'titles-all'
+
+
+def title_group(title_id):
+    return f'title:{title_id}'
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def get_version_cache():
+    return caches[settings.CACHE_VERSION_ALIAS]
+
+
+def version_key(group):
+    return f'{KEY_PREFIX}:version:{group}'
+
+
+def new_version():
+    # Начальная версия зависит от времени, чтобы после пересоздания БД не
+    # ожили ответы, закешированные со старыми версиями
+    return time.time_ns()
+
+
+def load_state(groups):
+    """Читает версии групп из БД и кладёт их в кеш версий.
+
+    Группа без строки в CacheVersion ещё не инвалидировалась и имеет
+    версию 0: чтение ничего не пишет в БД.
+    """
+    state = {group: (0, None) for group in groups}
+    state.update(
+        (group, (version, modified and modified.timestamp()))
+        for group, version, modified in CacheVersion.objects.filter(
+            group__in=groups
+        ).values_list('group', 'version', 'modified')
+    )
+    get_version_cache().set_many(
+        {version_key(group): value for group, value in state.items()},
+        timeout=settings.CACHE_VERSION_TIMEOUT,
+    )
+    return state
+
+
+def get_state(groups):
+    """Версии групп и время их последней инвалидации (unix time) или None.
+
+    Версии берутся из кеша CACHE_VERSION_ALIAS, а при промахе читаются
+    одним запросом из общей для всех воркеров таблицы CacheVersion.
+    """
+    keys = {group: version_key(group) for group in groups}
+    cached = get_version_cache().get_many(list(keys.values()))
+    state = {group: cached[key] for group, key in keys.items()
+             if key in cached}
+    missing = [group for group in groups if group not in state]
+    if missing:
+        state.update(load_state(missing))
+    modified = [modified for _, modified in state.values()
+                if modified is not None]
+    return (
+        [state[group][0] for group in groups],
+        max(modified) if modified else None,
+    )
+
+
+def invalidate(*groups):
+    """Увеличивает версии групп.
+
+    Вызванная в транзакции записи, инвалидация фиксируется вместе с
+    данными: ответ, прочитанный до фиксации, кешируется под старой
+    версией и больше не отдаётся. Новые версии попадают в кеш версий
+    после фиксации, до неё их ключи удалены и читаются из БД.
+    """
+    now = timezone.now()
+    CacheVersion.objects.bulk_create(
+        [CacheVersion(group=group, version=new_version(), modified=now)
+         for group in groups],
+        ignore_conflicts=True,
+    )
+    CacheVersion.objects.filter(group__in=groups).update(
+        version=F('version') + 1, modified=now
+    )
+    get_version_cache().delete_many([version_key(group) for group in groups])
+    transaction.on_commit(lambda: load_state(groups))
+
+
+def count(counter, name):
+    cache = get_cache()
+    key = f'{KEY_PREFIX}:{counter}:{name}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+def get_stats(names):
+    cache = get_cache()
+    keys = {
+        (name, counter): f'{KEY_PREFIX}:{counter}:{name}'
+        for name in names for counter in COUNTERS
+    }
+    values = cache.get_many(keys.values())
+    return {
+        name: {counter: values.get(keys[name, counter], 0)
+               for counter in COUNTERS}
+        for name in names
+    }
+
+
+def get_role(user):
+    if not user.is_authenticated:
+        return 'anonymous'
+    if user.is_superuser:
+        return 'superuser'
+    return user.role
+
+
+def build_key(request, versions):
+    versions = '.'.join(str(version) for version in versions)
+    path = hashlib.md5(
+        request.get_full_path().encode('utf-8')
+    ).hexdigest()
+    return f'{KEY_PREFIX}:{get_role(request.user)}:{versions}:{path}'
+
+
+class CachedResponseMixin:
+    """Кеширует ответы list и retrieve в кеше API_CACHE_ALIAS.
+
+    Ключ строится из пути, строки запроса, роли пользователя и версий
+    групп, которые возвращает get_cache_groups.
+    """
+    cache_groups = ()
+
+    def get_cache_groups(self):
+        return self.cache_groups
+
+    def get_cache_state(self):
+        """Результат get_state для групп представления, один на запрос."""
+        if not hasattr(self, '_cache_state'):
+            self._cache_state = get_state(self.get_cache_groups())
+        return self._cache_state
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request,
+                                    *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        key = build_key(request, self.get_cache_state()[0])
+        data = get_cache().get(key)
+        if data is not None:
+            count('hits', self.basename)
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        count('misses', self.basename)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            get_cache().set(key, response.data,
+                            timeout=settings.API_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
@@ -0,0 +1,137 @@
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP = 'gzip'
+BROTLI = 'br'
+# Типы ответов, которые сжимаются; картинки и архивы уже сжаты
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/json', 'application/javascript',
+    'application/xml', 'application/x-ndjson',
+)
+
+
+def get_compressor(encoding, level):
+    """Пара функций (сжать порцию, завершить поток) для кодировки."""
+    if encoding == BROTLI:
+        compressor = brotli.Compressor(quality=level)
+        return compressor.process, compressor.finish
+    # wbits 16 + MAX_WBITS — заголовок gzip с нулевым mtime
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress, compressor.flush
+
+
+def compress(data, encoding, level):
+    process, finish = get_compressor(encoding, level)
+    return process(data) + finish()
+
+
+def compress_stream(chunks, encoding, level):
+    process, finish = get_compressor(encoding, level)
+    for chunk in chunks:
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+def get_encodings():
+    """Кодировки из COMPRESSION_ENCODINGS, которые можно выполнить."""
+    return [encoding for encoding in settings.COMPRESSION_ENCODINGS
+            if encoding == GZIP or encoding == BROTLI and brotli is not None]
+
+
+def get_level(encoding):
+    if encoding == BROTLI:
+        return settings.COMPRESSION_BROTLI_QUALITY
+    return settings.COMPRESSION_GZIP_LEVEL
+
+
+def parse_accept_encoding(header):
+    """Словарь {кодировка: q} из заголовка Accept-Encoding."""
+    accepted = {}
+    for item in header.split(','):
+        coding, *params = item.split(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def choose_encoding(header, encodings):
+    """Кодировка с наибольшим q; при равенстве — первая в encodings."""
+    accepted = parse_accept_encoding(header)
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(response):
+    if response.status_code in (206, 304) or response.has_header(
+        'Content-Encoding'
+    ):
+        return False
+    if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+        return False
+    return response.streaming or (
+        len(response.content) >= settings.COMPRESSION_MIN_SIZE
+    )
+
+
+class CompressionMiddleware:
+    """Сжимает ответы gzip или brotli по заголовку Accept-Encoding.
+
+    Ответы меньше COMPRESSION_MIN_SIZE байт, 304 и уже сжатые
+    отдаются как есть: на маленьких телах сжатие тратит процессор
+    и почти не экономит трафик.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not is_compressible(response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', ''), get_encodings()
+        )
+        if encoding is None:
+            return response
+        level = get_level(encoding)
+        if response.streaming:
+            response.streaming_content = compress_stream(
+                response.streaming_content, encoding, level
+            )
+            del response['Content-Length']
+        else:
+            content = compress(response.content, encoding, level)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response['Content-Length'] = str(len(content))
+        # Сжатое тело отличается побайтно, поэтому ETag становится слабым
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
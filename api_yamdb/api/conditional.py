@@ -0,0 +1,52 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .cache import get_role
+
+
+class ConditionalGetMixin:
+    """Отдаёт ETag и Last-Modified и отвечает 304 на условные GET.
+
+    Валидаторы берутся из get_conditional_state до выполнения запроса
+    списка и сериализации, поэтому неизменившаяся страница стоит не
+    дороже одного обращения к версии родительского объекта.
+    """
+
+    def get_conditional_state(self):
+        """Возвращает пару (версия, unix-время изменения) или None."""
+        return None
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request,
+                                         *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request,
+                                         *args, **kwargs)
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        state = self.get_conditional_state()
+        if state is None:
+            return handler(request, *args, **kwargs)
+        version, last_modified = state
+        etag = quote_etag(hashlib.sha1(':'.join((
+            str(version),
+            request.accepted_renderer.format,
+            get_role(request.user),
+            request.get_full_path(),
+        )).encode('utf-8')).hexdigest())
+        if last_modified is not None:
+            last_modified = int(last_modified)
+        not_modified = get_conditional_response(
+            request._request, etag=etag, last_modified=last_modified
+        )
+        if not_modified is not None:
+            return not_modified
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
@@ -0,0 +1,16 @@
+from django.db import connections
+
+
+def check_connections(**kwargs):
+    """Закрывает оборванные постоянные соединения в начале запроса.
+
+    Django 2.2 замечает разрыв соединения (перезапуск PostgreSQL или
+    pgbouncer, таймаут простоя) только по ошибке запроса. Соединения с
+    CONN_HEALTH_CHECKS проверяются заранее, и запрос откроет новое.
+    """
+    for connection in connections.all():
+        if (connection.settings_dict.get('CONN_HEALTH_CHECKS')
+                and connection.connection is not None
+                and not connection.in_atomic_block
+                and not connection.is_usable()):
+            connection.close()
@@ -2,13 +2,17 @@ import django_filters
 
 from reviews.models import Title
 
+from .search import search
+
 
 class TitleFilter(django_filters.FilterSet):
-    name = django_filters.CharFilter(field_name='name',
-                                     lookup_expr='icontains')
+    name = django_filters.CharFilter(method='search_name')
     genre = django_filters.CharFilter(field_name='genre__slug')
     category = django_filters.CharFilter(field_name='category__slug')
 
     class Meta:
         model = Title
         fields = ['category', 'genre', 'name', 'year']
+
+    def search_name(self, queryset, name, value):
+        return search(queryset, name, [value])
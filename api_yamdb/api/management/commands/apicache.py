@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from api.cache import (CATEGORIES, GENRES, TITLES_ALL, TITLES_LIST,
+                       get_stats, invalidate)
+
+# basename, под которыми вьюсеты зарегистрированы в роутере
+CACHED_VIEWSETS = ('category', 'genre', 'title')
+
+
+class Command(BaseCommand):
+    """Показывает счётчики кеша ответов API и сбрасывает кеш."""
+
+    help = 'Shows API response cache hit/miss counters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--invalidate',
+            action='store_true',
+            help='Invalidate all cached responses, e.g. after bulk imports.',
+        )
+
+    def handle(self, *args, **options):
+        if options['invalidate']:
+            invalidate(CATEGORIES, GENRES, TITLES_LIST, TITLES_ALL)
+            self.stdout.write('API response cache invalidated.')
+        for name, counters in get_stats(CACHED_VIEWSETS).items():
+            total = counters['hits'] + counters['misses']
+            ratio = counters['hits'] / total if total else 0
+            self.stdout.write(
+                f'{name}: {counters["hits"]} hits, '
+                f'{counters["misses"]} misses, hit ratio {ratio:.2%}'
+            )
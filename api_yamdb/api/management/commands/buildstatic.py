@@ -0,0 +1,57 @@
+import os
+
+from django.contrib.staticfiles.management.commands.collectstatic import (
+    Command as CollectStaticCommand)
+from django.template.loader import render_to_string
+
+from api.staticfiles import COMPRESS_MIN_SIZE, compress_directory
+
+# Страница redoc собирается в STATIC_ROOT, nginx отдаёт её по /redoc/
+REDOC_TEMPLATE = 'redoc.html'
+REDOC_PATH = os.path.join('redoc', 'index.html')
+
+
+class Command(CollectStaticCommand):
+    """collectstatic, который ещё собирает redoc и сжимает статику.
+
+    Имена файлов хешируются хранилищем STATICFILES_STORAGE, а рядом с
+    текстовыми файлами пишутся .gz и .br для gzip_static в nginx.
+    """
+
+    help = ('Collects hashed static files, renders the redoc page and '
+            'writes gzip and brotli copies next to them.')
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--min-size',
+            type=int,
+            default=COMPRESS_MIN_SIZE,
+            help='Smallest file size in bytes worth compressing.',
+        )
+        parser.add_argument(
+            '--no-compress',
+            action='store_false',
+            dest='compress',
+            help='Do not write gzip and brotli copies.',
+        )
+
+    def set_options(self, **options):
+        super().set_options(**options)
+        self.min_size = options['min_size']
+        self.compress = options['compress']
+
+    def collect(self):
+        collected = super().collect()
+        if self.dry_run or not self.is_local_storage():
+            return collected
+        redoc_path = self.storage.path(REDOC_PATH)
+        os.makedirs(os.path.dirname(redoc_path), exist_ok=True)
+        with open(redoc_path, 'w', encoding='utf-8') as redoc_file:
+            redoc_file.write(render_to_string(REDOC_TEMPLATE))
+        self.log(f"Rendered '{REDOC_PATH}'", level=1)
+        if self.compress:
+            written = compress_directory(self.storage.location,
+                                         self.min_size)
+            self.log(f'Compressed {len(written)} files', level=1)
+        return collected
@@ -0,0 +1,179 @@
+import bisect
+import json
+import logging
+import threading
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('api.performance')
+
+# Верхние границы корзин гистограммы задержки, мс
+LATENCY_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, float('inf'))
+
+_current_metrics = ContextVar('request_metrics', default=None)
+_histograms = {}
+_histograms_lock = threading.Lock()
+
+
+class RequestMetrics:
+    """Счётчики одного запроса: SQL, время БД и сериализации."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+
+def timed_serialization(func, *args):
+    """Вызывает func и прибавляет время к сериализации текущего запроса.
+
+    Вложенные сериализаторы не учитываются повторно.
+    """
+    metrics = _current_metrics.get()
+    if metrics is None or metrics.serializing:
+        return func(*args)
+    metrics.serializing = True
+    start = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        metrics.serializer_time += time.perf_counter() - start
+        metrics.serializing = False
+
+
+class TimedSerializerMixin:
+    """Учитывает to_representation в метриках PerformanceMiddleware."""
+
+    def to_representation(self, instance):
+        return timed_serialization(super().to_representation, instance)
+
+
+def record(url_name, latency_ms):
+    with _histograms_lock:
+        histogram = _histograms.setdefault(url_name, {
+            'count': 0,
+            'sum_ms': 0.0,
+            'buckets': [0] * len(LATENCY_BUCKETS),
+        })
+        histogram['count'] += 1
+        histogram['sum_ms'] += latency_ms
+        histogram['buckets'][
+            bisect.bisect_left(LATENCY_BUCKETS, latency_ms)
+        ] += 1
+
+
+def get_histograms():
+    """Снимок гистограмм задержки по имени URL в текущем процессе."""
+    with _histograms_lock:
+        return {
+            url_name: {
+                'count': histogram['count'],
+                'sum_ms': round(histogram['sum_ms'], 3),
+                'buckets': dict(zip(
+                    (str(bound) for bound in LATENCY_BUCKETS),
+                    histogram['buckets'],
+                )),
+            }
+            for url_name, histogram in _histograms.items()
+        }
+
+
+class PerformanceMiddleware:
+    """Замеряет SQL-запросы, время БД, сериализации и ответа.
+
+    Результаты попадают в журнал api.performance одной JSON-строкой, в
+    гистограмму по имени URL и, если включён PERFORMANCE_SERVER_TIMING,
+    в заголовок Server-Timing. Запросы сверх PERFORMANCE_QUERY_BUDGET
+    помечаются предупреждением. У потоковых ответов заголовки уходят до
+    чтения потока, поэтому полные числа есть только в журнале.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        start = time.perf_counter()
+        response = self.measure(metrics, self.get_response, request)
+        if response.streaming:
+            # Запросы к БД при чтении потока тоже относятся к запросу;
+            # итог записывается, когда поток дочитан или закрыт
+            response.streaming_content = self.measure_stream(
+                request, response, response.streaming_content, metrics, start
+            )
+        else:
+            self.report(request, response, metrics, start)
+        if settings.PERFORMANCE_SERVER_TIMING:
+            response['Server-Timing'] = (
+                f'db;dur={metrics.db_time * 1000:.2f};'
+                f'desc="{metrics.queries} queries", '
+                f'serializer;dur={metrics.serializer_time * 1000:.2f}, '
+                f'total;dur={(time.perf_counter() - start) * 1000:.2f}'
+            )
+        budget = settings.PERFORMANCE_QUERY_BUDGET
+        if budget and metrics.queries > budget:
+            response['X-Query-Budget-Exceeded'] = str(metrics.queries)
+        return response
+
+    @staticmethod
+    def measure(metrics, func, *args):
+        """Вызывает func, считая её запросы к БД и сериализацию."""
+        token = _current_metrics.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(metrics.execute_wrapper)
+                    )
+                return func(*args)
+        finally:
+            _current_metrics.reset(token)
+
+    def measure_stream(self, request, response, content, metrics, start):
+        chunks = iter(content)
+        end = object()
+        try:
+            while True:
+                chunk = self.measure(metrics, next, chunks, end)
+                if chunk is end:
+                    break
+                yield chunk
+        finally:
+            self.report(request, response, metrics, start)
+
+    def report(self, request, response, metrics, start):
+        total_ms = (time.perf_counter() - start) * 1000
+        match = request.resolver_match
+        url_name = match.url_name if match and match.url_name else 'unknown'
+        record(url_name, total_ms)
+
+        budget = settings.PERFORMANCE_QUERY_BUDGET
+        over_budget = bool(budget) and metrics.queries > budget
+        logger.log(
+            logging.WARNING if over_budget else logging.INFO,
+            json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'url_name': url_name,
+                'status': response.status_code,
+                'queries': metrics.queries,
+                'db_ms': round(metrics.db_time * 1000, 3),
+                'serializer_ms': round(metrics.serializer_time * 1000, 3),
+                'total_ms': round(total_ms, 3),
+                'over_query_budget': over_budget,
+                'streaming': response.streaming,
+            }),
+        )
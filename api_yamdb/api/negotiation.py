@@ -0,0 +1,15 @@
+from rest_framework.negotiation import BaseContentNegotiation
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    """Всегда выбирает первый рендерер, не глядя на Accept и ?format=.
+
+    Для представлений, которые сами отдают не-JSON ответ: Accept: text/csv
+    не должен приводить к 406, а ошибки по-прежнему рендерятся в JSON.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
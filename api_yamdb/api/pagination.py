@@ -0,0 +1,56 @@
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+
+class KeysetPagination(CursorPagination):
+    """Курсорная пагинация по индексированному ключу, без COUNT(*)."""
+    page_size_query_param = 'limit'
+
+    def __init__(self, ordering):
+        self.ordering = ordering
+
+
+class LimitOffsetOrCursorPagination(LimitOffsetPagination):
+    """LimitOffset по умолчанию, keyset-пагинация при передаче ?cursor=.
+
+    Курсорный режим не выполняет COUNT(*) и не пропускает строки через
+    OFFSET, поэтому время ответа не растёт с глубиной страницы.
+    """
+    cursor_query_param = 'cursor'
+    cursor_ordering = 'id'
+    cursor_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+        self.cursor_paginator = KeysetPagination(self.cursor_ordering)
+        return self.cursor_paginator.paginate_queryset(
+            queryset, request, view
+        )
+
+    def get_cursor_fields(self, request):
+        """Поля, из которых курсор берёт позицию строки; без ?cursor= пусто."""
+        if self.cursor_query_param not in request.query_params:
+            return []
+        ordering = self.cursor_ordering
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        return [field.lstrip('-') for field in ordering]
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_html_context(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_html_context()
+        return super().get_html_context()
+
+    def to_html(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.to_html()
+        return super().to_html()
+
+
+class PubDatePagination(LimitOffsetOrCursorPagination):
+    cursor_ordering = ('pub_date', 'id')
@@ -0,0 +1,79 @@
+import codecs
+import json
+import re
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.utils.json import strict_constant
+
+from .renderers import FastJSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson читает целые длиннее 64 бит как float, такие тела разбирает json
+LONG_NUMBER = re.compile(rb'\d{19}')
+
+
+def loads(body, encoding='utf-8', strict=True):
+    """Разбирает JSON из байтов, через orjson, если результат совпадёт.
+
+    Тело, которое orjson не разобрал или мог разобрать иначе (целые
+    больше 64 бит), разбирается стандартным json. Ошибки — ValueError.
+    """
+    if (orjson is not None and codecs.lookup(encoding).name == 'utf-8'
+            and not LONG_NUMBER.search(body)):
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(
+        body.decode(encoding),
+        parse_constant=strict_constant if strict else None,
+    )
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser на orjson, если он установлен; результат тот же."""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            return loads(stream.read(), encoding, self.strict)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class NDJSONParser(BaseParser):
+    """Разбирает NDJSON (по JSON-значению в строке) в список.
+
+    Тело читается построчно, пустые строки пропускаются.
+    """
+
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        items = []
+        if stream is None:
+            return items
+        for number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                items.append(loads(line, encoding))
+            except ValueError as exc:
+                raise ParseError(
+                    'NDJSON parse error on line %d - %s' % (number, exc)
+                )
+        return items
@@ -21,12 +21,14 @@ class AuthorAdminOrReadOnly(permissions.BasePermission):
 
     def has_object_permission(self, request, view, obj):
         if request.user.is_authenticated:
+            # Чтение проверяется первым: при ?fields= author_id может
+            # быть не загружен
             return (
-                obj.author == request.user
+                request.method in permissions.SAFE_METHODS
+                or obj.author_id == request.user.pk
                 or request.user.is_admin
                 or request.user.is_moderator
                 or request.user.is_superuser
-                or request.method in permissions.SAFE_METHODS
             )
         return request.method in permissions.SAFE_METHODS
 
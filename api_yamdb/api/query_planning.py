@@ -0,0 +1,122 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def get_relation_field(field):
+    """Возвращает поле, описывающее связь, или None для обычных полей."""
+    if field.write_only or field.source == '*' or '.' in field.source:
+        return None
+    if isinstance(field, serializers.ListSerializer):
+        return field.child
+    if isinstance(field, serializers.ManyRelatedField):
+        return field.child_relation
+    if isinstance(field, (serializers.BaseSerializer,
+                          serializers.RelatedField)):
+        return field
+    return None
+
+
+def get_related_lookups(serializer, model, prefix='', prefetch=False):
+    """Собирает пути для select_related и prefetch_related.
+
+    Пути строятся по объявленным полям сериализатора: вложенные
+    сериализаторы и связанные поля по прямым ForeignKey попадают
+    в select_related, связи «многие ко многим» и обратные связи —
+    в prefetch_related. Всё, что лежит под prefetch-путём, тоже
+    подгружается через prefetch_related.
+    """
+    select, prefetch_lookups = [], []
+    for field in serializer.fields.values():
+        nested = get_relation_field(field)
+        if nested is None:
+            continue
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            continue
+        if not model_field.is_relation:
+            continue
+        lookup = prefix + field.source
+        many = model_field.many_to_many or model_field.one_to_many
+        if prefetch or many:
+            prefetch_lookups.append(lookup)
+        else:
+            select.append(lookup)
+        if isinstance(nested, serializers.BaseSerializer):
+            nested_select, nested_prefetch = get_related_lookups(
+                nested, model_field.related_model, lookup + '__',
+                prefetch or many,
+            )
+            select.extend(nested_select)
+            prefetch_lookups.extend(nested_prefetch)
+    return select, prefetch_lookups
+
+
+def get_only_fields(serializer, model, prefix=''):
+    """Пути для only() по полям сериализатора или None.
+
+    Связи «многие ко многим» и обратные связи подгружаются отдельными
+    запросами и в only() не попадают. Если хоть одно поле выводится не
+    из столбца модели (source='*', вложенный source, свойство), столбцы
+    не сужаются.
+    """
+    names = []
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*' or '.' in field.source:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        if model_field.many_to_many or model_field.one_to_many:
+            continue
+        if not model_field.concrete:
+            return None
+        names.append(prefix + field.source)
+        if model_field.is_relation:
+            related = get_related_only_fields(
+                field, model_field, f'{prefix}{field.source}__'
+            )
+            if related is None:
+                return None
+            names.extend(related)
+    return names
+
+
+def get_related_only_fields(field, model_field, prefix):
+    nested = get_relation_field(field)
+    if isinstance(nested, serializers.BaseSerializer):
+        return get_only_fields(nested, model_field.related_model, prefix)
+    if isinstance(nested, serializers.SlugRelatedField):
+        return [prefix + nested.slug_field]
+    if isinstance(nested, serializers.PrimaryKeyRelatedField):
+        return []
+    return None
+
+
+class QueryPlanningMixin:
+    """Подгружает связанные объекты, которые выводит сериализатор.
+
+    Планирование выполняется в filter_queryset, поэтому работает и для
+    вьюсетов, переопределяющих get_queryset, и для list, и для retrieve.
+    При чтении запрос ограничивается столбцами, которые выводит
+    сериализатор.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer = self.get_serializer()
+        select, prefetch = get_related_lookups(serializer, queryset.model)
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        # При записи сериализатору и сигналам нужны все поля модели
+        if self.request.method in SAFE_METHODS:
+            only = get_only_fields(serializer, queryset.model)
+            if only is not None:
+                queryset = queryset.only(*only)
+        return queryset
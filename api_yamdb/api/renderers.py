@@ -0,0 +1,73 @@
+import math
+import re
+from decimal import Decimal
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # Даты и время форматирует кодировщик DRF, как в JSONRenderer
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+# Числа, которые json записывает в экспоненциальной форме, а orjson — нет
+# (0.00005 вместо 5e-05) или по-другому (1e16 вместо 1e+16). Совпадения
+# внутри строк лишь отправляют ответ на стандартный json
+EXPONENT_FLOAT = re.compile(rb'\d[eE]|(?<![\d.])0\.0000')
+
+
+def has_non_finite(data):
+    """Есть ли в данных NaN или бесконечность, которые orjson пишет null."""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, Decimal):
+            if not value.is_finite():
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson, если он установлен.
+
+    Вывод совпадает с JSONRenderer байт в байт. Типы, которых нет в JSON,
+    передаются кодировщику DRF. С отступами, ASCII-выводом, на данных,
+    которые orjson не принимает, и на числах, которые он записывает
+    иначе (экспоненты, NaN, бесконечности), работает стандартный json.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or not self.compact
+                or self.ensure_ascii
+                or self.get_indent(accepted_media_type,
+                                   renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default,
+                               option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+        # json отказывает на NaN в строгом режиме и пишет 1e+16 и 1e-07
+        if EXPONENT_FLOAT.search(ret) or (
+            b'null' in ret and has_non_finite(data)
+        ):
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+        # JSONRenderer экранирует разделители строк, недопустимые в JS
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(
+                b'\xe2\x80\xa9', b'\\u2029'
+            )
+        return ret
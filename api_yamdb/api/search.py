@@ -0,0 +1,36 @@
+from functools import reduce
+from operator import add
+
+from django.db import connections
+from rest_framework import filters
+
+
+def search(queryset, field, terms):
+    """Ищет строки, поле которых содержит каждое из слов terms.
+
+    На PostgreSQL icontains использует GIN-индекс по UPPER(field)
+    с gin_trgm_ops, а результаты упорядочиваются по сумме
+    TrigramSimilarity слов. На остальных СУБД остаётся обычный icontains.
+    """
+    for term in terms:
+        queryset = queryset.filter(**{f'{field}__icontains': term})
+    if connections[queryset.db].vendor != 'postgresql':
+        return queryset
+    from django.contrib.postgres.search import TrigramSimilarity
+    return queryset.annotate(search_rank=reduce(add, (
+        TrigramSimilarity(field, term) for term in terms
+    ))).order_by('-search_rank', 'pk')
+
+
+class TrigramSearchFilter(filters.SearchFilter):
+    """SearchFilter по первому полю search_fields с ранжированием.
+
+    Как и SearchFilter, требует совпадения каждого слова запроса.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        field = view.search_fields[0].lstrip('^=@$')
+        return search(queryset, field, terms)
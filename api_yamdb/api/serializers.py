@@ -1,8 +1,14 @@
+from django.db import IntegrityError
 from django.shortcuts import get_object_or_404
+from django.utils.encoding import smart_str
 from rest_framework import serializers
 from django.contrib.auth.tokens import default_token_generator
 
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.models import (Category, Comment, Genre, Review, ScoreHistogram,
+                            Title, User)
+
+from .middleware import TimedSerializerMixin
+from .sparse import SparseFieldsetSerializerMixin
 
 
 class UserConfirmationSerializer(serializers.ModelSerializer):
@@ -38,21 +44,24 @@ class TokenSerializer(serializers.Serializer):
         return data
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedSerializerMixin,
+                         serializers.ModelSerializer):
 
     class Meta:
         fields = ('name', 'slug')
         model = Category
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(TimedSerializerMixin,
+                      serializers.ModelSerializer):
 
     class Meta:
         fields = ('name', 'slug')
         model = Genre
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleSerializer(SparseFieldsetSerializerMixin, TimedSerializerMixin,
+                      serializers.ModelSerializer):
     genre = GenreSerializer(many=True)
     category = CategorySerializer()
     rating = serializers.IntegerField(read_only=True)
@@ -62,14 +71,58 @@ class TitleSerializer(serializers.ModelSerializer):
                   'description', 'genre', 'category')
         model = Title
 
+    def get_collapsed_fields(self):
+        return {
+            'genre': serializers.SlugRelatedField(
+                slug_field='slug', many=True, read_only=True
+            ),
+            'category': serializers.SlugRelatedField(
+                slug_field='slug', read_only=True
+            ),
+        }
+
+
+class TitleStatsSerializer(TimedSerializerMixin,
+                           serializers.ModelSerializer):
+    """Распределение оценок произведения, среднее и медиана."""
+    histogram = serializers.ReadOnlyField(source='counts')
+    count = serializers.ReadOnlyField()
+    mean = serializers.FloatField(read_only=True)
+    median = serializers.FloatField(read_only=True)
+
+    class Meta:
+        fields = ('histogram', 'count', 'mean', 'median')
+        model = ScoreHistogram
+
+
+class PrefetchedSlugRelatedField(serializers.SlugRelatedField):
+    """SlugRelatedField, который ищет объекты в context['prefetched'].
 
-class TitleWriteSerializer(serializers.ModelSerializer):
-    genre = serializers.SlugRelatedField(
+    Словарь {модель: {slug: объект}} заполняется одним запросом на
+    модель для всей пачки; без него поле работает как обычно.
+    """
+
+    def to_internal_value(self, data):
+        objects = self.context.get('prefetched', {}).get(
+            self.get_queryset().model
+        )
+        if objects is None:
+            return super().to_internal_value(data)
+        try:
+            return objects[data]
+        except (KeyError, TypeError):
+            self.fail('does_not_exist', slug_name=self.slug_field,
+                      value=smart_str(data))
+
+
+class TitleWriteSerializer(TimedSerializerMixin,
+                           serializers.ModelSerializer):
+    genre = PrefetchedSlugRelatedField(
         many=True,
         slug_field='slug',
         queryset=Genre.objects.all()
     )
-    category = serializers.SlugRelatedField(
+    category = PrefetchedSlugRelatedField(
         slug_field='slug',
         queryset=Category.objects.all()
     )
@@ -81,7 +134,8 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         model = Title
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsetSerializerMixin, TimedSerializerMixin,
+                       serializers.ModelSerializer):
     """Сериализатор для модели Review."""
     author = serializers.SlugRelatedField(
         slug_field='username',
@@ -93,18 +147,21 @@ class ReviewSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'score', 'pub_date')
         read_only_fields = ('pub_date',)
 
-    def validate(self, data):
-        if self.context['request'].method != 'POST':
-            return data
-        author = self.context['request'].user
-        title = get_object_or_404(
-            Title, id=self.context['view'].kwargs.get('title_id')
-        )
-        if title.reviews.filter(author=author.id).exists():
+    def create(self, validated_data):
+        # Повторный отзыв отсекает ограничение unique_title_author,
+        # без отдельного запроса на проверку существования; остальные
+        # нарушения ограничений пробрасываются дальше.
+        try:
+            return super().create(validated_data)
+        except IntegrityError:
+            if not Review.objects.filter(
+                title=validated_data['title'],
+                author=validated_data['author'],
+            ).exists():
+                raise
             raise serializers.ValidationError(
                 'Нельзя оставлять больше одного отзыва на произведение.'
             )
-        return data
 
     def validate_score(self, value):
         if 1 <= value <= 10:
@@ -114,7 +171,8 @@ class ReviewSerializer(serializers.ModelSerializer):
         )
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin,
+                     serializers.ModelSerializer):
 
     class Meta:
         fields = (
@@ -123,7 +181,8 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
 
 
-class UserRoleSerializer(serializers.ModelSerializer):
+class UserRoleSerializer(TimedSerializerMixin,
+                         serializers.ModelSerializer):
     class Meta:
         fields = (
             'username', 'email', 'first_name', 'last_name', 'bio', 'role'
@@ -132,7 +191,8 @@ class UserRoleSerializer(serializers.ModelSerializer):
         read_only_fields = ('role',)
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsetSerializerMixin, TimedSerializerMixin,
+                        serializers.ModelSerializer):
     """Сериализатор для модели Comment."""
     author = serializers.SlugRelatedField(
         slug_field='username',
@@ -0,0 +1,96 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_init,
+                                      post_save, pre_save)
+from django.dispatch import receiver
+
+from reviews.models import Category, Genre, GenreTitle, Review, Title, User
+
+from .authentication import USER_CLAIMS, revoke_user_tokens
+from .cache import (CATEGORIES, GENRES, TITLES_ALL, TITLES_LIST,
+                    invalidate, title_group)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_categories(sender, instance, **kwargs):
+    invalidate(CATEGORIES, TITLES_LIST, TITLES_ALL)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def invalidate_genres(sender, instance, **kwargs):
+    invalidate(GENRES, TITLES_LIST, TITLES_ALL)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def invalidate_title(sender, instance, **kwargs):
+    invalidate(TITLES_LIST, title_group(instance.pk))
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def invalidate_genre_title(sender, instance, **kwargs):
+    invalidate(TITLES_LIST, title_group(instance.title_id_id))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, instance, action, reverse, pk_set,
+                            **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        invalidate(TITLES_LIST, title_group(instance.pk))
+    elif pk_set is None:
+        invalidate(TITLES_LIST, TITLES_ALL)
+    else:
+        invalidate(
+            TITLES_LIST, *(title_group(pk) for pk in pk_set)
+        )
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_review_title(sender, instance, **kwargs):
+    invalidate(TITLES_LIST, title_group(instance.title_id))
+
+
+TOKEN_STATE_FIELDS = USER_CLAIMS + ('is_active',)
+# Состояние пользователя, загруженного через only() без этих полей
+DEFERRED = object()
+
+
+def get_token_state(user):
+    return tuple(getattr(user, field) for field in TOKEN_STATE_FIELDS)
+
+
+@receiver(post_init, sender=User)
+def remember_token_state(sender, instance, **kwargs):
+    if not instance.pk:
+        instance._token_state = None
+    elif instance.get_deferred_fields().intersection(TOKEN_STATE_FIELDS):
+        # Авторы в списках с ?fields= загружаются только с username,
+        # догружать поля для каждого объекта незачем
+        instance._token_state = DEFERRED
+    else:
+        instance._token_state = get_token_state(instance)
+
+
+@receiver(pre_save, sender=User)
+def load_deferred_token_state(sender, instance, raw, **kwargs):
+    if not raw and instance._token_state is DEFERRED:
+        instance._token_state = sender.objects.filter(
+            pk=instance.pk
+        ).values_list(*TOKEN_STATE_FIELDS).first()
+
+
+@receiver(post_save, sender=User)
+def revoke_stale_tokens(sender, instance, created, **kwargs):
+    state = get_token_state(instance)
+    if not created and instance._token_state not in (None, state):
+        revoke_user_tokens(instance.pk)
+    instance._token_state = state
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user_tokens(sender, instance, **kwargs):
+    revoke_user_tokens(instance.pk)
@@ -0,0 +1,84 @@
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def parse_names(value):
+    """Имена из строки через запятую без пустых и повторов."""
+    return tuple(dict.fromkeys(
+        name.strip() for name in value.split(',') if name.strip()
+    ))
+
+
+class SparseFieldsetSerializerMixin:
+    """Сериализатор с выбором полей и свёрнутыми вложенными объектами.
+
+    fields оставляет только перечисленные поля. Если передан expand,
+    поля из get_collapsed_fields, которых в нём нет, выводятся
+    в свёрнутом виде, например slug вместо вложенного объекта.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sparse_fields = fields
+        self.expand = expand
+
+    @property
+    def fieldset(self):
+        """Параметры выбора полей в хешируемом виде, для кеша планов."""
+        return tuple(
+            (name, value)
+            for name, value in (('fields', self.sparse_fields),
+                                ('expand', self.expand))
+            if value is not None
+        )
+
+    def get_collapsed_fields(self):
+        """Свёрнутые варианты полей, которые раскрываются через expand."""
+        return {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.sparse_fields is not None:
+            check_names('fields', self.sparse_fields, fields)
+            fields = {name: field for name, field in fields.items()
+                      if name in self.sparse_fields}
+        if self.expand is not None:
+            collapsed = self.get_collapsed_fields()
+            check_names('expand', self.expand, collapsed)
+            for name, field in collapsed.items():
+                if name in fields and name not in self.expand:
+                    fields[name] = field
+        return fields
+
+
+def check_names(param, names, allowed):
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise serializers.ValidationError({
+            param: f'Неизвестные поля: {", ".join(unknown)}.'
+        })
+
+
+class SparseFieldsetMixin:
+    """Передаёт ?fields= и ?expand= сериализатору в запросах на чтение.
+
+    Планировщики запросов получают сериализатор через get_serializer,
+    поэтому вместе с ответом сужаются и столбцы SQL-запроса.
+    """
+
+    def get_fieldset(self):
+        if self.request is None or self.request.method not in SAFE_METHODS:
+            return {}
+        params = self.request.query_params
+        fieldset = {}
+        if params.get('fields'):
+            fieldset['fields'] = parse_names(params['fields'])
+        if 'expand' in params:
+            fieldset['expand'] = parse_names(params['expand'])
+        return fieldset
+
+    def get_serializer(self, *args, **kwargs):
+        if issubclass(self.get_serializer_class(),
+                      SparseFieldsetSerializerMixin):
+            kwargs = {**self.get_fieldset(), **kwargs}
+        return super().get_serializer(*args, **kwargs)
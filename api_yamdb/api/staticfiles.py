@@ -0,0 +1,74 @@
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+from .compression import BROTLI, GZIP, brotli, compress
+
+# Текстовые форматы, которые стоит сжимать заранее; шрифты woff и
+# картинки уже сжаты
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.html', '.js', '.json', '.map', '.svg', '.txt', '.xml', '.yaml',
+)
+# Файлы меньше этого размера отдаются как есть
+COMPRESS_MIN_SIZE = 256
+
+
+class HashedStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хранилище статики с хешем содержимого в именах файлов.
+
+    Пока collectstatic не запускался и манифеста нет (разработка, тесты),
+    {% static %} возвращает исходные имена вместо ошибки.
+    """
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+
+def get_compressors():
+    """Тройки (расширение, кодировка, уровень); brotli — если установлен.
+
+    Статика сжимается один раз при сборке, поэтому уровни максимальные.
+    """
+    compressors = [('.gz', GZIP, 9)]
+    if brotli is not None:
+        compressors.append(('.br', BROTLI, 11))
+    return compressors
+
+
+def compress_file(path, min_size=COMPRESS_MIN_SIZE):
+    """Пишет рядом с файлом сжатые копии, которые меньше оригинала."""
+    if (not path.endswith(COMPRESSIBLE_EXTENSIONS)
+            or os.path.getsize(path) < min_size):
+        return []
+    modified = os.path.getmtime(path)
+    with open(path, 'rb') as source:
+        data = None
+        written = []
+        for extension, encoding, level in get_compressors():
+            target = path + extension
+            if (os.path.exists(target)
+                    and os.path.getmtime(target) >= modified):
+                continue
+            if data is None:
+                data = source.read()
+            compressed = compress(data, encoding, level)
+            if len(compressed) >= len(data):
+                continue
+            with open(target, 'wb') as output:
+                output.write(compressed)
+            written.append(target)
+    return written
+
+
+def compress_directory(root, min_size=COMPRESS_MIN_SIZE):
+    """Сжимает файлы каталога, возвращает пути записанных копий."""
+    written = []
+    for directory, _, names in os.walk(root):
+        for name in names:
+            written.extend(
+                compress_file(os.path.join(directory, name), min_size)
+            )
+    return written
@@ -21,5 +21,7 @@ router.register(
 urlpatterns = [
     path('v1/auth/signup/', views.EmailConfirmation.as_view()),
     path('v1/auth/token/', views.GetToken.as_view()),
+    path('v1/metrics/', views.PerformanceMetrics.as_view(), name='metrics'),
+    path('v1/export/<str:name>', views.Export.as_view(), name='export'),
     path('v1/', include(router.urls)),
 ]
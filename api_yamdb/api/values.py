@@ -0,0 +1,250 @@
+from collections import defaultdict
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from .middleware import TimedSerializerMixin, timed_serialization
+
+
+class Column:
+    """Поле модели или slug связанной модели из одного столбца values()."""
+
+    def __init__(self, name, column, to_representation=None):
+        self.name = name
+        self.column = column
+        self.to_representation = to_representation
+
+    @property
+    def columns(self):
+        return [self.column]
+
+    def represent(self, row, related):
+        value = row[self.column]
+        if value is None or self.to_representation is None:
+            return value
+        return self.to_representation(value)
+
+
+class Nested:
+    """Вложенный сериализатор по ForeignKey, столбцы берутся через JOIN."""
+
+    def __init__(self, name, null_column, entries):
+        self.name = name
+        self.null_column = null_column
+        self.entries = entries
+
+    @property
+    def columns(self):
+        return [self.null_column] + [
+            column for entry in self.entries for column in entry.columns
+        ]
+
+    def represent(self, row, related):
+        if row[self.null_column] is None:
+            return None
+        return {entry.name: entry.represent(row, related)
+                for entry in self.entries}
+
+
+class Many:
+    """Вложенный сериализатор с many=True, один запрос на страницу.
+
+    С flat=True выводится список значений единственного столбца,
+    как у SlugRelatedField(many=True).
+    """
+
+    columns = []
+
+    def __init__(self, name, model, owner, entries, flat=False):
+        self.name = name
+        self.model = model
+        self.owner = owner
+        self.entries = entries
+        self.flat = flat
+
+    # Имя первичного ключа в строках values(), его задаёт ValuesPlan
+    pk = 'pk'
+
+    def fetch(self, pks):
+        columns = [column for entry in self.entries
+                   for column in entry.columns]
+        grouped = defaultdict(list)
+        for row in self.model.objects.filter(
+            **{f'{self.owner}__in': pks}
+        ).values(self.owner, *columns):
+            grouped[row[self.owner]].append(
+                self.entries[0].represent(row, None) if self.flat
+                else {entry.name: entry.represent(row, None)
+                      for entry in self.entries}
+            )
+        return grouped
+
+    def represent(self, row, related):
+        return related[self.name].get(row[self.pk], [])
+
+
+def compile_field(field, model, prefix, nested):
+    """Описание поля сериализатора через столбцы values() или None."""
+    if field.source == '*' or '.' in field.source:
+        return None
+    try:
+        model_field = model._meta.get_field(field.source)
+    except FieldDoesNotExist:
+        return None
+    column = prefix + field.source
+    if model_field.is_relation:
+        return compile_relation(field, model_field, column, nested)
+    if isinstance(field, (serializers.BaseSerializer,
+                          serializers.RelatedField)):
+        return None
+    return Column(field.field_name, column, field.to_representation)
+
+
+def compile_relation(field, model_field, column, nested):
+    related_model = model_field.related_model
+    if model_field.many_to_many or model_field.one_to_many:
+        if nested:
+            return None
+        owner = (model_field.field.name if model_field.auto_created
+                 else model_field.related_query_name())
+        if isinstance(field, serializers.ManyRelatedField) and isinstance(
+            field.child_relation, serializers.SlugRelatedField
+        ):
+            slug = Column(field.field_name, field.child_relation.slug_field)
+            return Many(field.field_name, related_model, owner, [slug],
+                        flat=True)
+        if (not isinstance(field, serializers.ListSerializer)
+                or not isinstance(field.child, serializers.ModelSerializer)):
+            return None
+        entries = compile_entries(field.child, related_model, '', True)
+        if entries is None:
+            return None
+        return Many(field.field_name, related_model, owner, entries)
+    if isinstance(field, serializers.SlugRelatedField):
+        return Column(field.field_name, f'{column}__{field.slug_field}')
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        return Column(field.field_name, column)
+    if isinstance(field, serializers.ModelSerializer):
+        entries = compile_entries(field, related_model, f'{column}__',
+                                  nested)
+        if entries is not None:
+            return Nested(field.field_name, column, entries)
+    return None
+
+
+def has_default_representation(serializer_class):
+    """Не переопределён ли to_representation (замер времени не в счёт)."""
+    for klass in serializer_class.__mro__:
+        if klass is not TimedSerializerMixin and (
+            'to_representation' in vars(klass)
+        ):
+            return klass is serializers.Serializer
+    return False
+
+
+def compile_entries(serializer, model, prefix='', nested=False):
+    if not has_default_representation(type(serializer)):
+        return None
+    entries = []
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        entry = compile_field(field, model, prefix, nested)
+        if entry is None:
+            return None
+        entries.append(entry)
+    return entries
+
+
+class ValuesPlan:
+    """План вывода сериализатора по строкам QuerySet.values().
+
+    Строится один раз на класс сериализатора из его полей, поэтому
+    вывод совпадает с ModelSerializer: значения проходят через те же
+    to_representation полей, а объекты моделей не создаются.
+    """
+
+    def __init__(self, model, entries):
+        self.model = model
+        self.entries = entries
+        # Имя поля, а не 'pk', чтобы id не выбирался из базы дважды
+        self.pk = model._meta.pk.name
+        self.many = [entry for entry in entries if isinstance(entry, Many)]
+        for entry in self.many:
+            entry.pk = self.pk
+
+    def values(self, queryset, extra=()):
+        """Строки values() со столбцами плана и дополнительными extra."""
+        columns = [self.pk] + [column for entry in self.entries
+                               for column in entry.columns] + list(extra)
+        # Аннотации нужны для сортировки, например по search_rank
+        return queryset.prefetch_related(None).values(
+            *dict.fromkeys(columns), *queryset.query.annotations
+        )
+
+    def serialize(self, rows):
+        rows = list(rows)
+        pks = [row[self.pk] for row in rows]
+        related = {entry.name: entry.fetch(pks) if pks else {}
+                   for entry in self.many}
+        return [{entry.name: entry.represent(row, related)
+                 for entry in self.entries} for row in rows]
+
+
+# Наборы полей приходят из ?fields=, поэтому кеш планов ограничен
+@lru_cache(maxsize=256)
+def get_values_plan(serializer_class, fieldset=()):
+    """ValuesPlan для ModelSerializer или None, если поля не поддержаны.
+
+    fieldset — пары (аргумент, значение), с которыми создаётся
+    сериализатор, например (('fields', ('id', 'name')),).
+    """
+    if not issubclass(serializer_class, serializers.ModelSerializer):
+        return None
+    model = serializer_class.Meta.model
+    entries = compile_entries(serializer_class(**dict(fieldset)), model)
+    return None if entries is None else ValuesPlan(model, entries)
+
+
+class ValuesSerializer(serializers.BaseSerializer):
+    """Сериализатор строк values() по плану ValuesPlan."""
+
+    def __init__(self, rows, plan, **kwargs):
+        super().__init__(rows, **kwargs)
+        self.plan = plan
+
+    def to_representation(self, rows):
+        return timed_serialization(self.plan.serialize, rows)
+
+
+class ValuesListMixin:
+    """Отдаёт list по строкам values() вместо объектов моделей.
+
+    Если сериализатор содержит поля, которые план не поддерживает,
+    используется обычный list.
+    """
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        plan = get_values_plan(type(serializer),
+                               getattr(serializer, 'fieldset', ()))
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+        queryset = plan.values(self.filter_queryset(self.get_queryset()),
+                               self.get_ordering_columns())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                ValuesSerializer(page, plan=plan).data
+            )
+        return Response(ValuesSerializer(queryset, plan=plan).data)
+
+    def get_ordering_columns(self):
+        """Поля курсора: позиция строки values() читается из них.
+
+        В ответ они не попадают, если их нет в наборе полей.
+        """
+        get_fields = getattr(self.paginator, 'get_cursor_fields', None)
+        return get_fields(self.request) if get_fields else []
@@ -1,21 +1,37 @@
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.conf import settings
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
-from rest_framework import filters, mixins, status, viewsets
+from rest_framework import filters, generics, mixins, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.pagination import (LimitOffsetPagination,
-                                       PageNumberPagination)
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 
-from reviews.models import Category, Genre, Review, Title, User
+from reviews import export
+from reviews.models import (Category, Genre, Review, ScoreHistogram, Title,
+                            User)
+from reviews.outbox import queue_mail
 
 from . import permissions, serializers
+from .authentication import get_access_token, get_full_user
+from .bulk import create_titles
+from .cache import (CATEGORIES, GENRES, TITLES_ALL, TITLES_LIST,
+                    CachedResponseMixin, title_group)
+from .conditional import ConditionalGetMixin
 from .filters import TitleFilter
+from .middleware import get_histograms
+from .negotiation import IgnoreClientContentNegotiation
+from .pagination import LimitOffsetOrCursorPagination, PubDatePagination
+from .parsers import FastJSONParser, NDJSONParser
+from .query_planning import QueryPlanningMixin
+from .search import TrigramSearchFilter
+from .sparse import SparseFieldsetMixin
+from .values import ValuesListMixin
 from api_yamdb.settings import EMAIL
 
 
@@ -25,17 +41,18 @@ class EmailConfirmation(APIView):
         email = request.data.get('email')
         serializer = serializers.UserConfirmationSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
-        user = User.objects.get(email=email)
-        confirmation_code_gen = PasswordResetTokenGenerator()
-        confirmation_code = confirmation_code_gen.make_token(user)
-        send_mail(
-            'Код подтверждения',
-            confirmation_code,
-            EMAIL,
-            [email],
-            fail_silently=False,
-        )
+        with transaction.atomic():
+            serializer.save()
+            user = User.objects.get(email=email)
+            confirmation_code_gen = PasswordResetTokenGenerator()
+            confirmation_code = confirmation_code_gen.make_token(user)
+            # Письмо отправит команда send_emails
+            queue_mail(
+                'Код подтверждения',
+                confirmation_code,
+                EMAIL,
+                [email],
+            )
         return Response(
             serializer.data,
             status=status.HTTP_200_OK
@@ -45,9 +62,8 @@ class EmailConfirmation(APIView):
 class GetToken(APIView):
     "Создание JWT токена."
     def get_tokens_for_user(self, user):
-        refresh = RefreshToken.for_user(user)
         return {
-            'token': str(refresh.access_token),
+            'token': str(get_access_token(user)),
         }
 
     def post(self, request):
@@ -58,72 +74,188 @@ class GetToken(APIView):
                         status=status.HTTP_200_OK)
 
 
-class CategoryAndGenreViewSet(mixins.CreateModelMixin,
+class PerformanceMetrics(APIView):
+    """Гистограммы задержки запросов по именам URL в этом процессе."""
+    permission_classes = (permissions.IsAdmin,)
+
+    def get(self, request):
+        return Response(get_histograms())
+
+
+class Export(APIView):
+    """Потоковая выгрузка таблицы в CSV или NDJSON в формате addcsv."""
+    permission_classes = (permissions.IsAdmin,)
+    content_negotiation_class = IgnoreClientContentNegotiation
+
+    def get(self, request, name):
+        dataset, _, export_format = name.rpartition('.')
+        if export_format not in export.FORMATS:
+            raise NotFound()
+        try:
+            chunks = export.export(dataset, export_format,
+                                   settings.EXPORT_CHUNK_SIZE)
+        except KeyError:
+            raise NotFound()
+        response = StreamingHttpResponse(
+            chunks, content_type=export.CONTENT_TYPES[export_format]
+        )
+        response['Content-Disposition'] = f'attachment; filename="{name}"'
+        return response
+
+
+class CategoryAndGenreViewSet(CachedResponseMixin,
+                              mixins.CreateModelMixin,
                               mixins.DestroyModelMixin,
                               mixins.ListModelMixin,
                               viewsets.GenericViewSet):
     permission_classes = [permissions.IsSuperuserOrReadOnly]
     pagination_class = PageNumberPagination
     lookup_field = 'slug'
-    filter_backends = (filters.SearchFilter, )
+    filter_backends = (TrigramSearchFilter, )
     search_fields = ('name',)
 
 
 class CategoryViewSet(CategoryAndGenreViewSet):
     queryset = Category.objects.all()
     serializer_class = serializers.CategorySerializer
+    cache_groups = (CATEGORIES,)
 
 
 class GenreViewSet(CategoryAndGenreViewSet):
     queryset = Genre.objects.all()
     serializer_class = serializers.GenreSerializer
+    cache_groups = (GENRES,)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(rating=Avg('reviews__score'))
+class TitleViewSet(ConditionalGetMixin, CachedResponseMixin,
+                   SparseFieldsetMixin, QueryPlanningMixin, ValuesListMixin,
+                   viewsets.ModelViewSet):
+    queryset = Title.objects.all()
     serializer_class = serializers.TitleSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = LimitOffsetOrCursorPagination
     permission_classes = [permissions.IsSuperuserOrReadOnly | IsAdminUser]
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
     http_method_names = ('get', 'post', 'patch', 'delete')
+    # Группа кеша строится из pk, поэтому нечисловой или не влезающий в
+    # bigint pk — сразу 404
+    lookup_value_regex = r'\d{1,18}'
+
+    def get_cache_groups(self):
+        if self.action in ('retrieve', 'stats'):
+            return (TITLES_ALL, title_group(self.kwargs['pk']))
+        return (TITLES_LIST,)
+
+    def get_conditional_state(self):
+        if self.action not in ('list', 'retrieve', 'stats'):
+            return None
+        return self.get_cache_state()
 
     def get_serializer_class(self):
         if self.action in ['create', 'partial_update']:
             return serializers.TitleWriteSerializer
+        if self.action == 'stats':
+            return serializers.TitleStatsSerializer
         return serializers.TitleSerializer
 
+    @action(detail=False, methods=['post'],
+            parser_classes=[FastJSONParser, NDJSONParser])
+    def bulk(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError('Ожидается массив произведений или NDJSON.')
+        if len(items) > settings.BULK_MAX_ITEMS:
+            raise ValidationError(
+                f'Не больше {settings.BULK_MAX_ITEMS} произведений за запрос.'
+            )
+        results = create_titles(items, self.get_serializer_context())
+        created = sum(result['status'] == 201 for result in results)
+        return Response(
+            {'created': created, 'failed': len(results) - created,
+             'results': results},
+            status=(status.HTTP_201_CREATED if created == len(results)
+                    else status.HTTP_207_MULTI_STATUS),
+        )
+
+    @action(detail=True)
+    def stats(self, request, pk=None):
+        return self.conditional_response(self.get_stats, request, pk)
+
+    def get_stats(self, request, pk):
+        # Одна строка распределения вместо агрегации по отзывам
+        title = generics.get_object_or_404(
+            Title.objects.select_related('score_histogram').only(
+                'id', *(f'score_histogram__{field.name}'
+                        for field in ScoreHistogram._meta.concrete_fields)
+            ),
+            pk=pk,
+        )
+        try:
+            histogram = title.score_histogram
+        except ScoreHistogram.DoesNotExist:
+            histogram = ScoreHistogram(title=title)
+        return Response(self.get_serializer(histogram).data)
+
 
-class ReviewAndCommentViewSet(viewsets.ModelViewSet):
+class ReviewAndCommentViewSet(ConditionalGetMixin, SparseFieldsetMixin,
+                              QueryPlanningMixin, ValuesListMixin,
+                              viewsets.ModelViewSet):
     permission_classes = (permissions.AuthorAdminOrReadOnly, )
-    pagination_class = LimitOffsetPagination
+    pagination_class = PubDatePagination
+    parent_model = None
+    parent_url_kwarg = None
+    # Остальные условия на родителя из URL: {поле: kwarg}
+    parent_url_filters = {}
+    parent_version_fields = ()
+
+    def get_parent(self):
+        """Родительский объект из URL, запрашивается один раз за запрос."""
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(
+                self.parent_model,
+                id=self.kwargs[self.parent_url_kwarg],
+                **{field: self.kwargs[kwarg]
+                   for field, kwarg in self.parent_url_filters.items()},
+            )
+        return self._parent
+
+    def get_conditional_state(self):
+        version, modified = (
+            getattr(self.get_parent(), field)
+            for field in self.parent_version_fields
+        )
+        return version, modified and modified.timestamp()
 
 
 class ReviewViewSet(ReviewAndCommentViewSet):
     """Всьюстер для модели Review."""
     serializer_class = serializers.ReviewSerializer
+    parent_model = Title
+    parent_url_kwarg = 'title_id'
+    parent_version_fields = ('reviews_version', 'reviews_modified')
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, id=self.kwargs['title_id'])
-        serializer.save(title=title, author=self.request.user)
+        serializer.save(title=self.get_parent(),
+                        author=get_full_user(self.request.user))
 
     def get_queryset(self):
-        title = get_object_or_404(Title, id=self.kwargs['title_id'])
-        return title.reviews.all()
+        return self.get_parent().reviews.all()
 
 
 class CommentViewSet(ReviewAndCommentViewSet):
     """Всьюстер для модели Comment."""
     serializer_class = serializers.CommentSerializer
+    parent_model = Review
+    parent_url_kwarg = 'review_id'
+    parent_url_filters = {'title_id': 'title_id'}
+    parent_version_fields = ('comments_version', 'comments_modified')
 
     def perform_create(self, serializer):
-        review = get_object_or_404(Review, id=self.kwargs['review_id'])
-        serializer.save(review=review, author=self.request.user)
+        serializer.save(review=self.get_parent(),
+                        author=get_full_user(self.request.user))
 
     def get_queryset(self):
-        review_id = self.kwargs.get('review_id')
-        review = get_object_or_404(Review, id=review_id)
-        return review.comments.all()
+        return self.get_parent().comments.all()
 
 
 class UserViewSet(viewsets.ModelViewSet):
@@ -139,16 +271,17 @@ class UserViewSet(viewsets.ModelViewSet):
         permission_classes=[IsAuthenticated]
     )
     def me(self, request, pk=None):
+        user = get_full_user(request.user)
         if request.method == 'GET':
-            serializer = self.get_serializer(instance=request.user)
+            serializer = self.get_serializer(instance=user)
             return Response(serializer.data, status=status.HTTP_200_OK)
-        if request.user.is_user:
+        if user.is_user:
             serializer = serializers.UserRoleSerializer(
-                instance=request.user, data=request.data, partial=True
+                instance=user, data=request.data, partial=True
             )
         else:
             serializer = self.get_serializer(
-                instance=request.user, data=request.data, partial=True
+                instance=user, data=request.data, partial=True
             )
         serializer.is_valid(raise_exception=True)
         serializer.save()
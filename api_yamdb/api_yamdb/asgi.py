@@ -1,7 +1,12 @@
 import os
 
-from django.core.asgi import get_asgi_application
+from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+# Django 2.2 не умеет ASGI, синхронный обработчик выполняется в пуле потоков
+wsgi_application = get_wsgi_application()
+
+from api.asgi import ThreadPoolASGIHandler  # noqa: E402
+
+application = ThreadPoolASGIHandler(wsgi_application)
@@ -34,6 +34,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.PerformanceMiddleware',
+    'api.compression.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -67,6 +69,8 @@ WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 # Database
 
+CONN_MAX_AGE = os.getenv('DB_CONN_MAX_AGE', '60')
+
 DATABASES = {
     'default': {
         'ENGINE': os.getenv('DB_ENGINE', 'django.db.backends.postgresql'),
@@ -75,9 +79,66 @@ DATABASES = {
         'PASSWORD': os.getenv('POSTGRES_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT'),
+        # Соединение переиспользуется между запросами столько секунд;
+        # 0 закрывает его после каждого запроса, None держит без ограничения
+        'CONN_MAX_AGE': (
+            None if CONN_MAX_AGE == 'None' else int(CONN_MAX_AGE)
+        ),
+        # Проверка постоянного соединения в начале запроса (api.connections)
+        'CONN_HEALTH_CHECKS': os.getenv(
+            'DB_CONN_HEALTH_CHECKS', 'True'
+        ) == 'True',
+        # Для pgbouncer в режиме pool_mode = transaction
+        'DISABLE_SERVER_SIDE_CURSORS': os.getenv(
+            'DB_DISABLE_SERVER_SIDE_CURSORS', 'False'
+        ) == 'True',
+    }
+}
+
+
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
     }
 }
 
+API_CACHE_ALIAS = os.getenv('API_CACHE_ALIAS', 'default')
+API_CACHE_TIMEOUT = int(os.getenv('API_CACHE_TIMEOUT', 300))
+# Версии групп кеша и токенов; кеш должен быть общим для воркеров, иначе
+# чужая инвалидация видна только через CACHE_VERSION_TIMEOUT секунд
+CACHE_VERSION_ALIAS = os.getenv('CACHE_VERSION_ALIAS', 'default')
+CACHE_VERSION_TIMEOUT = int(os.getenv('CACHE_VERSION_TIMEOUT', 30))
+
+# Наибольшее число произведений в одном запросе к /titles/bulk/
+BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', 10000))
+
+# Строк на одно чтение серверного курсора при выгрузке /export/
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 2000))
+
+
+# ASGI (api_yamdb.asgi): потоки для синхронных представлений Django
+
+ASGI_READ_THREADS = int(os.getenv('ASGI_READ_THREADS', 32))
+ASGI_THREADS = int(os.getenv('ASGI_THREADS', 8))
+
+
+# Сжатие ответов (api.compression): кодировки в порядке предпочтения,
+# пустая строка отключает сжатие
+
+COMPRESSION_ENCODINGS = tuple(
+    encoding for encoding in os.getenv(
+        'COMPRESSION_ENCODINGS', 'br,gzip'
+    ).split(',') if encoding
+)
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 4))
+
 
 # Password validation
 
@@ -114,6 +175,8 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'static')
+# Имена с хешем содержимого; собирается командой buildstatic
+STATICFILES_STORAGE = 'api.staticfiles.HashedStaticFilesStorage'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
@@ -125,7 +188,18 @@ REST_FRAMEWORK = {
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.ClaimsJWTAuthentication',
+    ],
+
+    # orjson, если установлен; вывод совпадает с JSONRenderer
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
 
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
@@ -142,3 +216,28 @@ AUTH_USER_MODEL = 'reviews.User'
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 EMAIL = 'from@yamdb.com'
+
+# Performance instrumentation
+
+PERFORMANCE_SERVER_TIMING = os.getenv(
+    'PERFORMANCE_SERVER_TIMING', 'False'
+) == 'True'
+# Запросы с большим числом SQL-запросов помечаются; 0 отключает проверку
+PERFORMANCE_QUERY_BUDGET = int(os.getenv('PERFORMANCE_QUERY_BUDGET', 0))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'api.performance': {
+            'handlers': ['console'],
+            'level': os.getenv('PERFORMANCE_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
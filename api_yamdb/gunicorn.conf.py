@@ -0,0 +1,102 @@
+"""Настройки gunicorn для продакшена.
+
+Число воркеров считается по CPU, доступным контейнеру, и ограничено
+бюджетом соединений с БД GUNICORN_DB_CONNECTIONS: при CONN_MAX_AGE > 0
+каждый поток воркера держит своё соединение. Любое значение можно
+переопределить переменными окружения GUNICORN_*.
+"""
+import math
+import os
+
+
+def get_cgroup_quota():
+    """Квота CPU контейнера из cgroup v2 или v1, None без ограничения."""
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as file:
+            quota, period = file.read().split()[:2]
+        return None if quota == 'max' else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as file:
+            quota = int(file.read())
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as file:
+            period = int(file.read())
+    except (OSError, ValueError):
+        return None
+    return quota / period if quota > 0 else None
+
+
+def get_cpu_count():
+    """CPU процесса с учётом affinity и квоты cgroup, а не все CPU хоста."""
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:
+        count = os.cpu_count() or 1
+    quota = get_cgroup_quota()
+    if quota:
+        count = min(count, max(1, math.ceil(quota)))
+    return count
+
+
+CPU_COUNT = get_cpu_count()
+# Соединений с БД на все воркеры контейнера; max_connections PostgreSQL
+# по умолчанию 100, остаток — для mailer, миграций и psql
+DB_CONNECTIONS = int(os.getenv('GUNICORN_DB_CONNECTIONS', 80))
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+
+# gthread: потоки в каждом воркере, ждущие БД запросы не блокируют воркер;
+# gevent требует пакетов gevent и psycogreen; для api_yamdb.asgi —
+# uvicorn.workers.UvicornWorker
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+if worker_class == 'gevent':
+    # Соединение держит каждый гринлет, бюджет делится между воркерами
+    workers = int(os.getenv('GUNICORN_WORKERS',
+                            min(CPU_COUNT * 2 + 1, DB_CONNECTIONS)))
+    worker_connections = int(os.getenv(
+        'GUNICORN_WORKER_CONNECTIONS', max(1, DB_CONNECTIONS // workers)
+    ))
+else:
+    if 'uvicorn' in worker_class.lower():
+        # Потоки пулов api.asgi.ThreadPoolASGIHandler
+        worker_threads = (int(os.getenv('ASGI_READ_THREADS', 32))
+                          + int(os.getenv('ASGI_THREADS', 8)))
+    else:
+        worker_threads = threads
+    workers = int(os.getenv('GUNICORN_WORKERS', max(
+        1, min(CPU_COUNT * 2 + 1, DB_CONNECTIONS // worker_threads)
+    )))
+    worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+# Django и DRF импортируются один раз в мастере, воркеры делят эту
+# память через copy-on-write
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True') == 'True'
+
+# Воркер перезапускается после стольких запросов, джиттер не даёт
+# всем воркерам перезапуститься одновременно
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+
+
+def pre_fork(server, worker):
+    # Соединения с БД, открытые в мастере при preload_app, закрываются до
+    # fork: закрытие в воркере оборвало бы сокет, общий с мастером
+    if not preload_app:
+        return
+    from django.db import connections
+    connections.close_all()
+
+
+def post_fork(server, worker):
+    if worker_class == 'gevent':
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
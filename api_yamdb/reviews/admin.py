@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from .models import Category, Comment, Genre, Review, Title, User
+from .models import (Category, Comment, Genre, OutgoingEmail, Review, Title,
+                     User)
 
 
 class TitleAdmin(admin.ModelAdmin):
@@ -33,9 +34,16 @@ class CommentAdmin(admin.ModelAdmin):
     list_filter = ("author", "review")
 
 
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ("pk", "recipient", "subject", "created", "attempts",
+                    "sent")
+    search_fields = ("recipient",)
+
+
 admin.site.register(Title, TitleAdmin)
 admin.site.register(Category, CategoryAdmin)
 admin.site.register(Genre, GenreAdmin)
 admin.site.register(Review, ReviewAdmin)
 admin.site.register(Comment, CommentAdmin)
 admin.site.register(User)
+admin.site.register(OutgoingEmail, OutgoingEmailAdmin)
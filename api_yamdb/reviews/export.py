@@ -0,0 +1,96 @@
+"""Потоковая выгрузка таблиц в CSV и NDJSON в формате addcsv."""
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .management.commands.addcsv import CSV_TO_SQL
+
+CSV = 'csv'
+NDJSON = 'ndjson'
+FORMATS = (CSV, NDJSON)
+CONTENT_TYPES = {
+    CSV: 'text/csv; charset=utf-8',
+    NDJSON: 'application/x-ndjson',
+}
+
+# Столбцы выгрузки под именами, которые читает addcsv; пароли,
+# счётчики и версии кешей не выгружаются
+COLUMNS = {
+    'users.csv': ('id', 'username', 'email', 'role', 'bio', 'first_name',
+                  'last_name'),
+    'category.csv': ('id', 'name', 'slug'),
+    'genre.csv': ('id', 'name', 'slug'),
+    'titles.csv': ('id', 'name', 'year', 'category', 'description',
+                   'rating'),
+    'genre_title.csv': ('id', 'title_id', 'genre_id'),
+    'review.csv': ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+    'comments.csv': ('id', 'review_id', 'text', 'author', 'pub_date'),
+}
+
+# Таблицы в порядке загрузки addcsv: (имя без расширения, модель, столбцы)
+DATASETS = tuple(
+    (name[:-len('.csv')], model, COLUMNS[name], renames)
+    for name, model, renames in CSV_TO_SQL
+)
+
+
+class Echo:
+    """Файл для csv.writer, который возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def get_dataset(name):
+    for dataset in DATASETS:
+        if dataset[0] == name:
+            return dataset
+    raise KeyError(name)
+
+
+def get_rows(name, chunk_size):
+    """Строки таблицы по первичному ключу, через серверный курсор."""
+    _, model, columns, renames = get_dataset(name)
+    return model.objects.order_by('pk').values_list(
+        *(renames.get(column, column) for column in columns)
+    ).iterator(chunk_size=chunk_size)
+
+
+def format_value(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def export_csv(name, chunk_size):
+    """Строки CSV с заголовком, по chunk_size строк в куске."""
+    writer = csv.writer(Echo())
+    lines = [writer.writerow(get_dataset(name)[2])]
+    for row in get_rows(name, chunk_size):
+        lines.append(writer.writerow([format_value(value) for value in row]))
+        if len(lines) >= chunk_size:
+            yield ''.join(lines).encode()
+            lines = []
+    yield ''.join(lines).encode()
+
+
+def export_ndjson(name, chunk_size):
+    """Объекты JSON по одному в строке, по chunk_size строк в куске."""
+    columns = get_dataset(name)[2]
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    lines = []
+    for row in get_rows(name, chunk_size):
+        lines.append(encoder.encode(dict(zip(columns, row))) + '\n')
+        if len(lines) >= chunk_size:
+            yield ''.join(lines).encode()
+            lines = []
+    if lines:
+        yield ''.join(lines).encode()
+
+
+def export(name, export_format, chunk_size):
+    """Куски байтов таблицы name в формате export_format."""
+    get_dataset(name)
+    if export_format == CSV:
+        return export_csv(name, chunk_size)
+    return export_ndjson(name, chunk_size)
@@ -1,109 +1,224 @@
 import csv
+import io
+import os
+import time
+from itertools import islice
 
-from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
 
 from reviews import models
-from api_yamdb.settings import STATICFILES_DIRS
+
+# Соответствие имён файлов csv моделям и переименование столбцов
+# Conformity csv-file names to models and csv columns to model attributes
+CSV_TO_SQL = (
+    ('users.csv', models.User, {}),
+    ('category.csv', models.Category, {}),
+    ('genre.csv', models.Genre, {}),
+    ('titles.csv', models.Title, {'category': 'category_id'}),
+    ('genre_title.csv', models.GenreTitle,
+     {'title_id': 'title_id_id', 'genre_id': 'genre_id_id'}),
+    ('review.csv', models.Review,
+     {'title_id': 'title_id', 'author': 'author_id'}),
+    ('comments.csv', models.Comment,
+     {'review_id': 'review_id', 'author': 'author_id'}),
+)
+
+COPY_NULL = '\\N'
 
 
 class Command(BaseCommand):
-    """Записывает в базу данных sqlite из csv-файлов."""
+    """Потоково загружает данные в базу из csv-файлов пачками."""
 
-    help = 'Writes to sqlite database from csv files.'
+    help = 'Bulk loads the database from csv files.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=os.path.join(settings.BASE_DIR, 'static', 'data'),
+            help='Directory with csv files.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per bulk insert and transaction.',
+        )
+        mode = parser.add_mutually_exclusive_group()
+        mode.add_argument(
+            '--ignore-conflicts',
+            action='store_true',
+            help='Skip rows whose primary or unique keys already exist.',
+        )
+        mode.add_argument(
+            '--upsert',
+            action='store_true',
+            help='Update rows whose primary keys already exist.',
+        )
 
     def handle(self, *args, **options):
-        # Соответствие имён файлов csv названиям таблиц БД
-        # Conformity csv-file names to database table names
-        CSV_TO_SQL = {
-            'users.csv': models.User,
-            'category.csv': models.Category,
-            'genre.csv': models.Genre,
-            # 'titles.csv': models.Title,
-            # 'comments.csv': models.Comment,
-            # 'genre_title.csv': models.Genre_title,
-            # 'review.csv': models.Review,
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+        self.options = options
+        self.known_ids = {}
+        imported = []
+        for name, model, columns in CSV_TO_SQL:
+            location_csv = os.path.join(options['path'], name)
+            if not os.path.exists(location_csv):
+                self.stdout.write(f'{name} -- not found, skipped')
+                continue
+            with open(location_csv, 'r', encoding='utf-8') as csv_file:
+                self.load(name, model, columns, csv.DictReader(csv_file))
+            imported.append(model)
+
+        self.reset_sequences(imported)
+        if models.Review in imported:
+            # bulk_create не отправляет сигналы, рейтинг пересчитываем целиком
+            call_command('rebuild_ratings', stdout=self.stdout)
+        if imported:
+            self.bump_versions(imported)
+            call_command('apicache', '--invalidate', stdout=self.stdout)
+
+    def load(self, name, model, columns, csv_reader):
+        foreign_keys = {
+            field.attname: field.related_model
+            for field in model._meta.concrete_fields if field.is_relation
         }
+        # Пустая ячейка nullable-столбца — NULL, как её выгружает exportdata
+        nullable = {field.attname for field in model._meta.concrete_fields
+                    if field.null}
+        use_copy = (connection.vendor == 'postgresql'
+                    and not self.options['ignore_conflicts']
+                    and not self.options['upsert'])
+        written = skipped = 0
+        start = time.monotonic()
+        while True:
+            rows = list(islice(csv_reader, self.options['batch_size']))
+            if not rows:
+                break
+            objs = []
+            for row in rows:
+                data = {columns.get(key, key): value
+                        for key, value in row.items()}
+                for attname in nullable.intersection(data):
+                    if data[attname] == '':
+                        data[attname] = None
+                if all(data[attname] in self.get_known_ids(related)
+                       for attname, related in foreign_keys.items()
+                       if attname in data):
+                    objs.append(model(**data))
+                else:
+                    skipped += 1
+            with transaction.atomic():
+                if use_copy:
+                    self.copy(model, objs)
+                elif self.options['upsert']:
+                    self.upsert(model, objs, [
+                        columns.get(key, key)
+                        for key in csv_reader.fieldnames
+                    ])
+                else:
+                    model.objects.bulk_create(
+                        objs,
+                        ignore_conflicts=self.options['ignore_conflicts'],
+                    )
+            self.remember_ids(model, objs)
+            written += len(objs)
 
-        for name in CSV_TO_SQL:
-            print(name, end=' ')
-            location_csv = STATICFILES_DIRS[0] + 'data/' + name
-            with open(location_csv, 'r', encoding='utf-8') as csv_file:
-                csv_reader = csv.DictReader(csv_file)
-                base = CSV_TO_SQL[name]
-                for row in csv_reader:
-                    base.objects.get_or_create(**row)
-            print(' -- filled')
-
-        location_csv = STATICFILES_DIRS[0] + 'data/'
-
-        print('titles.csv', end=' ')
-        with open(location_csv + 'titles.csv', 'r',
-                  encoding='utf-8') as csv_file:
-            csv_reader = csv.DictReader(csv_file)
-            base = models.Title
-            for row in csv_reader:
-                category_id = row['category']
-                category = models.Category.objects.get(id=category_id)
-                base.objects.get_or_create(
-                    id=row['id'],
-                    name=row['name'],
-                    year=row['year'],
-                    category=category,
-                )
-        print(' -- filled')
-
-        print('genre_title.csv', end=' ')
-        with open(location_csv + 'genre_title.csv', 'r',
-                  encoding='utf-8') as csv_file:
-            csv_reader = csv.DictReader(csv_file)
-            base = models.GenreTitle
-            for row in csv_reader:
-                title_id = row['title_id']
-                title = models.Title.objects.get(id=title_id)
-                genre_id = row['genre_id']
-                genre = models.Genre.objects.get(id=genre_id)
-                base.objects.get_or_create(
-                    id=row['id'],
-                    title_id=title,
-                    genre_id=genre,
-                )
-        print(' -- filled')
-
-        print('review.csv', end=' ')
-        with open(location_csv + 'review.csv', 'r',
-                  encoding='utf-8') as csv_file:
-            csv_reader = csv.DictReader(csv_file)
-            base = models.Review
-            for row in csv_reader:
-                author_id = row['author']
-                author = models.User.objects.get(id=author_id)
-                title_id = row['title_id']
-                title = models.Title.objects.get(id=title_id)
-                base.objects.get_or_create(
-                    id=row['id'],
-                    title=title,
-                    text=row['text'],
-                    author=author,
-                    score=row['score'],
-                    pub_date=row['pub_date'],
-                )
-        print(' -- filled')
-
-        print('comments.csv', end=' ')
-        with open(location_csv + 'comments.csv', 'r',
-                  encoding='utf-8') as csv_file:
-            csv_reader = csv.DictReader(csv_file)
-            base = models.Comment
-            for row in csv_reader:
-                author_id = row['author']
-                author = models.User.objects.get(id=author_id)
-                review_id = row['review_id']
-                review = models.Review.objects.get(id=review_id)
-                base.objects.get_or_create(
-                    id=row['id'],
-                    review=review,
-                    text=row['text'],
-                    author=author,
-                    pub_date=row['pub_date'],
-                )
-        print(' -- filled')
+        elapsed = time.monotonic() - start
+        rate = written / elapsed if elapsed else written
+        self.stdout.write(
+            f'{name} -- filled: {written} rows, {skipped} skipped '
+            f'(missing foreign keys), {rate:.0f} rows/sec'
+        )
+
+    def get_known_ids(self, model):
+        """Множество id модели в базе, загружается один раз за запуск."""
+        if model not in self.known_ids:
+            self.known_ids[model] = {
+                str(pk) for pk in model.objects.values_list('pk', flat=True)
+            }
+        return self.known_ids[model]
+
+    def remember_ids(self, model, objs):
+        ids = [obj.pk for obj in objs]
+        if self.options['ignore_conflicts']:
+            # Строки, пропущенные из-за конфликта уникальных полей, в базу
+            # не попали: дочерние строки со ссылкой на них тоже пропускаются
+            ids = model.objects.filter(pk__in=ids).values_list(
+                'pk', flat=True
+            )
+        self.get_known_ids(model).update(str(pk) for pk in ids)
+
+    def copy(self, model, objs):
+        fields = model._meta.concrete_fields
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for obj in objs:
+            writer.writerow([
+                self.copy_value(field.get_db_prep_save(
+                    getattr(obj, field.attname), connection
+                ))
+                for field in fields
+            ])
+        buffer.seek(0)
+        quote_name = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                'COPY {} ({}) FROM STDIN WITH (FORMAT csv, NULL \'{}\')'
+                .format(
+                    quote_name(model._meta.db_table),
+                    ', '.join(quote_name(field.column) for field in fields),
+                    COPY_NULL,
+                ),
+                buffer,
+            )
+
+    @staticmethod
+    def copy_value(value):
+        return COPY_NULL if value is None else value
+
+    def upsert(self, model, objs, attnames):
+        existing = {str(pk) for pk in model.objects.filter(
+            pk__in=[obj.pk for obj in objs]
+        ).values_list('pk', flat=True)}
+        # Обновляются только столбцы из файла: счётчики и версии, которых
+        # в файле нет, не сбрасываются к значениям по умолчанию
+        update_fields = [field.name for field in model._meta.concrete_fields
+                         if field.attname in attnames
+                         and not field.primary_key]
+        if update_fields:
+            model.objects.bulk_update(
+                [obj for obj in objs if str(obj.pk) in existing],
+                update_fields,
+            )
+        model.objects.bulk_create(
+            [obj for obj in objs if str(obj.pk) not in existing]
+        )
+
+    def bump_versions(self, imported):
+        """Меняет версии отзывов и комментариев для ETag их списков."""
+        now = timezone.now()
+        if models.Review in imported:
+            models.Title.objects.update(
+                reviews_version=F('reviews_version') + 1,
+                reviews_modified=now,
+            )
+        if models.Comment in imported:
+            models.Review.objects.update(
+                comments_version=F('comments_version') + 1,
+                comments_modified=now,
+            )
+
+    def reset_sequences(self, imported):
+        statements = connection.ops.sequence_reset_sql(no_style(), imported)
+        if not statements:
+            return
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
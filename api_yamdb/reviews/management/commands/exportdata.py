@@ -0,0 +1,78 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews import export
+
+
+def is_within(path, directory):
+    path, directory = os.path.realpath(path), os.path.realpath(directory)
+    return os.path.commonpath([path, directory]) == directory
+
+
+class Command(BaseCommand):
+    """Потоково выгружает таблицы в файлы, которые читает addcsv."""
+
+    help = 'Streams tables to csv or ndjson files readable by addcsv.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'datasets',
+            nargs='*',
+            metavar='dataset',
+            help='Tables to export: {}. All by default.'.format(
+                ', '.join(name for name, *_ in export.DATASETS)
+            ),
+        )
+        parser.add_argument(
+            '--path',
+            required=True,
+            help='Directory to write files to, outside STATIC_ROOT and '
+                 'MEDIA_ROOT.',
+        )
+        parser.add_argument(
+            '--format',
+            choices=export.FORMATS,
+            default=export.CSV,
+            help='File format.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=settings.EXPORT_CHUNK_SIZE,
+            help='Rows per database fetch and file write.',
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive.')
+        names = [name for name, *_ in export.DATASETS]
+        unknown = set(options['datasets']).difference(names)
+        if unknown:
+            raise CommandError(
+                'Unknown datasets: ' + ', '.join(sorted(unknown))
+            )
+        for root in (settings.STATIC_ROOT, settings.MEDIA_ROOT):
+            # Эти каталоги раздаёт nginx, а в выгрузке есть пользователи
+            if root and is_within(options['path'], root):
+                raise CommandError(
+                    f'Refusing to export into {root}: it is served publicly.'
+                )
+        os.makedirs(options['path'], exist_ok=True)
+        for name in options['datasets'] or names:
+            self.write(name, options)
+
+    def write(self, name, options):
+        file_name = f'{name}.{options["format"]}'
+        start = time.monotonic()
+        size = 0
+        with open(os.path.join(options['path'], file_name), 'wb') as file:
+            for chunk in export.export(name, options['format'],
+                                       options['chunk_size']):
+                size += file.write(chunk)
+        elapsed = time.monotonic() - start
+        self.stdout.write(
+            f'{file_name} -- exported: {size} bytes in {elapsed:.1f} sec'
+        )
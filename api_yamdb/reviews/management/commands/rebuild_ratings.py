@@ -0,0 +1,108 @@
+import math
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from reviews.models import SCORES, Review, ScoreHistogram, Title
+
+
+class Command(BaseCommand):
+    """Пересчитывает рейтинги и распределения оценок по отзывам."""
+
+    help = 'Rebuilds or checks denormalized title ratings and histograms.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report titles with outdated ratings or histograms.',
+        )
+
+    def handle(self, *args, **options):
+        outdated = self.get_outdated_ratings()
+        missing, changed = self.get_outdated_histograms()
+
+        if options['check']:
+            errors = []
+            if outdated:
+                errors.append('Outdated ratings for titles: ' + ', '.join(
+                    str(title.id) for title in outdated
+                ))
+            if missing or changed:
+                errors.append('Outdated histograms for titles: ' + ', '.join(
+                    str(histogram.title_id)
+                    for histogram in missing + changed
+                ))
+            if errors:
+                raise CommandError('\n'.join(errors))
+            self.stdout.write('All ratings are up to date.')
+            return
+
+        with transaction.atomic():
+            Title.objects.bulk_update(
+                outdated, ['rating_sum', 'rating_count', 'rating'],
+                batch_size=500,
+            )
+            ScoreHistogram.objects.bulk_create(missing, batch_size=500)
+            ScoreHistogram.objects.bulk_update(
+                changed, [f'score_{score}' for score in SCORES],
+                batch_size=500,
+            )
+        self.stdout.write(
+            f'Rebuilt ratings for {len(outdated)} titles, '
+            f'histograms for {len(missing) + len(changed)} titles.'
+        )
+
+    def get_outdated_ratings(self):
+        stats = {
+            row['title']: (row['total'], row['count'])
+            for row in Review.objects.values('title').annotate(
+                total=Sum('score'), count=Count('id')
+            ).order_by()
+        }
+        outdated = []
+        titles = Title.objects.only('id', 'rating_sum', 'rating_count',
+                                    'rating')
+        for title in titles.iterator():
+            total, count = stats.get(title.id, (0, 0))
+            rating = total / count if count else None
+            if (title.rating_sum, title.rating_count) == (total, count) and (
+                rating == title.rating
+                or rating is not None and title.rating is not None
+                and math.isclose(rating, title.rating)
+            ):
+                continue
+            title.rating_sum = total
+            title.rating_count = count
+            title.rating = rating
+            outdated.append(title)
+        return outdated
+
+    def get_outdated_histograms(self):
+        """Недостающие и устаревшие строки распределений оценок."""
+        counts = {}
+        for row in Review.objects.filter(score__in=SCORES).values(
+            'title', 'score'
+        ).annotate(count=Count('id')).order_by():
+            counts.setdefault(row['title'], {})[row['score']] = row['count']
+        histograms = {
+            histogram.title_id: histogram
+            for histogram in ScoreHistogram.objects.iterator()
+        }
+        missing = []
+        changed = []
+        for title_id in counts.keys() | histograms.keys():
+            expected = {score: counts.get(title_id, {}).get(score, 0)
+                        for score in SCORES}
+            histogram = histograms.get(title_id)
+            if histogram is None:
+                histogram = ScoreHistogram(title_id=title_id)
+                missing.append(histogram)
+            elif histogram.counts == expected:
+                continue
+            else:
+                changed.append(histogram)
+            for score, count in expected.items():
+                setattr(histogram, f'score_{score}', count)
+        return missing, changed
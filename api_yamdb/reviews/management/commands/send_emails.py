@@ -0,0 +1,81 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.outbox import purge, send_pending
+
+# Как часто --loop удаляет старые письма, секунды
+PURGE_INTERVAL = 3600
+
+
+class Command(BaseCommand):
+    """Отправляет письма из очереди пачками с повторными попытками."""
+
+    help = 'Sends queued emails in batches, retrying failures with backoff.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Emails sent over one mail server connection.',
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=5,
+            help='Attempts before an email is left unsent.',
+        )
+        parser.add_argument(
+            '--backoff',
+            type=int,
+            default=60,
+            help='Seconds before the first retry, doubled on each attempt.',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling the queue instead of exiting when drained.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Seconds between polls of an empty queue with --loop.',
+        )
+        parser.add_argument(
+            '--retention-days',
+            type=float,
+            default=7,
+            help='Days to keep sent and abandoned emails before deleting.',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['max_attempts'] < 1:
+            raise CommandError(
+                '--batch-size and --max-attempts must be positive.'
+            )
+        if options['retention_days'] < 0:
+            raise CommandError('--retention-days must not be negative.')
+        purged_at = None
+        while True:
+            if (purged_at is None
+                    or time.monotonic() - purged_at >= PURGE_INTERVAL):
+                self.purge(options)
+                purged_at = time.monotonic()
+            sent, failed = send_pending(options['batch_size'],
+                                        options['max_attempts'],
+                                        options['backoff'])
+            if sent or failed:
+                self.stdout.write(f'Sent {sent} emails, {failed} failed.')
+            elif options['loop']:
+                time.sleep(options['interval'])
+            else:
+                break
+
+    def purge(self, options):
+        deleted = purge(timedelta(days=options['retention_days']),
+                        options['max_attempts'])
+        if deleted:
+            self.stdout.write(f'Deleted {deleted} old emails.')
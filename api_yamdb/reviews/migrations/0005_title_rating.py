@@ -0,0 +1,42 @@
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_ratings(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Title = apps.get_model('reviews', 'Title')
+    stats = Review.objects.values('title').annotate(
+        total=Sum('score'), count=Count('id')
+    ).order_by()
+    for row in stats:
+        Title.objects.filter(pk=row['title']).update(
+            rating_sum=row['total'],
+            rating_count=row['count'],
+            rating=row['total'] / row['count'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_auto_20211224_1833'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(db_index=True, editable=False, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def fill_modified(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Comment = apps.get_model('reviews', 'Comment')
+    Title = apps.get_model('reviews', 'Title')
+    for row in Review.objects.values('title').annotate(
+        modified=Max('pub_date')
+    ).order_by():
+        Title.objects.filter(pk=row['title']).update(
+            reviews_modified=row['modified']
+        )
+    for row in Comment.objects.values('review').annotate(
+        modified=Max('pub_date')
+    ).order_by():
+        Review.objects.filter(pk=row['review']).update(
+            comments_modified=row['modified']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_title_rating'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='reviews_version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Версия отзывов'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='reviews_modified',
+            field=models.DateTimeField(editable=False, null=True, verbose_name='Дата изменения отзывов'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='comments_version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Версия комментариев'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='comments_modified',
+            field=models.DateTimeField(editable=False, null=True, verbose_name='Дата изменения комментариев'),
+        ),
+        migrations.RunPython(fill_modified, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+
+# icontains на PostgreSQL превращается в UPPER(name) LIKE UPPER('%x%'),
+# поэтому индекс строится по тому же выражению.
+SEARCH_INDEXES = (
+    ('reviews_title_name_trgm', 'reviews_title'),
+    ('reviews_category_name_trgm', 'reviews_category'),
+    ('reviews_genre_name_trgm', 'reviews_genre'),
+)
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for index, table in SEARCH_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {index} ON {table} '
+            f'USING gin (UPPER(name) gin_trgm_ops)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for index, _ in SEARCH_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {index}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_conditional_versions'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 2.2.16 on 2026-10-18 05:47
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+import reviews.models
+
+
+def delete_duplicate_genres(apps, schema_editor):
+    GenreTitle = apps.get_model('reviews', 'GenreTitle')
+    duplicates = GenreTitle.objects.values('title_id', 'genre_id').annotate(
+        first_id=Min('id'), count=Count('id')
+    ).filter(count__gt=1).order_by()
+    for row in duplicates:
+        GenreTitle.objects.filter(
+            title_id=row['title_id'], genre_id=row['genre_id']
+        ).exclude(id=row['first_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_pub_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='title',
+            name='year',
+            field=models.SmallIntegerField(db_index=True, validators=[reviews.models.validate_year], verbose_name='Год выпуска'),
+        ),
+        migrations.AddIndex(
+            model_name='genretitle',
+            index=models.Index(fields=['genre_id', 'title_id'], name='genre_title_genre_title'),
+        ),
+        migrations.RunPython(delete_duplicate_genres,
+                             migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='genretitle',
+            constraint=models.UniqueConstraint(fields=('title_id', 'genre_id'), name='unique_title_genre'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 2.2.16 on 2026-10-18 06:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_scorehistogram'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheVersion',
+            fields=[
+                ('group', models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name='Группа')),
+                ('version', models.BigIntegerField(verbose_name='Версия')),
+                ('modified', models.DateTimeField(null=True, verbose_name='Дата изменения')),
+            ],
+            options={
+                'verbose_name': 'Версия кеша',
+                'verbose_name_plural': 'Версии кеша',
+            },
+        ),
+    ]
@@ -1,7 +1,7 @@
 from datetime import datetime
 
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
@@ -115,6 +115,7 @@ class Title(models.Model):
     year = models.SmallIntegerField(
         verbose_name='Год выпуска',
         validators=[validate_year],
+        db_index=True,
     )
     description = models.TextField(verbose_name='Описание', blank=True,)
     genre = models.ManyToManyField(
@@ -127,6 +128,126 @@ class Title(models.Model):
         verbose_name='Категория',
         on_delete=models.DO_NOTHING,
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False,
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок',
+        default=0,
+        editable=False,
+    )
+    rating = models.FloatField(
+        verbose_name='Рейтинг',
+        null=True,
+        editable=False,
+        db_index=True,
+    )
+    reviews_version = models.PositiveIntegerField(
+        verbose_name='Версия отзывов',
+        default=0,
+        editable=False,
+    )
+    reviews_modified = models.DateTimeField(
+        verbose_name='Дата изменения отзывов',
+        null=True,
+        editable=False,
+    )
+
+
+SCORES = range(1, 11)
+
+
+class ScoreHistogram(models.Model):
+    """Количество оценок произведения по значениям от 1 до 10.
+
+    Счётчики обновляются сигналами отзывов, поэтому статистика
+    произведения читается одной строкой без агрегации по отзывам.
+    """
+    title = models.OneToOneField(
+        Title,
+        verbose_name='Произведение',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='score_histogram',
+    )
+    score_1 = models.PositiveIntegerField(
+        verbose_name='Оценок 1',
+        default=0,
+    )
+    score_2 = models.PositiveIntegerField(
+        verbose_name='Оценок 2',
+        default=0,
+    )
+    score_3 = models.PositiveIntegerField(
+        verbose_name='Оценок 3',
+        default=0,
+    )
+    score_4 = models.PositiveIntegerField(
+        verbose_name='Оценок 4',
+        default=0,
+    )
+    score_5 = models.PositiveIntegerField(
+        verbose_name='Оценок 5',
+        default=0,
+    )
+    score_6 = models.PositiveIntegerField(
+        verbose_name='Оценок 6',
+        default=0,
+    )
+    score_7 = models.PositiveIntegerField(
+        verbose_name='Оценок 7',
+        default=0,
+    )
+    score_8 = models.PositiveIntegerField(
+        verbose_name='Оценок 8',
+        default=0,
+    )
+    score_9 = models.PositiveIntegerField(
+        verbose_name='Оценок 9',
+        default=0,
+    )
+    score_10 = models.PositiveIntegerField(
+        verbose_name='Оценок 10',
+        default=0,
+    )
+
+    class Meta:
+        verbose_name = 'Распределение оценок'
+        verbose_name_plural = 'Распределения оценок'
+
+    @property
+    def counts(self):
+        return {score: getattr(self, f'score_{score}') for score in SCORES}
+
+    @property
+    def count(self):
+        return sum(self.counts.values())
+
+    @property
+    def mean(self):
+        count = self.count
+        if not count:
+            return None
+        return sum(
+            score * number for score, number in self.counts.items()
+        ) / count
+
+    @property
+    def median(self):
+        count = self.count
+        if not count:
+            return None
+        # Средние элементы упорядоченных оценок: один или два
+        middle = {(count - 1) // 2, count // 2}
+        values = []
+        seen = 0
+        for score, number in self.counts.items():
+            values.extend(score for position in middle
+                          if seen <= position < seen + number)
+            seen += number
+        return sum(values) / len(values)
 
 
 class GenreTitle(models.Model):
@@ -144,6 +265,17 @@ class GenreTitle(models.Model):
     )
 
     class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title_id', 'genre_id'],
+                name='unique_title_genre'
+            )
+        ]
+        # Фильтр по жанру идёт от жанра к произведениям
+        indexes = [
+            models.Index(fields=['genre_id', 'title_id'],
+                         name='genre_title_genre_title'),
+        ]
         verbose_name = 'Жанры произведений'
         verbose_name_plural = 'Жанры произведений'
 
@@ -168,7 +300,17 @@ class Review(models.Model):
         validators=[validate_score])
     pub_date = models.DateTimeField(
         verbose_name='Дата публикации',
-        default=timezone.now()
+        default=timezone.now
+    )
+    comments_version = models.PositiveIntegerField(
+        verbose_name='Версия комментариев',
+        default=0,
+        editable=False,
+    )
+    comments_modified = models.DateTimeField(
+        verbose_name='Дата изменения комментариев',
+        null=True,
+        editable=False,
     )
 
     class Meta:
@@ -178,12 +320,24 @@ class Review(models.Model):
                 name='unique_title_author'
             )
         ]
+        # Лента отзывов произведения читается по индексу, без сортировки
+        indexes = [
+            models.Index(fields=['title', 'pub_date', 'id'],
+                         name='review_title_pub_date'),
+        ]
+        ordering = ('pub_date', 'id')
         verbose_name = 'Отзывы'
         verbose_name_plural = 'Отзывы'
 
     def __str__(self):
         return self.text
 
+    def save(self, *args, **kwargs):
+        # Рейтинг и версия отзывов произведения обновляются в post_save,
+        # поэтому отзыв и произведение сохраняются в одной транзакции.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     """Модель для комментариев к отзыву."""
@@ -202,12 +356,84 @@ class Comment(models.Model):
     )
     pub_date = models.DateTimeField(
         verbose_name='Дата публикации',
-        default=timezone.now()
+        default=timezone.now
     )
 
     class Meta:
+        indexes = [
+            models.Index(fields=['review', 'pub_date', 'id'],
+                         name='comment_review_pub_date'),
+        ]
+        ordering = ('pub_date', 'id')
         verbose_name = 'Комментарии'
         verbose_name_plural = 'Комментарии'
 
     def __str__(self):
         return self.text
+
+    def save(self, *args, **kwargs):
+        # Версия комментариев отзыва обновляется в post_save.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку.
+
+    Запись создаётся в транзакции запроса, а отправляет её команда
+    send_emails пачками через одно соединение с почтовым сервером.
+    """
+    subject = models.CharField(verbose_name='Тема', max_length=255)
+    body = models.TextField(verbose_name='Текст')
+    from_email = models.CharField(verbose_name='Отправитель', max_length=254)
+    recipient = models.EmailField(verbose_name='Получатель', max_length=254)
+    created = models.DateTimeField(
+        verbose_name='Дата создания',
+        auto_now_add=True,
+    )
+    next_attempt = models.DateTimeField(
+        verbose_name='Следующая попытка',
+        default=timezone.now,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Попыток отправки',
+        default=0,
+    )
+    sent = models.DateTimeField(verbose_name='Дата отправки', null=True)
+    last_error = models.TextField(verbose_name='Последняя ошибка', blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['next_attempt'],
+                name='outgoing_email_pending',
+                condition=models.Q(sent__isnull=True),
+            ),
+        ]
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
+
+
+class CacheVersion(models.Model):
+    """Версия группы закешированных ответов API или токенов пользователя.
+
+    Версии хранятся в БД, а не в кеше процесса: инвалидация, сделанная
+    одним воркером, сразу видна всем остальным.
+    """
+    group = models.CharField(
+        verbose_name='Группа',
+        max_length=100,
+        primary_key=True,
+    )
+    version = models.BigIntegerField(verbose_name='Версия')
+    modified = models.DateTimeField(verbose_name='Дата изменения', null=True)
+
+    class Meta:
+        verbose_name = 'Версия кеша'
+        verbose_name_plural = 'Версии кеша'
+
+    def __str__(self):
+        return f'{self.group}: {self.version}'
@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.db import models, transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+
+def queue_mail(subject, message, from_email, recipient_list):
+    """Ставит письмо в очередь вместо отправки, аналог send_mail."""
+    OutgoingEmail.objects.bulk_create(
+        OutgoingEmail(subject=subject, body=message, from_email=from_email,
+                      recipient=recipient)
+        for recipient in recipient_list
+    )
+
+
+def claim_batch(batch_size, max_attempts, backoff):
+    """Забирает пачку писем и сразу назначает им следующую попытку.
+
+    Если отправка не завершится (сбой воркера), письмо будет отправлено
+    повторно после паузы; параллельные воркеры пропускают
+    заблокированные строки.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True).filter(
+                sent__isnull=True,
+                next_attempt__lte=now,
+                attempts__lt=max_attempts,
+            ).order_by('next_attempt')[:batch_size]
+        )
+        for email in emails:
+            email.attempts += 1
+            email.next_attempt = now + timedelta(
+                seconds=backoff * 2 ** (email.attempts - 1)
+            )
+        OutgoingEmail.objects.bulk_update(emails,
+                                          ['attempts', 'next_attempt'])
+    return emails
+
+
+def send_pending(batch_size=100, max_attempts=5, backoff=60):
+    """Отправляет одну пачку писем, возвращает (отправлено, с ошибкой)."""
+    emails = claim_batch(batch_size, max_attempts, backoff)
+    if not emails:
+        return 0, 0
+    sent, failed = [], []
+    with get_connection() as connection:
+        for email in emails:
+            message = EmailMessage(email.subject, email.body,
+                                   email.from_email, [email.recipient],
+                                   connection=connection)
+            try:
+                message.send()
+            except Exception as error:
+                email.last_error = f'{type(error).__name__}: {error}'
+                failed.append(email)
+            else:
+                email.sent = timezone.now()
+                email.last_error = ''
+                # Текст с кодом подтверждения после отправки не хранится
+                email.body = ''
+                sent.append(email)
+    OutgoingEmail.objects.bulk_update(sent + failed,
+                                      ['sent', 'last_error', 'body'])
+    return len(sent), len(failed)
+
+
+def purge(retention, max_attempts):
+    """Удаляет отправленные и брошенные письма старше retention.
+
+    Возвращает число удалённых писем.
+    """
+    cutoff = timezone.now() - retention
+    deleted, _ = OutgoingEmail.objects.filter(
+        models.Q(sent__lt=cutoff)
+        | models.Q(sent__isnull=True, attempts__gte=max_attempts,
+                   created__lt=cutoff)
+    ).delete()
+    return deleted
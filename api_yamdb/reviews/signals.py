@@ -0,0 +1,122 @@
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast, NullIf
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_delete, pre_save)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import SCORES, Comment, Review, ScoreHistogram, Title
+
+
+def touch_title(title_id, score=0, count=0):
+    """Атомарно обновляет рейтинг и версию отзывов произведения."""
+    rating_sum = F('rating_sum') + score
+    rating_count = F('rating_count') + count
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        rating=Cast(rating_sum, FloatField()) / NullIf(rating_count, 0),
+        reviews_version=F('reviews_version') + 1,
+        reviews_modified=timezone.now(),
+    )
+
+
+def count_score(title_id, score, delta):
+    """Атомарно меняет счётчик оценки в распределении произведения."""
+    if score not in SCORES:
+        return
+    field = f'score_{score}'
+    histograms = ScoreHistogram.objects.filter(title_id=title_id)
+    if histograms.update(**{field: F(field) + delta}) or delta < 0:
+        return
+    # Строка распределения создаётся при первой оценке произведения
+    ScoreHistogram.objects.get_or_create(title_id=title_id)
+    histograms.update(**{field: F(field) + delta})
+
+
+def rescore(saved, current):
+    """Переносит оценку отзыва в распределениях произведений."""
+    if saved == current:
+        return
+    if saved is not None:
+        count_score(saved[0], saved[1], -1)
+    if current is not None:
+        count_score(current[0], current[1], 1)
+
+
+def touch_review(review_id):
+    """Атомарно обновляет версию комментариев отзыва."""
+    Review.objects.filter(pk=review_id).update(
+        comments_version=F('comments_version') + 1,
+        comments_modified=timezone.now(),
+    )
+
+
+SCORE_FIELDS = ('title_id', 'score')
+# Оценка отзыва, загруженного через only() без этих полей
+DEFERRED = object()
+
+
+@receiver(post_init, sender=Review)
+def remember_score(sender, instance, **kwargs):
+    if not instance.pk:
+        instance._saved_score = None
+    elif instance.get_deferred_fields().intersection(SCORE_FIELDS):
+        instance._saved_score = DEFERRED
+    else:
+        instance._saved_score = (instance.title_id, instance.score)
+
+
+@receiver(pre_save, sender=Review)
+@receiver(pre_delete, sender=Review)
+def load_deferred_score(sender, instance, raw=False, **kwargs):
+    # save и delete уже открыли транзакцию, старая оценка читается в ней
+    if raw or instance._saved_score is not DEFERRED:
+        return
+    saved = sender.objects.filter(pk=instance.pk).values_list(
+        *SCORE_FIELDS
+    ).first()
+    instance._saved_score = saved
+    if saved is None:
+        return
+    # Незаданные поля заполняются сразу: после удаления строки
+    # обработчики post_delete уже не смогут их догрузить
+    deferred = instance.get_deferred_fields()
+    for field, value in zip(SCORE_FIELDS, saved):
+        if field in deferred:
+            setattr(instance, field, value)
+
+
+@receiver(post_save, sender=Review)
+def update_title_on_save(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    saved = instance._saved_score
+    current = (instance.title_id, instance.score)
+    if created:
+        touch_title(instance.title_id, instance.score, 1)
+        rescore(None, current)
+    elif saved is None:
+        touch_title(instance.title_id)
+    else:
+        if saved[0] == current[0]:
+            touch_title(current[0], current[1] - saved[1])
+        else:
+            touch_title(saved[0], -saved[1], -1)
+            touch_title(current[0], current[1], 1)
+        rescore(saved, current)
+    instance._saved_score = current
+
+
+@receiver(post_delete, sender=Review)
+def update_title_on_delete(sender, instance, **kwargs):
+    saved = instance._saved_score or (instance.title_id, instance.score)
+    touch_title(saved[0], -saved[1], -1)
+    rescore(saved, None)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def update_review(sender, instance, raw=False, **kwargs):
+    if not raw:
+        touch_review(instance.review_id)
@@ -0,0 +1,214 @@
+"""Нагрузочный бенчмарк всех эндпоинтов роутера api/urls.py.
+
+Заполняет отдельную тестовую БД синтетическими данными, измеряет p50/p99
+и пропускную способность для списков, деталей, фильтров и записи,
+сохраняет результаты в JSON и при необходимости сравнивает их с
+результатами другого коммита.
+
+Запуск из корня репозитория:
+    python -m benchmarks.api --titles 5000 --output before.json
+    python -m benchmarks.api --titles 5000 --compare before.json
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import subprocess
+import time
+
+from .seed import seed
+from .utils import ROOT_DIR, measure, print_table, setup_django, test_database
+
+
+def get_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def api_client(user=None):
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    client = APIClient()
+    if user is not None:
+        token = RefreshToken.for_user(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+def build_scenarios():
+    """Сценарии: имя -> (basename роутера, функция одного запроса)."""
+    from reviews.models import Category, Genre, Review, Title, User
+
+    admin = User.objects.create_user(username='bench-admin',
+                                     email='bench-admin@yamdb.fake',
+                                     role='admin')
+    author = User.objects.create_user(username='bench-author',
+                                      email='bench-author@yamdb.fake')
+    anonymous, admin_client, author_client = (
+        api_client(), api_client(admin), api_client(author)
+    )
+    title = Title.objects.order_by('id').first()
+    review = title.reviews.order_by('id').first()
+    own_review = Review.objects.create(title=title, author=author,
+                                       text='Отзыв', score=5)
+    category = Category.objects.order_by('id').first()
+    genre = Genre.objects.order_by('id').first()
+    user = User.objects.order_by('id').first()
+    free_titles = iter(Title.objects.exclude(
+        reviews__author=author
+    ).values_list('id', flat=True).order_by('id'))
+    counter = itertools.count()
+
+    titles_url = '/api/v1/titles/'
+    reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+    comments_url = f'{reviews_url}{review.id}/comments/'
+    return {
+        'categories list': ('category', lambda: anonymous.get(
+            '/api/v1/categories/')),
+        'categories search': ('category', lambda: anonymous.get(
+            '/api/v1/categories/', {'search': category.name[:3]})),
+        'categories create': ('category', lambda: admin_client.post(
+            '/api/v1/categories/',
+            {'name': 'Бенчмарк', 'slug': f'bench-{next(counter)}'})),
+        'genres list': ('genre', lambda: anonymous.get('/api/v1/genres/')),
+        'genres search': ('genre', lambda: anonymous.get(
+            '/api/v1/genres/', {'search': genre.name[:3]})),
+        'titles list': ('title', lambda: anonymous.get(titles_url)),
+        'titles list limit=100': ('title', lambda: anonymous.get(
+            titles_url, {'limit': 100})),
+        'titles detail': ('title', lambda: anonymous.get(
+            f'{titles_url}{title.id}/')),
+        'titles filter genre': ('title', lambda: anonymous.get(
+            titles_url, {'genre': genre.slug})),
+        'titles filter category+year': ('title', lambda: anonymous.get(
+            titles_url, {'category': category.slug, 'year': title.year})),
+        'titles filter name': ('title', lambda: anonymous.get(
+            titles_url, {'name': title.name[:4]})),
+        'titles create': ('title', lambda: admin_client.post(
+            titles_url,
+            {'name': 'Бенчмарк', 'year': 2000, 'category': category.slug,
+             'genre': [genre.slug]})),
+        'reviews list': ('review', lambda: anonymous.get(reviews_url)),
+        'reviews detail': ('review', lambda: anonymous.get(
+            f'{reviews_url}{review.id}/')),
+        'reviews create': ('review', lambda: author_client.post(
+            f'/api/v1/titles/{next(free_titles)}/reviews/',
+            {'text': 'Отзыв', 'score': 7})),
+        'reviews update': ('review', lambda: author_client.patch(
+            f'{reviews_url}{own_review.id}/', {'score': 6})),
+        'comments list': ('comments', lambda: anonymous.get(comments_url)),
+        'comments detail': ('comments', lambda: anonymous.get(
+            f'{comments_url}{review.comments.order_by("id").first().id}/')),
+        'comments create': ('comments', lambda: author_client.post(
+            comments_url, {'text': 'Комментарий'})),
+        'users list': ('user', lambda: admin_client.get('/api/v1/users/')),
+        'users detail': ('user', lambda: admin_client.get(
+            f'/api/v1/users/{user.username}/')),
+        'users me': ('user', lambda: author_client.get(
+            '/api/v1/users/me/')),
+    }
+
+
+def check_coverage(scenarios):
+    from api.urls import router
+
+    covered = {basename for basename, _ in scenarios.values()}
+    missing = [basename for _, _, basename in router.registry
+               if basename not in covered]
+    if missing:
+        raise SystemExit(f'No benchmark scenarios for: {missing}')
+
+
+def run(scenarios, repeat):
+    results = {}
+    for name, (_, request) in scenarios.items():
+        start = time.perf_counter()
+        response = request()
+        if response.status_code >= 400:
+            raise SystemExit(
+                f'{name}: unexpected status {response.status_code}'
+            )
+        stats = measure(request, repeat=repeat, warmup=0)
+        elapsed = time.perf_counter() - start
+        stats['rps'] = (repeat + 1) / elapsed
+        results[name] = {key: round(value, 3)
+                         for key, value in stats.items()}
+    return results
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, encoding='utf-8') as baseline_file:
+        baseline = json.load(baseline_file)['results']
+    rows = []
+    for name, stats in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]['p50']
+        rows.append({
+            'scenario': name,
+            'p50 before': before,
+            'p50 after': stats['p50'],
+            'change %': (stats['p50'] - before) / before * 100
+            if before else 0.0,
+        })
+    print_table(rows, ['scenario', 'p50 before', 'p50 after', 'change %'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--titles', type=int, default=2000)
+    parser.add_argument('--reviews-per-title', type=int, default=5)
+    parser.add_argument('--comments-per-review', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--output', help='Path to save JSON results.')
+    parser.add_argument('--compare', help='Baseline JSON results.')
+    args = parser.parse_args()
+
+    setup_django()
+    import django
+    from django.db import connection
+
+    with test_database():
+        dataset = seed(users=args.users, titles=args.titles,
+                       reviews_per_title=args.reviews_per_title,
+                       comments_per_review=args.comments_per_review)
+        scenarios = build_scenarios()
+        check_coverage(scenarios)
+        results = run(scenarios, args.repeat)
+        vendor = connection.vendor
+
+    print_table(
+        [{'scenario': name, **stats} for name, stats in results.items()],
+        ['scenario', 'p50', 'p99', 'mean', 'rps'],
+    )
+    report = {
+        'commit': get_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'database': vendor,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'repeat': args.repeat,
+        'dataset': dataset,
+        'results': results,
+    }
+    output = args.output or os.path.join(
+        ROOT_DIR, 'benchmarks', 'results', f'{report["commit"]}.json'
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as output_file:
+        json.dump(report, output_file, ensure_ascii=False, indent=2)
+    print(f'Results saved to {output}')
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""WSGI (gunicorn gthread) против ASGI (uvicorn) при высокой конкуренции.
+
+Оба сервера запускаются с одним процессом и одинаковым числом потоков.
+Медленные клиенты (--slow-clients) передают запрос по нескольку байт
+с паузами: под gthread такой клиент занимает поток, под ASGI запрос
+читается в цикле событий.
+
+Запуск из корня репозитория:
+    python -m benchmarks.asgi --concurrency 10 100 --slow-clients 20
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from .utils import PROJECT_DIR, print_table, setup_django, test_database
+from .workers import GUNICORN, wait_ready
+
+UVICORN = shutil.which('uvicorn', path=os.path.dirname(sys.executable)) \
+    or shutil.which('uvicorn')
+
+
+async def fetch(port, path, trickle=0):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    request = (f'GET {path} HTTP/1.1\r\nHost: localhost\r\n'
+               f'Connection: close\r\n\r\n').encode()
+    if trickle:
+        for start in range(0, len(request), 8):
+            writer.write(request[start:start + 8])
+            await writer.drain()
+            await asyncio.sleep(trickle)
+    else:
+        writer.write(request)
+    response = await reader.read()
+    writer.close()
+    if not response.startswith(b'HTTP/1.1 200'):
+        raise RuntimeError(response[:200])
+
+
+async def load(port, path, concurrency, slow_clients, trickle, duration):
+    deadline = time.monotonic() + duration
+    timings = []
+
+    async def client():
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            await fetch(port, path)
+            timings.append((time.perf_counter() - start) * 1000)
+
+    async def slow_client():
+        while time.monotonic() < deadline:
+            await fetch(port, path, trickle)
+
+    await asyncio.gather(*(
+        [client() for _ in range(concurrency)]
+        + [slow_client() for _ in range(slow_clients)]
+    ))
+    timings.sort()
+    return {
+        'requests/sec': len(timings) / duration,
+        'p50': statistics.median(timings),
+        'p99': timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+    }
+
+
+def start_server(server, env, port, threads):
+    if server == 'wsgi':
+        command = [GUNICORN, 'api_yamdb.wsgi:application',
+                   '--config', 'gunicorn.conf.py']
+    else:
+        command = [UVICORN, 'api_yamdb.asgi:application',
+                   '--host', '127.0.0.1', '--port', str(port),
+                   '--log-level', 'warning', '--no-access-log']
+    return subprocess.Popen(
+        command, cwd=PROJECT_DIR,
+        env=dict(env, GUNICORN_BIND=f'127.0.0.1:{port}', GUNICORN_WORKERS='1',
+                 GUNICORN_THREADS=str(threads),
+                 GUNICORN_ACCESS_LOG='/dev/null',
+                 ASGI_READ_THREADS=str(threads), ASGI_THREADS=str(threads)),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--concurrency', type=int, nargs='+',
+                        default=[10, 100])
+    parser.add_argument('--slow-clients', type=int, default=20)
+    parser.add_argument('--trickle', type=float, default=0.05,
+                        help='Pause between 8-byte parts of a slow request.')
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--titles', type=int, default=500)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from .seed import seed
+
+    if connection.vendor == 'sqlite':
+        # Серверам нужна та же тестовая БД, поэтому не в памяти
+        connection.settings_dict['TEST']['NAME'] = os.path.join(
+            tempfile.mkdtemp(), 'benchmark.sqlite3'
+        )
+    rows = []
+    with test_database():
+        seed(users=50, titles=args.titles)
+        env = dict(os.environ, DB_NAME=connection.settings_dict['NAME'])
+        path = '/api/v1/titles/?limit=10'
+        for server in ('wsgi', 'asgi'):
+            process = start_server(server, env, args.port, args.threads)
+            try:
+                wait_ready(f'http://127.0.0.1:{args.port}{path}')
+                for concurrency in args.concurrency:
+                    stats = asyncio.run(load(
+                        args.port, path, concurrency, args.slow_clients,
+                        args.trickle, args.duration,
+                    ))
+                    rows.append(dict(stats, server=server,
+                                     concurrency=concurrency,
+                                     slow=args.slow_clients))
+            finally:
+                process.terminate()
+                process.wait()
+    print_table(rows, ['server', 'concurrency', 'slow', 'requests/sec',
+                       'p50', 'p99'])
+
+
+if __name__ == '__main__':
+    main()
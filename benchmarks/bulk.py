@@ -0,0 +1,79 @@
+"""Создание произведений по одному POST против /titles/bulk/.
+
+Для каждого размера пачки замеряется общее время и число SQL-запросов:
+по одному POST /titles/ на произведение и одним POST /titles/bulk/.
+Замер одиночный: каждый прогон добавляет строки в БД.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bulk --sizes 10 100 1000
+"""
+import argparse
+import time
+
+from .utils import print_table, setup_django, test_database
+
+
+def get_items(size, offset):
+    return [
+        {'name': f'Произведение {offset + number}', 'year': 2000,
+         'category': 'category-0', 'genre': ['genre-0', 'genre-1']}
+        for number in range(size)
+    ]
+
+
+def run(func):
+    """Время func в миллисекундах и число выполненных запросов."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+    return elapsed, len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    setup_django()
+    from reviews.models import User
+    from .api import api_client
+    from .seed import seed
+
+    rows = []
+    with test_database():
+        seed(users=1, titles=0, reviews_per_title=0)
+        admin = User.objects.create_user(username='bench-admin',
+                                         email='bench-admin@yamdb.fake',
+                                         role='admin')
+        client = api_client(admin)
+        offset = 0
+        for size in args.sizes:
+            items = get_items(size, offset)
+            single_ms, single_queries = run(lambda: [
+                client.post('/api/v1/titles/', item, format='json')
+                for item in items
+            ])
+            items = get_items(size, offset + size)
+            bulk_ms, bulk_queries = run(lambda: client.post(
+                '/api/v1/titles/bulk/', items, format='json'
+            ))
+            offset += 2 * size
+            rows.append({
+                'items': size,
+                'single ms': single_ms,
+                'single queries': single_queries,
+                'bulk ms': bulk_ms,
+                'bulk queries': bulk_queries,
+                'speedup': single_ms / bulk_ms,
+            })
+    print_table(rows, ['items', 'single ms', 'single queries', 'bulk ms',
+                       'bulk queries', 'speedup'])
+
+
+if __name__ == '__main__':
+    main()
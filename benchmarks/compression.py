@@ -0,0 +1,77 @@
+"""Стоимость сжатия страниц произведений против сэкономленных байтов.
+
+Страницы из 10, 100 и 1000 произведений с вложенными жанрами и
+категорией рендерятся один раз, замеряется только сжатие тела ответа
+каждой кодировкой и уровнем. Колонка "KB saved/ms" — сколько килобайт
+трафика экономит миллисекунда процессора.
+
+Запуск из корня репозитория:
+    python -m benchmarks.compression --sizes 10 100 1000
+"""
+import argparse
+
+from .utils import measure, print_table, setup_django, test_database
+
+LEVELS = (('gzip', (1, 6, 9)), ('br', (1, 4, 11)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from api import compression
+    from api.renderers import FastJSONRenderer
+    from api.serializers import TitleSerializer
+    from reviews.models import Title
+    from .seed import seed
+
+    if compression.brotli is None:
+        print('Warning: Brotli is not installed, only gzip is measured.')
+    rows = []
+    with test_database():
+        seed(users=50, titles=max(args.sizes))
+        for size in args.sizes:
+            data = TitleSerializer(
+                Title.objects.select_related('category')
+                .prefetch_related('genre')[:size],
+                many=True,
+            ).data
+            body = FastJSONRenderer().render({
+                'count': size, 'next': None, 'previous': None,
+                'results': data,
+            })
+            for encoding, levels in LEVELS:
+                if encoding == 'br' and compression.brotli is None:
+                    continue
+                for level in levels:
+                    stats = measure(
+                        lambda: compression.compress(body, encoding, level),
+                        repeat=args.repeat,
+                    )
+                    compressed = compression.compress(body, encoding, level)
+                    saved = len(body) - len(compressed)
+                    rows.append({
+                        'items': size,
+                        'encoding': f'{encoding}:{level}',
+                        'bytes': len(body),
+                        'compressed': len(compressed),
+                        'ratio': len(body) / len(compressed),
+                        'p50 ms': stats['p50'],
+                        'p99 ms': stats['p99'],
+                        'KB saved/ms': saved / 1024 / max(stats['p50'],
+                                                          1e-6),
+                        'sent': ('yes' if len(body)
+                                 >= settings.COMPRESSION_MIN_SIZE
+                                 else 'no (below threshold)'),
+                    })
+    print_table(rows, ['items', 'encoding', 'bytes', 'compressed', 'ratio',
+                       'p50 ms', 'p99 ms', 'KB saved/ms', 'sent'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Запросов в секунду с постоянными соединениями с БД и без них.
+
+Запросы проходят через WSGIHandler, как под gunicorn, поэтому
+соединения закрываются и открываются по правилам CONN_MAX_AGE.
+Имеет смысл на PostgreSQL: у SQLite открытие соединения почти бесплатно.
+
+Запуск из корня репозитория:
+    python -m benchmarks.connections --requests 500
+"""
+import argparse
+import time
+
+from .utils import print_table, setup_django, test_database
+
+MODES = (
+    ('per request', 0, False),
+    ('persistent', 60, False),
+    ('persistent + health checks', 60, True),
+)
+
+
+def configure(connections, max_age, health_checks):
+    for connection in connections.all():
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = max_age
+        connection.settings_dict['CONN_HEALTH_CHECKS'] = health_checks
+
+
+def run(handler, environ, count):
+    def start_response(status, headers):
+        assert status.startswith('200'), status
+
+    start = time.perf_counter()
+    for _ in range(count):
+        response = handler(dict(environ), start_response)
+        b''.join(response)
+        response.close()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--url', default='/api/v1/categories/')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connection, connections
+    from django.test import RequestFactory
+    from reviews.models import Category
+
+    rows = []
+    with test_database():
+        if connection.vendor != 'postgresql':
+            print(f'Warning: {connection.vendor} database, '
+                  f'connection setup cost is negligible.')
+        Category.objects.bulk_create(
+            Category(name=f'Категория {i}', slug=f'category-{i}')
+            for i in range(20)
+        )
+        handler = WSGIHandler()
+        environ = RequestFactory()._base_environ(PATH_INFO=args.url)
+        for name, max_age, health_checks in MODES:
+            configure(connections, max_age, health_checks)
+            run(handler, environ, 10)
+            rows.append({
+                'mode': name,
+                'CONN_MAX_AGE': max_age,
+                'requests/sec': run(handler, environ, args.requests),
+            })
+        configure(connections, 0, False)
+    print_table(rows, ['mode', 'CONN_MAX_AGE', 'requests/sec'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Время и пиковая память потоковой выгрузки против списка страницы.
+
+Для каждого числа произведений таблица titles выгружается в CSV и
+NDJSON через reviews.export и для сравнения читается целиком в список,
+как при сборке ответа в памяти. Пиковая память считается tracemalloc:
+у выгрузки она не должна расти с размером таблицы.
+
+Запуск из корня репозитория:
+    python -m benchmarks.export --titles 1000 10000 50000
+"""
+import argparse
+import time
+import tracemalloc
+
+from .utils import print_table, setup_django, test_database
+
+
+def run(func):
+    """Время func в миллисекундах и пик выделенной памяти в KB."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, nargs='+',
+                        default=[1000, 10000, 50000])
+    parser.add_argument('--chunk-size', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+    from reviews import export
+    from reviews.models import Title
+    from .seed import seed
+
+    rows = []
+    for size in args.titles:
+        with test_database():
+            seed(users=1, titles=size, reviews_per_title=0)
+            for export_format in export.FORMATS:
+                elapsed, peak = run(lambda: sum(
+                    len(chunk) for chunk in export.export(
+                        'titles', export_format, args.chunk_size
+                    )
+                ))
+                rows.append({'titles': size, 'method': export_format,
+                             'ms': elapsed, 'peak KB': peak})
+            elapsed, peak = run(lambda: list(Title.objects.values()))
+            rows.append({'titles': size, 'method': 'values() list',
+                         'ms': elapsed, 'peak KB': peak})
+    print_table(rows, ['titles', 'method', 'ms', 'peak KB'])
+
+
+if __name__ == '__main__':
+    main()
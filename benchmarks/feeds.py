@@ -0,0 +1,106 @@
+"""Ленты отзывов и комментариев с индексами по pub_date и без них.
+
+Сначала замеряются ленты с индексами review_title_pub_date и
+comment_review_pub_date, затем индексы удаляются и замер повторяется.
+Для каждого варианта печатается план запроса страницы.
+
+Запуск из корня репозитория:
+    python -m benchmarks.feeds --titles 2000 --reviews 50
+"""
+import argparse
+import random
+
+from .utils import measure, print_table, setup_django, test_database
+
+
+def seed(titles, reviews, comments):
+    from django.utils import timezone
+    from reviews.models import Category, Comment, Review, Title, User
+
+    rnd = random.Random(0)
+    now = timezone.now()
+    category = Category.objects.create(name='Книги', slug='books')
+    Title.objects.bulk_create(
+        [Title(name=f'Title {i}', year=2000, category=category)
+         for i in range(titles)]
+    )
+    User.objects.bulk_create(
+        [User(username=f'user{i}', email=f'user{i}@yamdb.fake',
+              password='!') for i in range(max(reviews, comments))]
+    )
+    user_ids = list(User.objects.values_list('id', flat=True))
+    title_ids = list(Title.objects.values_list('id', flat=True))
+    # Отзывы разных произведений перемешаны, как при реальной нагрузке
+    pairs = [(title_id, author_id) for title_id in title_ids
+             for author_id in user_ids[:reviews]]
+    rnd.shuffle(pairs)
+    for start in range(0, len(pairs), 5000):
+        Review.objects.bulk_create([
+            Review(title_id=title_id, author_id=author_id, text='text',
+                   score=5,
+                   pub_date=now - timezone.timedelta(
+                       seconds=rnd.randrange(10 ** 7)))
+            for title_id, author_id in pairs[start:start + 5000]
+        ])
+    review = Review.objects.filter(title_id=title_ids[0]).first()
+    Comment.objects.bulk_create([
+        Comment(review=review, author_id=author_id, text='text',
+                pub_date=now - timezone.timedelta(
+                    seconds=rnd.randrange(10 ** 7)))
+        for author_id in user_ids[:comments]
+    ])
+    return review
+
+
+def run(client, feeds, limit, repeat, label):
+    rows = []
+    for name, url, queryset in feeds:
+        for offset in (0, 20):
+            stats = measure(
+                lambda: client.get(url, {'limit': limit, 'offset': offset}),
+                repeat=repeat,
+            )
+            rows.append({'indexes': label, 'feed': name, 'offset': offset,
+                         'p50': stats['p50'], 'p99': stats['p99']})
+        print(f'{name}, {label}:')
+        print(queryset[:limit].explain())
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=2000)
+    parser.add_argument('--reviews', type=int, default=50,
+                        help='Reviews per title.')
+    parser.add_argument('--comments', type=int, default=2000)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from rest_framework.test import APIClient
+    from reviews.models import Comment, Review
+
+    with test_database():
+        review = seed(args.titles, args.reviews, args.comments)
+        feeds = [
+            ('reviews', f'/api/v1/titles/{review.title_id}/reviews/',
+             Review.objects.filter(title_id=review.title_id)),
+            ('comments',
+             f'/api/v1/titles/{review.title_id}/reviews/{review.id}'
+             f'/comments/',
+             Comment.objects.filter(review_id=review.id)),
+        ]
+        client = APIClient()
+        rows = run(client, feeds, args.limit, args.repeat, 'pub_date')
+        with connection.schema_editor() as editor:
+            for model in (Review, Comment):
+                for index in model._meta.indexes:
+                    editor.remove_index(model, index)
+        rows += run(client, feeds, args.limit, args.repeat, 'fk only')
+    print_table(rows, ['indexes', 'feed', 'offset', 'p50', 'p99'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Сравнение LimitOffset и курсорной пагинации на глубоких страницах.
+
+Запуск из корня репозитория:
+    python -m benchmarks.pagination --titles 50000 --reviews 20000
+"""
+import argparse
+
+from .utils import measure, print_table, setup_django, test_database
+
+
+def seed(titles, reviews):
+    from django.utils import timezone
+    from reviews.models import Category, Review, Title, User
+
+    category = Category.objects.create(name='Книги', slug='books')
+    Title.objects.bulk_create(
+        [Title(name=f'Title {i}', year=2000, category=category)
+         for i in range(titles)]
+    )
+    User.objects.bulk_create(
+        [User(username=f'user{i}', email=f'user{i}@yamdb.fake',
+              password='!') for i in range(reviews)]
+    )
+    title = Title.objects.order_by('id').first()
+    now = timezone.now()
+    Review.objects.bulk_create(
+        [Review(title=title, author_id=author_id, text='text', score=5,
+                pub_date=now - timezone.timedelta(seconds=i))
+         for i, author_id in enumerate(
+             User.objects.values_list('id', flat=True))]
+    )
+    return title
+
+
+def cursor_url(url, ordering, instance):
+    from rest_framework.pagination import Cursor
+    from api.pagination import KeysetPagination
+
+    paginator = KeysetPagination(ordering)
+    paginator.base_url = f'http://testserver{url}?cursor='
+    position = paginator._get_position_from_instance(instance, ordering)
+    return paginator.encode_cursor(Cursor(offset=0, reverse=False,
+                                          position=position))
+
+
+def run(client, url, queryset, ordering, total, limit, repeat):
+    rows = []
+    for depth in (0.0, 0.5, 0.99):
+        offset = int(total * depth)
+        previous = queryset.order_by(*ordering)[max(offset - 1, 0)]
+        offset_stats = measure(
+            lambda: client.get(url, {'limit': limit, 'offset': offset}),
+            repeat=repeat,
+        )
+        cursor = cursor_url(url, ordering, previous)
+        cursor_stats = measure(
+            lambda: client.get(cursor, {'limit': limit}), repeat=repeat
+        )
+        rows.append({
+            'url': url.rstrip('/').rsplit('/', 1)[-1],
+            'offset': offset,
+            'offset p50': offset_stats['p50'],
+            'cursor p50': cursor_stats['p50'],
+            'offset p99': offset_stats['p99'],
+            'cursor p99': cursor_stats['p99'],
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=20000)
+    parser.add_argument('--reviews', type=int, default=5000)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.test import APIClient
+    from reviews.models import Title
+
+    with test_database():
+        title = seed(args.titles, args.reviews)
+        client = APIClient()
+        rows = run(client, '/api/v1/titles/', Title.objects.all(),
+                   ('id',), args.titles, args.limit, args.repeat)
+        rows += run(client, f'/api/v1/titles/{title.id}/reviews/',
+                    title.reviews.all(), ('pub_date', 'id'), args.reviews,
+                    args.limit, args.repeat)
+    print_table(rows, ['url', 'offset', 'offset p50', 'cursor p50',
+                       'offset p99', 'cursor p99'])
+
+
+if __name__ == '__main__':
+    main()
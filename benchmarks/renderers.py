@@ -0,0 +1,58 @@
+"""Время рендеринга страниц произведений: JSONRenderer против orjson.
+
+Страницы из 10, 100 и 1000 произведений с вложенными жанрами и
+категорией сериализуются один раз, замеряется только рендеринг.
+
+Запуск из корня репозитория:
+    python -m benchmarks.renderers --sizes 10 100 1000
+"""
+import argparse
+
+from .utils import measure, print_table, setup_django, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+    from api import renderers
+    from api.serializers import TitleSerializer
+    from reviews.models import Title
+    from .seed import seed
+
+    if renderers.orjson is None:
+        print('Warning: orjson is not installed, FastJSONRenderer '
+              'falls back to the stdlib json.')
+    rows = []
+    with test_database():
+        seed(users=50, titles=max(args.sizes))
+        for size in args.sizes:
+            data = TitleSerializer(
+                Title.objects.select_related('category')
+                .prefetch_related('genre')[:size],
+                many=True,
+            ).data
+            page = {'count': size, 'next': None, 'previous': None,
+                    'results': data}
+            row = {'items': size}
+            for name, renderer in (('json', JSONRenderer()),
+                                   ('orjson', renderers.FastJSONRenderer())):
+                stats = measure(lambda: renderer.render(page),
+                                repeat=args.repeat)
+                row[f'{name} p50'] = stats['p50']
+                row[f'{name} p99'] = stats['p99']
+            row['speedup'] = row['json p50'] / row['orjson p50']
+            row['identical'] = (JSONRenderer().render(page)
+                                == renderers.FastJSONRenderer().render(page))
+            rows.append(row)
+    print_table(rows, ['items', 'json p50', 'orjson p50', 'json p99',
+                       'orjson p99', 'speedup', 'identical'])
+
+
+if __name__ == '__main__':
+    main()
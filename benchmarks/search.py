@@ -0,0 +1,61 @@
+"""Поиск произведений по названию на растущем каталоге.
+
+На PostgreSQL план должен использовать GIN-индекс reviews_title_name_trgm,
+на SQLite выполняется обычный icontains со сканированием таблицы.
+
+Запуск из корня репозитория:
+    python -m benchmarks.search --titles 10000 100000 1000000
+"""
+import argparse
+import random
+
+from .utils import measure, print_table, setup_django, test_database
+
+
+def seed(category, count, offset, rnd):
+    from faker.providers.lorem.en_US import Provider
+    from reviews.models import Title
+
+    words = Provider.word_list
+    Title.objects.bulk_create([
+        Title(name=' '.join(rnd.choices(words, k=3)).title(), year=2000,
+              category=category)
+        for _ in range(offset, count)
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, nargs='+',
+                        default=[10000, 100000])
+    parser.add_argument('--query', default='quasi')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.test import APIClient
+    from api.search import search
+    from reviews.models import Category, Title
+
+    rows = []
+    with test_database():
+        category = Category.objects.create(name='Книги', slug='books')
+        client = APIClient()
+        rnd = random.Random(0)
+        seeded = 0
+        for size in sorted(args.titles):
+            seed(category, size, seeded, rnd)
+            seeded = size
+            stats = measure(
+                lambda: client.get('/api/v1/titles/',
+                                   {'name': args.query, 'limit': 10}),
+                repeat=args.repeat,
+            )
+            rows.append({'titles': size, 'p50': stats['p50'],
+                         'p99': stats['p99']})
+        print(search(Title.objects.all(), 'name', [args.query]).explain())
+    print_table(rows, ['titles', 'p50', 'p99'])
+
+
+if __name__ == '__main__':
+    main()
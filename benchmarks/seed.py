@@ -0,0 +1,74 @@
+"""Синтетические данные для бенчмарков."""
+import io
+import random
+from datetime import timezone
+
+from faker import Faker
+
+
+def seed(users=1000, categories=10, genres=20, titles=2000,
+         reviews_per_title=5, comments_per_review=2, random_seed=0):
+    """Заполняет БД пачками через bulk_create и возвращает размеры."""
+    from django.core.management import call_command
+    from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                                Title, User)
+
+    fake = Faker('ru_RU')
+    fake.seed_instance(random_seed)
+    rnd = random.Random(random_seed)
+
+    User.objects.bulk_create([
+        User(username=f'user{i}', email=f'user{i}@yamdb.fake',
+             password='!', bio=fake.sentence())
+        for i in range(users)
+    ])
+    Category.objects.bulk_create([
+        Category(name=fake.word().title(), slug=f'category-{i}')
+        for i in range(categories)
+    ])
+    Genre.objects.bulk_create([
+        Genre(name=fake.word().title(), slug=f'genre-{i}')
+        for i in range(genres)
+    ])
+    category_ids = list(Category.objects.values_list('id', flat=True))
+    genre_ids = list(Genre.objects.values_list('id', flat=True))
+    user_ids = list(User.objects.values_list('id', flat=True))
+
+    Title.objects.bulk_create([
+        Title(name=fake.sentence(nb_words=3).rstrip('.'),
+              year=rnd.randint(1900, 2021),
+              description=fake.paragraph(),
+              category_id=rnd.choice(category_ids))
+        for _ in range(titles)
+    ])
+    title_ids = list(Title.objects.values_list('id', flat=True))
+    GenreTitle.objects.bulk_create([
+        GenreTitle(title_id_id=title_id, genre_id_id=genre_id)
+        for title_id in title_ids
+        for genre_id in rnd.sample(genre_ids, min(2, len(genre_ids)))
+    ])
+    Review.objects.bulk_create([
+        Review(title_id=title_id, author_id=author_id,
+               text=fake.paragraph(), score=rnd.randint(1, 10),
+               pub_date=fake.date_time_this_decade(tzinfo=timezone.utc))
+        for title_id in title_ids
+        for author_id in rnd.sample(user_ids,
+                                    min(reviews_per_title, len(user_ids)))
+    ])
+    review_ids = list(Review.objects.values_list('id', flat=True))
+    Comment.objects.bulk_create([
+        Comment(review_id=review_id, author_id=rnd.choice(user_ids),
+                text=fake.sentence(),
+                pub_date=fake.date_time_this_decade(tzinfo=timezone.utc))
+        for review_id in review_ids
+        for _ in range(comments_per_review)
+    ])
+    call_command('rebuild_ratings', stdout=io.StringIO())
+    return {
+        'users': users,
+        'categories': categories,
+        'genres': genres,
+        'titles': titles,
+        'reviews': len(review_ids),
+        'comments': len(review_ids) * comments_per_review,
+    }
@@ -0,0 +1,66 @@
+"""ModelSerializer против плана по values() на страницах списков.
+
+Замеряется запрос страницы вместе с сериализацией: у ModelSerializer —
+с select_related/prefetch_related, как в представлениях, у плана —
+строки values() и один запрос на вложенный список.
+
+Запуск из корня репозитория:
+    python -m benchmarks.serializers --sizes 10 100 1000
+"""
+import argparse
+
+from .utils import measure, print_table, setup_django, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from api.query_planning import get_related_lookups
+    from api.serializers import (CommentSerializer, ReviewSerializer,
+                                 TitleSerializer)
+    from api.values import ValuesSerializer, get_values_plan
+    from reviews.models import Comment, Review, Title
+    from .seed import seed
+
+    rows = []
+    with test_database():
+        size = max(args.sizes)
+        seed(users=size, titles=size, reviews_per_title=1,
+             comments_per_review=1)
+        for serializer_class, model in ((TitleSerializer, Title),
+                                        (ReviewSerializer, Review),
+                                        (CommentSerializer, Comment)):
+            select, prefetch = get_related_lookups(serializer_class(), model)
+            queryset = model.objects.select_related(*select).prefetch_related(
+                *prefetch
+            ).order_by('pk')
+            plan = get_values_plan(serializer_class)
+            for size in args.sizes:
+                # Срез каждый раз новый: QuerySet кеширует результат
+                model_stats = measure(
+                    lambda: serializer_class(queryset[:size], many=True).data,
+                    repeat=args.repeat,
+                )
+                values_stats = measure(
+                    lambda: ValuesSerializer(plan.values(queryset[:size]),
+                                             plan=plan).data,
+                    repeat=args.repeat,
+                )
+                rows.append({
+                    'serializer': serializer_class.__name__,
+                    'items': size,
+                    'model p50': model_stats['p50'],
+                    'values p50': values_stats['p50'],
+                    'speedup': model_stats['p50'] / values_stats['p50'],
+                })
+    print_table(rows, ['serializer', 'items', 'model p50', 'values p50',
+                       'speedup'])
+
+
+if __name__ == '__main__':
+    main()
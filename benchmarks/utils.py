@@ -0,0 +1,72 @@
+import os
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.join(ROOT_DIR, 'api_yamdb')
+
+
+def setup_django():
+    """Настраивает Django так же, как manage.py."""
+    if PROJECT_DIR not in sys.path:
+        sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    # Кеш ответов API исказил бы замеры повторных запросов.
+    os.environ.setdefault('CACHE_BACKEND',
+                          'django.core.cache.backends.dummy.DummyCache')
+    # Журнал каждого запроса засоряет вывод замеров.
+    os.environ.setdefault('PERFORMANCE_LOG_LEVEL', 'WARNING')
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database(keepdb=False):
+    """Создаёт отдельную тестовую БД, чтобы не трогать рабочие данные."""
+    from django.db import connection
+    from django.test.utils import (setup_test_environment,
+                                   teardown_test_environment)
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, keepdb=keepdb)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0,
+                                            keepdb=keepdb)
+        teardown_test_environment()
+
+
+def measure(func, repeat=20, warmup=2):
+    """Возвращает статистику времени выполнения func в миллисекундах."""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        'mean': statistics.mean(timings),
+        'p50': timings[len(timings) // 2],
+        'p99': timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+    }
+
+
+def print_table(rows, columns):
+    cells = [[
+        f'{row[column]:.2f}' if isinstance(row[column], float)
+        else str(row[column])
+        for column in columns
+    ] for row in rows]
+    widths = [max([len(column)] + [len(line[i]) for line in cells])
+              for i, column in enumerate(columns)]
+    print(' | '.join(column.rjust(width)
+                     for column, width in zip(columns, widths)))
+    for line in cells:
+        print(' | '.join(cell.rjust(width)
+                         for cell, width in zip(line, widths)))
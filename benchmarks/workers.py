@@ -0,0 +1,117 @@
+"""Память воркеров gunicorn с preload_app и без него.
+
+Запускает gunicorn с gunicorn.conf.py проекта, прогревает воркеры
+запросами и читает /proc/<pid>/smaps_rollup (только Linux). USS — память,
+принадлежащая только процессу, PSS — с долей общих страниц.
+
+Запуск из корня репозитория:
+    python -m benchmarks.workers --workers 4 --requests 200
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from .utils import PROJECT_DIR, print_table, setup_django, test_database
+
+# gunicorn 20.0 не запускается через python -m
+GUNICORN = shutil.which('gunicorn', path=os.path.dirname(sys.executable)) \
+    or shutil.which('gunicorn')
+
+
+def read_memory(pid):
+    """USS и PSS процесса в мегабайтах."""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as smaps:
+        for line in smaps:
+            name, _, rest = line.partition(':')
+            if rest.strip().endswith('kB'):
+                values[name] = int(rest.split()[0])
+    uss = values['Private_Clean'] + values['Private_Dirty']
+    return uss / 1024, values['Pss'] / 1024
+
+
+def get_workers(pid):
+    with open(f'/proc/{pid}/task/{pid}/children') as children:
+        return [int(child) for child in children.read().split()]
+
+
+def wait_ready(url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url) as response:
+                return response.status
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'gunicorn did not answer {url} in {timeout}s')
+
+
+def run(env, preload, args):
+    port = args.port
+    url = f'http://127.0.0.1:{port}{args.url}'
+    server = subprocess.Popen(
+        [GUNICORN, 'api_yamdb.wsgi:application',
+         '--config', 'gunicorn.conf.py'],
+        cwd=PROJECT_DIR,
+        env=dict(env, GUNICORN_BIND=f'127.0.0.1:{port}',
+                 GUNICORN_WORKERS=str(args.workers),
+                 GUNICORN_PRELOAD=str(preload),
+                 GUNICORN_ACCESS_LOG='/dev/null'),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(url)
+        for _ in range(args.requests):
+            urllib.request.urlopen(url).read()
+        master_uss, _ = read_memory(server.pid)
+        workers = [read_memory(pid) for pid in get_workers(server.pid)]
+    finally:
+        server.terminate()
+        server.wait()
+    return {
+        'preload': preload,
+        'workers': len(workers),
+        'master USS, MB': master_uss,
+        'worker USS, MB': sum(uss for uss, _ in workers) / len(workers),
+        'worker PSS, MB': sum(pss for _, pss in workers) / len(workers),
+        'total PSS, MB': sum(pss for _, pss in workers),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--url', default='/api/v1/categories/')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from reviews.models import Category
+
+    if connection.vendor == 'sqlite':
+        # Воркерам нужна та же тестовая БД, поэтому не в памяти
+        connection.settings_dict['TEST']['NAME'] = os.path.join(
+            tempfile.mkdtemp(), 'benchmark.sqlite3'
+        )
+    rows = []
+    with test_database():
+        Category.objects.bulk_create(
+            Category(name=f'Категория {i}', slug=f'category-{i}')
+            for i in range(20)
+        )
+        env = dict(os.environ, DB_NAME=connection.settings_dict['NAME'])
+        for preload in (False, True):
+            rows.append(run(env, preload, args))
+    print_table(rows, ['preload', 'workers', 'master USS, MB',
+                       'worker USS, MB', 'worker PSS, MB', 'total PSS, MB'])
+
+
+if __name__ == '__main__':
+    main()
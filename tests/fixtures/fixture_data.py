@@ -0,0 +1,101 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+    cache.clear()
+
+
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create_user(
+        username='TestUser', email='testuser@yamdb.fake', password='1234567'
+    )
+
+
+@pytest.fixture
+def another_user(django_user_model):
+    return django_user_model.objects.create_user(
+        username='TestUserAnother', email='another@yamdb.fake',
+        password='1234567'
+    )
+
+
+@pytest.fixture
+def admin(django_user_model):
+    return django_user_model.objects.create_user(
+        username='TestAdmin', email='admin@yamdb.fake', password='1234567',
+        role='admin'
+    )
+
+
+@pytest.fixture
+def category():
+    from reviews.models import Category
+    return Category.objects.create(name='Фильм', slug='films')
+
+
+@pytest.fixture
+def genres():
+    from reviews.models import Genre
+    return [
+        Genre.objects.create(name='Драма', slug='drama'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+
+
+@pytest.fixture
+def title(category, genres):
+    from reviews.models import GenreTitle, Title
+    title = Title.objects.create(name='Титаник', year=1997,
+                                 category=category)
+    for genre in genres:
+        GenreTitle.objects.create(title_id=title, genre_id=genre)
+    return title
+
+
+def _client_for(user):
+    from rest_framework.test import APIClient
+
+    from api.authentication import get_access_token
+
+    client = APIClient()
+    token = get_access_token(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+@pytest.fixture
+def user_client(user):
+    return _client_for(user)
+
+
+@pytest.fixture
+def another_user_client(another_user):
+    return _client_for(another_user)
+
+
+@pytest.fixture
+def admin_client(admin):
+    return _client_for(admin)
+
+
+@pytest.fixture
+def use_worker(settings):
+    """Переключает кеш ответов между кешами двух воркеров.
+
+    У каждого воркера gunicorn может быть свой LocMemCache; здесь это
+    два кеша с разными LOCATION в одном процессе. Кеш версий default
+    остаётся общим, как memcached в docker-compose.
+    """
+    backend = 'django.core.cache.backends.locmem.LocMemCache'
+    settings.CACHES = {
+        **settings.CACHES,
+        'worker-a': {'BACKEND': backend, 'LOCATION': 'worker-a'},
+        'worker-b': {'BACKEND': backend, 'LOCATION': 'worker-b'},
+    }
+
+    def use(alias):
+        settings.API_CACHE_ALIAS = alias
+    return use
@@ -0,0 +1,112 @@
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Category, Comment, GenreTitle, Review, Title
+
+CSV_FILES = {
+    'users.csv': (
+        'id,username,email,role,bio,first_name,last_name\n'
+        '100,bingobongo,bingobongo@yamdb.fake,user,,,\n'
+        '101,capt_obvious,capt_obvious@yamdb.fake,admin,,,\n'
+    ),
+    'category.csv': 'id,name,slug\n1,Фильм,movie\n2,Книга,book\n',
+    'genre.csv': 'id,name,slug\n1,Драма,drama\n2,Комедия,comedy\n',
+    'titles.csv': (
+        'id,name,year,category\n'
+        '1,Побег из Шоушенка,1994,1\n'
+        '2,Крёстный отец,1972,1\n'
+        '3,Потерянный,1999,99\n'
+    ),
+    'genre_title.csv': 'id,title_id,genre_id\n1,1,1\n2,1,2\n3,2,1\n',
+    'review.csv': (
+        'id,title_id,text,author,score,pub_date\n'
+        '1,1,Отлично,100,10,2019-09-24T21:08:21.567Z\n'
+        '2,1,Неплохо,101,5,2019-09-24T21:08:21.567Z\n'
+    ),
+    'comments.csv': (
+        'id,review_id,text,author,pub_date\n'
+        '1,1,Согласен,101,2019-09-24T21:08:21.567Z\n'
+    ),
+}
+
+
+@pytest.fixture
+def csv_dir(tmp_path):
+    for name, content in CSV_FILES.items():
+        (tmp_path / name).write_text(content, encoding='utf-8')
+    return tmp_path
+
+
+@pytest.mark.django_db
+class TestAddCsv:
+
+    def test_import(self, csv_dir):
+        call_command('addcsv', '--path', str(csv_dir), '--batch-size', '1')
+        assert Title.objects.count() == 2, (
+            'Проверьте, что строки с несуществующими внешними ключами '
+            'пропускаются'
+        )
+        assert GenreTitle.objects.count() == 3
+        assert Review.objects.count() == 2
+        assert Comment.objects.count() == 1
+        assert Title.objects.get(pk=1).rating == 7.5, (
+            'Проверьте, что после загрузки пересчитывается рейтинг'
+        )
+        category = Category.objects.create(name='Музыка', slug='music')
+        assert category.pk == 3, (
+            'Проверьте, что после загрузки сбрасываются последовательности'
+        )
+
+    def test_ignore_conflicts_and_upsert(self, csv_dir):
+        call_command('addcsv', '--path', str(csv_dir))
+        call_command('addcsv', '--path', str(csv_dir), '--ignore-conflicts')
+        assert Category.objects.count() == 2
+
+        (csv_dir / 'category.csv').write_text(
+            'id,name,slug\n1,Кино,movie\n', encoding='utf-8'
+        )
+        call_command('addcsv', '--path', str(csv_dir), '--upsert')
+        assert Category.objects.get(pk=1).name == 'Кино'
+        assert Review.objects.count() == 2
+
+    def test_conflicting_parent_skips_children(self, csv_dir):
+        call_command('addcsv', '--path', str(csv_dir))
+        # Категория 3 конфликтует по slug и не попадает в базу
+        (csv_dir / 'category.csv').write_text(
+            'id,name,slug\n3,Кино,movie\n', encoding='utf-8'
+        )
+        (csv_dir / 'titles.csv').write_text(
+            'id,name,year,category\n10,Новое,2000,3\n', encoding='utf-8'
+        )
+        call_command('addcsv', '--path', str(csv_dir), '--ignore-conflicts')
+        assert not Category.objects.filter(pk=3).exists()
+        assert not Title.objects.filter(pk=10).exists(), (
+            'Проверьте, что строки со ссылкой на пропущенную при конфликте '
+            'строку тоже пропускаются'
+        )
+
+    def test_import_invalidates_api(self, csv_dir, client):
+        call_command('addcsv', '--path', str(csv_dir))
+        reviews_url = '/api/v1/titles/1/reviews/'
+        etag = client.get(reviews_url)['ETag']
+        assert client.get('/api/v1/titles/1/').json()['name'] == (
+            'Побег из Шоушенка'
+        )
+
+        (csv_dir / 'titles.csv').write_text(
+            'id,name,year,category\n1,Шоушенк,1994,1\n', encoding='utf-8'
+        )
+        (csv_dir / 'review.csv').write_text(
+            'id,title_id,text,author,score,pub_date\n'
+            '1,1,Шедевр,100,10,2019-09-24T21:08:21.567Z\n',
+            encoding='utf-8',
+        )
+        call_command('addcsv', '--path', str(csv_dir), '--upsert')
+        assert client.get('/api/v1/titles/1/').json()['name'] == (
+            'Шоушенк'
+        ), 'Проверьте, что после загрузки сбрасывается кеш ответов'
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что загрузка отзывов меняет ETag их списка'
+        )
+        assert response.json()['results'][0]['text'] == 'Шедевр'
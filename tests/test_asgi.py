@@ -0,0 +1,150 @@
+import asyncio
+import threading
+
+import pytest
+
+from api import asgi
+
+
+def call(application, path, method='GET', query_string=b''):
+    messages = []
+    requests = [{'type': 'http.request', 'body': b''}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        # Клиент остаётся подключённым до конца ответа
+        return await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        'type': 'http', 'method': method, 'path': path,
+        'query_string': query_string, 'http_version': '1.1',
+        'headers': [(b'host', b'testserver')],
+        'server': ('testserver', 80),
+    }
+    asyncio.run(application(scope, receive, send))
+    start, *body = messages
+    return start, b''.join(message.get('body', b'') for message in body)
+
+
+def streaming_application(closed, produced):
+    """WSGI-приложение с длинным потоковым ответом."""
+
+    class Body:
+
+        def __iter__(self):
+            for number in range(1000):
+                produced.append(number)
+                yield b'chunk'
+
+        def close(self):
+            closed.set()
+
+    def application(environ, start_response):
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return Body()
+    return asgi.ThreadPoolASGIHandler(application)
+
+
+SCOPE = {
+    'type': 'http', 'method': 'GET', 'path': '/stream/',
+    'query_string': b'', 'http_version': '1.1', 'headers': [],
+}
+
+
+@pytest.fixture
+def application():
+    from django.core.wsgi import get_wsgi_application
+    return asgi.ThreadPoolASGIHandler(get_wsgi_application())
+
+
+@pytest.mark.django_db(transaction=True)
+class TestASGI:
+
+    def test_same_response_as_wsgi(self, application, client, title):
+        start, body = call(application, '/api/v1/titles/',
+                           query_string=b'limit=5')
+        assert start['status'] == 200
+        assert body == client.get('/api/v1/titles/?limit=5').content, (
+            'Проверьте, что ASGI отдаёт тот же ответ, что и WSGI'
+        )
+
+    def test_reads_use_read_pool(self, application, title, monkeypatch):
+        threads = []
+        run_wsgi = application.run_wsgi
+
+        def record_thread(*args):
+            threads.append(threading.current_thread().name)
+            return run_wsgi(*args)
+
+        monkeypatch.setattr(application, 'run_wsgi', record_thread)
+        call(application, f'/api/v1/titles/{title.id}/reviews/')
+        call(application, '/api/v1/categories/')
+        assert threads[0].startswith('asgi-read'), (
+            'Проверьте, что чтение отзывов выполняется в пуле чтения'
+        )
+        assert not threads[1].startswith('asgi-read')
+
+    def test_head_has_no_body(self, application, category):
+        start, body = call(application, '/api/v1/categories/',
+                           method='HEAD')
+        assert start['status'] == 200
+        assert body == b''
+
+    def test_application_importable(self):
+        from api_yamdb.asgi import application
+
+        assert isinstance(application, asgi.ThreadPoolASGIHandler)
+
+
+class TestASGIDisconnect:
+
+    def test_send_error_closes_response(self):
+        closed, produced, sent = threading.Event(), [], []
+        application = streaming_application(closed, produced)
+        requests = [{'type': 'http.request', 'body': b''}]
+
+        async def receive():
+            if requests:
+                return requests.pop()
+            return await asyncio.Event().wait()
+
+        async def send(message):
+            sent.append(message)
+            if len(sent) == 3:
+                raise OSError('Клиент отключился')
+
+        with pytest.raises(OSError):
+            asyncio.run(application(SCOPE, receive, send))
+        assert closed.is_set(), (
+            'Проверьте, что при отключении клиента ответ закрывается'
+        )
+        assert len(produced) < 3 + 2 * asgi.STREAM_BUFFER, (
+            'Проверьте, что после отключения клиента ответ не дочитывается'
+        )
+
+    def test_disconnect_message_stops_stream(self):
+        closed, produced, sent = threading.Event(), [], []
+        application = streaming_application(closed, produced)
+        requests = [{'type': 'http.request', 'body': b''}]
+
+        async def receive():
+            if requests:
+                return requests.pop()
+            while not sent:
+                await asyncio.sleep(0.01)
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            sent.append(message)
+            # Медленный клиент: поток успевает упереться в буфер
+            await asyncio.sleep(0.01)
+
+        asyncio.run(application(SCOPE, receive, send))
+        assert closed.is_set()
+        assert len(produced) < 1000, (
+            'Проверьте, что сообщение http.disconnect останавливает поток'
+        )
@@ -0,0 +1,122 @@
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from api.authentication import get_access_token
+from reviews.models import Review, User
+
+
+def get_client(user):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {get_access_token(user)}'
+    )
+    return client
+
+
+@pytest.mark.django_db
+class TestStatelessAuthentication:
+
+    def test_token_contains_claims(self, client, user):
+        response = client.post('/api/v1/auth/token/', data={
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        })
+        assert response.status_code == 200
+        token = AccessToken(response.json()['token'])
+        assert token['role'] == user.role, (
+            'Проверьте, что токен содержит роль пользователя'
+        )
+        assert token['is_superuser'] is False
+
+    def test_no_query_on_cached_authenticated_get(self, user_client, title):
+        url = f'/api/v1/titles/{title.id}/'
+        assert user_client.get(url).status_code == 200
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(url)
+        assert response['X-Cache'] == 'HIT'
+        assert len(context) == 0, (
+            'Проверьте, что пользователь и версия его токенов не читаются '
+            'из БД при каждом запросе'
+        )
+
+    def test_role_change_revokes_token(self, user, user_client):
+        assert user_client.get('/api/v1/users/me/').status_code == 200
+        user.role = 'moderator'
+        user.save()
+        assert user_client.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что смена роли отзывает выданные токены'
+        )
+
+    def test_role_change_of_deferred_user_revokes_token(self, user,
+                                                        user_client):
+        deferred = User.objects.only('username').get(pk=user.pk)
+        deferred.role = 'admin'
+        deferred.save()
+        assert user_client.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что смена роли пользователя, загруженного через '
+            'only(), отзывает токены'
+        )
+
+    def test_revocation_reaches_other_workers(self, user, settings):
+        client = get_client(user)
+        assert client.get('/api/v1/users/me/').status_code == 200
+        user.role = 'moderator'
+        user.save()
+        # Другой экземпляр кеша версий: отзыв читается из БД
+        settings.CACHES = {**settings.CACHES, 'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'worker-b',
+        }}
+        assert client.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что отзыв токенов виден всем воркерам'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_revocation_written_to_cache(self, user, user_client):
+        assert user_client.get('/api/v1/users/me/').status_code == 200
+        user.role = 'moderator'
+        user.save()
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == 401
+        assert not any('reviews_cacheversion' in query['sql']
+                       for query in context.captured_queries), (
+            'Проверьте, что отзыв записывается в кеш версий'
+        )
+
+    def test_token_issued_after_revocation(self, user, user_client):
+        user.role = 'moderator'
+        user.save()
+        assert user_client.get('/api/v1/users/me/').status_code == 401
+        response = get_client(user).get('/api/v1/users/me/')
+        assert response.status_code == 200, (
+            'Проверьте, что токен, выданный сразу после отзыва, действует'
+        )
+        assert response.json()['role'] == 'moderator'
+
+    def test_admin_permissions_from_claims(self, admin_client, user_client):
+        assert admin_client.get('/api/v1/users/').status_code == 200
+        assert user_client.get('/api/v1/users/').status_code == 403
+
+    def test_legacy_token_without_claims(self, user):
+        client = APIClient()
+        token = RefreshToken.for_user(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == 200, (
+            'Проверьте, что токены без утверждений о роли продолжают работать'
+        )
+        assert response.json()['username'] == user.username
+
+    def test_review_author_saved(self, user_client, user, title):
+        response = user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'Отзыв', 'score': 8},
+        )
+        assert response.status_code == 201
+        assert Review.objects.get().author == user
+        assert response.json()['author'] == user.username
@@ -0,0 +1,118 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+
+URL = '/api/v1/titles/bulk/'
+
+
+def get_items(count=3):
+    return [
+        {'name': f'Произведение {number}', 'year': 2000 + number,
+         'category': 'films', 'genre': ['drama', 'comedy']}
+        for number in range(count)
+    ]
+
+
+def get_selects(queries, table):
+    return [query['sql'] for query in queries
+            if query['sql'].startswith('SELECT')
+            and f'FROM "{table}"' in query['sql']]
+
+
+@pytest.mark.django_db
+class TestTitlesBulk:
+
+    def test_mixed_items(self, admin_client, category, genres):
+        items = get_items(2) + [
+            {'name': 'Без категории', 'year': 2000, 'category': 'unknown',
+             'genre': ['drama']},
+            'не объект',
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.post(URL, items, format='json')
+        assert response.status_code == 207, (
+            'Проверьте, что частично успешная пачка возвращает 207'
+        )
+        data = response.json()
+        assert (data['created'], data['failed']) == (2, 2)
+        assert [result['index'] for result in data['results']] == [
+            0, 1, 2, 3
+        ]
+        assert [result['status'] for result in data['results']] == [
+            201, 201, 400, 400
+        ]
+        assert 'category' in data['results'][2]['errors'], (
+            'Проверьте, что ошибки возвращаются для каждого элемента'
+        )
+        title = Title.objects.get(id=data['results'][0]['id'])
+        assert title.category == category
+        assert sorted(title.genre.values_list('slug', flat=True)) == [
+            'comedy', 'drama'
+        ], 'Проверьте, что созданным произведениям назначаются жанры'
+        assert len(get_selects(queries, 'reviews_genre')) == 1
+        assert len(get_selects(queries, 'reviews_category')) == 1, (
+            'Проверьте, что slug разрешаются одним запросом на модель'
+        )
+
+    def test_ndjson(self, admin_client, category, genres):
+        body = '\n'.join(json.dumps(item) for item in get_items()) + '\n\n'
+        response = admin_client.post(URL, body,
+                                     content_type='application/x-ndjson')
+        assert response.status_code == 201, (
+            'Проверьте, что эндпоинт принимает NDJSON'
+        )
+        assert response.json()['created'] == 3
+        assert Title.objects.count() == 3
+
+    def test_duplicate_genres(self, admin_client, category, genres):
+        items = [{'name': 'Дубли', 'year': 2000, 'category': 'films',
+                  'genre': ['drama', 'drama']}]
+        response = admin_client.post(URL, items, format='json')
+        assert response.status_code == 201
+        assert Title.objects.get().genre.count() == 1
+
+    def test_invalid_ndjson(self, admin_client, category, genres):
+        body = json.dumps(get_items(1)[0]) + '\n{"name": \n'
+        response = admin_client.post(URL, body,
+                                     content_type='application/x-ndjson')
+        assert response.status_code == 400
+        assert 'line 2' in response.json()['detail'], (
+            'Проверьте, что ошибка разбора NDJSON указывает номер строки'
+        )
+        assert not Title.objects.exists()
+
+    def test_not_a_list(self, admin_client):
+        response = admin_client.post(URL, {'name': 'Не массив'},
+                                     format='json')
+        assert response.status_code == 400
+        response = admin_client.post(URL, [], format='json')
+        assert response.status_code == 201
+        assert response.json()['results'] == []
+
+    def test_max_items(self, admin_client, category, genres, settings):
+        settings.BULK_MAX_ITEMS = 2
+        response = admin_client.post(URL, get_items(3), format='json')
+        assert response.status_code == 400, (
+            'Проверьте ограничение BULK_MAX_ITEMS'
+        )
+        assert not Title.objects.exists()
+
+    def test_permissions(self, client, user_client, category, genres):
+        for api_client, code in ((client, 401), (user_client, 403)):
+            response = api_client.post(URL, json.dumps(get_items()),
+                                       content_type='application/json')
+            assert response.status_code == code, (
+                'Проверьте, что пачку может создать только администратор'
+            )
+        assert not Title.objects.exists()
+
+    def test_invalidates_titles_list(self, admin_client, client, title):
+        assert client.get('/api/v1/titles/').json()['count'] == 1
+        admin_client.post(URL, get_items(), format='json')
+        assert client.get('/api/v1/titles/').json()['count'] == 4, (
+            'Проверьте, что пачка сбрасывает кеш списка произведений'
+        )
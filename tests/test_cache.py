@@ -0,0 +1,94 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import CacheVersion, Category, Review, Title
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+
+    def test_second_request_is_served_from_cache(self, client, title):
+        first = client.get('/api/v1/titles/')
+        second = client.get('/api/v1/titles/')
+        assert first['X-Cache'] == 'MISS'
+        assert second['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный запрос списка берётся из кеша'
+        )
+        assert first.json() == second.json()
+
+    def test_review_invalidates_title(self, client, title, user):
+        client.get('/api/v1/titles/')
+        client.get(f'/api/v1/titles/{title.id}/')
+        Review.objects.create(title=title, author=user, text='Отзыв',
+                              score=8)
+        response = client.get('/api/v1/titles/')
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['results'][0]['rating'] == 8
+        detail = client.get(f'/api/v1/titles/{title.id}/')
+        assert detail['X-Cache'] == 'MISS'
+
+    def test_invalidation_is_precise(self, client, title, category):
+        other = Title.objects.create(name='Другое', year=2000,
+                                     category=category)
+        client.get(f'/api/v1/titles/{title.id}/')
+        client.get(f'/api/v1/titles/{other.id}/')
+        client.get('/api/v1/genres/')
+        other.name = 'Изменено'
+        other.save()
+        assert client.get(f'/api/v1/titles/{title.id}/')['X-Cache'] == 'HIT'
+        assert client.get('/api/v1/genres/')['X-Cache'] == 'HIT'
+        assert client.get(f'/api/v1/titles/{other.id}/')['X-Cache'] == 'MISS'
+
+    def test_category_invalidates_titles(self, client, title, category):
+        client.get('/api/v1/categories/')
+        client.get(f'/api/v1/titles/{title.id}/')
+        Category.objects.filter(pk=category.pk).get().save()
+        assert client.get('/api/v1/categories/')['X-Cache'] == 'MISS'
+        assert client.get(f'/api/v1/titles/{title.id}/')['X-Cache'] == 'MISS'
+
+    def test_cache_is_keyed_by_role(self, client, admin_client, title):
+        client.get('/api/v1/titles/')
+        assert admin_client.get('/api/v1/titles/')['X-Cache'] == 'MISS'
+
+    def test_invalidation_reaches_other_workers(self, client, admin_client,
+                                                title, use_worker):
+        url = f'/api/v1/titles/{title.id}/'
+        use_worker('worker-a')
+        client.get(url)
+        client.get('/api/v1/titles/')
+        assert client.get(url)['X-Cache'] == 'HIT'
+
+        use_worker('worker-b')
+        response = admin_client.patch(url, {'name': 'Новое'}, format='json')
+        assert response.status_code == 200
+
+        use_worker('worker-a')
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что запись в одном воркере сбрасывает кеш '
+            'ответов в другом'
+        )
+        assert response.json()['name'] == 'Новое'
+        assert client.get('/api/v1/titles/').json()['results'][0][
+            'name'
+        ] == 'Новое'
+
+    @pytest.mark.parametrize('pk', ['abc', '9' * 150, '999999'])
+    def test_reads_do_not_create_versions(self, client, title, pk):
+        CacheVersion.objects.all().delete()
+        assert client.get(f'/api/v1/titles/{pk}/').status_code == 404
+        assert client.get('/api/v1/titles/').status_code == 200
+        assert client.get(f'/api/v1/titles/{title.id}/').status_code == 200
+        assert not CacheVersion.objects.exists(), (
+            'Проверьте, что чтение не создаёт версии групп в БД'
+        )
+
+    def test_versions_read_from_cache(self, client, title):
+        client.get(f'/api/v1/titles/{title.id}/')
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'/api/v1/titles/{title.id}/')
+        assert response['X-Cache'] == 'HIT'
+        assert len(context) == 0, (
+            'Проверьте, что попадание в кеш не обращается к БД'
+        )
@@ -0,0 +1,119 @@
+import gzip
+import json
+
+import pytest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+
+from api import compression
+from reviews.models import Title
+
+
+@pytest.fixture
+def titles(category, genres):
+    for number in range(20):
+        title = Title.objects.create(name=f'Произведение {number}',
+                                     year=2000, category=category)
+        title.genre.set(genres)
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('gzip', 'gzip'),
+    ('gzip, deflate, br', 'br'),
+    ('br;q=0.5, gzip', 'gzip'),
+    ('br;q=0, gzip;q=0', None),
+    ('*', 'br'),
+    ('*;q=0.1, gzip;q=0', 'br'),
+    ('identity', None),
+    ('', None),
+])
+def test_choose_encoding(header, expected):
+    assert compression.choose_encoding(header, ['br', 'gzip']) == expected, (
+        'Проверьте выбор кодировки по заголовку Accept-Encoding'
+    )
+
+
+@pytest.mark.django_db
+class TestCompressionMiddleware:
+
+    def test_large_page_is_gzipped(self, client, titles):
+        plain = client.get('/api/v1/titles/?limit=1000')
+        response = client.get('/api/v1/titles/?limit=1000',
+                              HTTP_ACCEPT_ENCODING='gzip')
+        assert 'Content-Encoding' not in plain
+        assert response['Content-Encoding'] == 'gzip', (
+            'Проверьте, что большие ответы сжимаются gzip'
+        )
+        assert 'Accept-Encoding' in response['Vary']
+        assert int(response['Content-Length']) == len(response.content)
+        assert len(response.content) < len(plain.content)
+        assert json.loads(gzip.decompress(response.content)) == plain.json()
+
+    @pytest.mark.skipif(compression.brotli is None,
+                        reason='Brotli is not installed')
+    def test_large_page_is_brotli_compressed(self, client, titles):
+        plain = client.get('/api/v1/titles/?limit=1000')
+        response = client.get('/api/v1/titles/?limit=1000',
+                              HTTP_ACCEPT_ENCODING='gzip, br')
+        assert response['Content-Encoding'] == 'br'
+        assert compression.brotli.decompress(response.content) == (
+            plain.content
+        )
+
+    def test_small_body_is_not_compressed(self, client, category):
+        response = client.get('/api/v1/categories/',
+                              HTTP_ACCEPT_ENCODING='gzip')
+        assert response.status_code == 200
+        assert 'Content-Encoding' not in response, (
+            'Проверьте, что ответы меньше COMPRESSION_MIN_SIZE не сжимаются'
+        )
+
+    def test_not_modified_is_not_compressed(self, client, titles):
+        url = '/api/v1/titles/?limit=1000'
+        etag = client.get(url, HTTP_ACCEPT_ENCODING='gzip')['ETag']
+        assert etag.startswith('W/'), (
+            'Проверьте, что у сжатого ответа слабый ETag'
+        )
+        response = client.get(url, HTTP_ACCEPT_ENCODING='gzip',
+                              HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert 'Content-Encoding' not in response
+
+    def test_threshold_and_encodings_settings(self, client, titles,
+                                              settings):
+        url = '/api/v1/titles/?limit=1000'
+        settings.COMPRESSION_ENCODINGS = ()
+        assert 'Content-Encoding' not in client.get(
+            url, HTTP_ACCEPT_ENCODING='gzip'
+        )
+        settings.COMPRESSION_ENCODINGS = ('gzip',)
+        settings.COMPRESSION_MIN_SIZE = 10 ** 7
+        assert 'Content-Encoding' not in client.get(
+            url, HTTP_ACCEPT_ENCODING='gzip'
+        )
+
+
+def test_streaming_response_is_compressed():
+    chunks = [b'{"id": %d}\n' % number for number in range(1000)]
+    middleware = compression.CompressionMiddleware(
+        lambda request: StreamingHttpResponse(
+            iter(chunks), content_type='application/x-ndjson'
+        )
+    )
+    response = middleware(
+        RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+    )
+    assert response['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(b''.join(response.streaming_content)) == (
+        b''.join(chunks)
+    )
+
+
+def test_binary_response_is_not_compressed():
+    middleware = compression.CompressionMiddleware(
+        lambda request: HttpResponse(b'\0' * 10000, content_type='image/png')
+    )
+    response = middleware(
+        RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+    )
+    assert 'Content-Encoding' not in response
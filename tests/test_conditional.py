@@ -0,0 +1,76 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+
+    def test_reviews_not_modified(self, client, title, user):
+        Review.objects.create(title=title, author=user, text='Отзыв',
+                              score=5)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.has_header('ETag')
+        assert response.has_header('Last-Modified')
+
+        with CaptureQueriesContext(connection) as context:
+            cached = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert cached.status_code == 304, (
+            'Проверьте, что на совпадающий If-None-Match возвращается 304'
+        )
+        assert len(context) == 1, (
+            'Проверьте, что ответ 304 не выполняет запрос списка'
+        )
+        cached = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        assert cached.status_code == 304
+
+    def test_review_edit_changes_etag(self, client, title, user):
+        review = Review.objects.create(title=title, author=user,
+                                       text='Отзыв', score=5)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        etag = client.get(url)['ETag']
+        review.text = 'Изменённый отзыв'
+        review.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
+    def test_comment_changes_etag(self, client, title, user):
+        review = Review.objects.create(title=title, author=user,
+                                       text='Отзыв', score=5)
+        url = f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+        etag = client.get(url)['ETag']
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        Comment.objects.create(review=review, author=user, text='Ок')
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_titles_not_modified(self, client, title, user):
+        url = f'/api/v1/titles/{title.id}/'
+        etag = client.get(url)['ETag']
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        Review.objects.create(title=title, author=user, text='Отзыв',
+                              score=5)
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_title_etag_across_workers(self, client, admin_client, title,
+                                       use_worker):
+        url = f'/api/v1/titles/{title.id}/'
+        use_worker('worker-a')
+        etag = client.get(url)['ETag']
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        use_worker('worker-b')
+        admin_client.patch(url, {'name': 'Новое'}, format='json')
+
+        use_worker('worker-a')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что запись в другом воркере меняет ETag'
+        )
+        assert response.json()['name'] == 'Новое'
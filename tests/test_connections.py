@@ -0,0 +1,41 @@
+from unittest import mock
+
+import pytest
+from django.core.signals import request_started
+from django.db import connection
+
+from api.connections import check_connections
+
+
+@pytest.fixture
+def health_checks():
+    previous = connection.settings_dict.get('CONN_HEALTH_CHECKS')
+    connection.settings_dict['CONN_HEALTH_CHECKS'] = True
+    yield
+    connection.settings_dict['CONN_HEALTH_CHECKS'] = previous
+
+
+@pytest.mark.django_db
+class TestConnectionHealthChecks:
+
+    def test_broken_connection_closed(self, health_checks):
+        connection.ensure_connection()
+        with mock.patch.object(connection, 'is_usable', return_value=False), \
+                mock.patch.object(connection, 'in_atomic_block', False), \
+                mock.patch.object(connection, 'close') as close:
+            request_started.send(sender=None)
+        assert close.called, (
+            'Проверьте, что оборванное соединение закрывается '
+            'в начале запроса'
+        )
+
+    def test_open_transaction_not_closed(self, health_checks):
+        connection.ensure_connection()
+        assert connection.in_atomic_block
+        with mock.patch.object(connection, 'is_usable', return_value=False), \
+                mock.patch.object(connection, 'close') as close:
+            check_connections()
+        assert not close.called, (
+            'Проверьте, что соединение внутри транзакции не закрывается'
+        )
+
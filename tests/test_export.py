@@ -0,0 +1,153 @@
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews import export
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title, User)
+
+URL = '/api/v1/export/'
+
+
+@pytest.fixture
+def review(title, user, another_user):
+    review = Review.objects.create(title=title, author=user, text='Отзыв',
+                                   score=7)
+    Comment.objects.create(review=review, author=another_user,
+                           text='Согласен, "да"\nи всё')
+    return review
+
+
+def get_body(response):
+    assert response.streaming, 'Проверьте, что выгрузка отдаётся потоком'
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestExportEndpoint:
+
+    def test_csv(self, admin_client, category, title, review):
+        Title.objects.create(name='Без отзывов', year=2000,
+                             category=category)
+        response = admin_client.get(URL + 'titles.csv',
+                                    HTTP_ACCEPT='text/csv')
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'text/csv; charset=utf-8'
+        assert 'filename="titles.csv"' in response['Content-Disposition']
+        rows = list(csv.DictReader(io.StringIO(get_body(response))))
+        assert rows == [
+            {'id': str(title.id), 'name': 'Титаник', 'year': '1997',
+             'category': str(category.id), 'description': '',
+             'rating': '7.0'},
+            {'id': str(title.id + 1), 'name': 'Без отзывов', 'year': '2000',
+             'category': str(category.id), 'description': '',
+             'rating': ''},
+        ], 'Проверьте столбцы titles.csv в формате addcsv'
+
+    def test_ndjson(self, admin_client, review):
+        response = admin_client.get(URL + 'comments.ndjson')
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = get_body(response).splitlines()
+        assert len(lines) == 1
+        comment = Comment.objects.get()
+        assert json.loads(lines[0]) == {
+            'id': comment.id, 'review_id': review.id,
+            'text': 'Согласен, "да"\nи всё', 'author': comment.author_id,
+            'pub_date': json.loads(lines[0])['pub_date'],
+        }
+
+    @pytest.mark.parametrize('name', [
+        'titles', 'titles.xml', 'unknown.csv', 'titles.csv.csv',
+    ])
+    def test_not_found(self, admin_client, name):
+        assert admin_client.get(URL + name).status_code == 404
+
+    def test_permissions(self, client, user_client):
+        assert client.get(URL + 'titles.csv').status_code == 401
+        assert user_client.get(URL + 'titles.csv').status_code == 403, (
+            'Проверьте, что выгрузка доступна только администратору'
+        )
+
+    def test_chunks_use_one_query(self, admin_client, title, settings):
+        for number in range(5):
+            Genre.objects.create(name=f'Жанр {number}', slug=f'genre{number}')
+        settings.EXPORT_CHUNK_SIZE = 2
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.get(URL + 'genre.ndjson')
+            chunks = list(response.streaming_content)
+        assert len(chunks) == 4, (
+            'Проверьте, что строки отдаются кусками по EXPORT_CHUNK_SIZE'
+        )
+        assert len([query for query in queries
+                    if 'FROM "reviews_genre"' in query['sql']]) == 1, (
+            'Проверьте, что таблица читается одним курсором'
+        )
+
+
+@pytest.mark.django_db
+class TestExportCommand:
+
+    def test_round_trip(self, tmp_path, title, review, admin):
+        call_command('exportdata', '--path', str(tmp_path),
+                     '--chunk-size', '1')
+        assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+            name + '.csv' for name, *_ in export.DATASETS
+        )
+        models = (Comment, Review, GenreTitle, Title, Genre, Category, User)
+        before = [list(model.objects.order_by('pk').values())
+                  for model in models]
+        for model in models:
+            model.objects.all().delete()
+
+        call_command('addcsv', '--path', str(tmp_path))
+        after = [list(model.objects.order_by('pk').values())
+                 for model in models]
+        # Пароли и версии кешей не выгружаются
+        for rows in before + after:
+            for row in rows:
+                for key in list(row):
+                    if key in ('password', 'last_login', 'date_joined') or (
+                        key.endswith(('_version', '_modified'))
+                    ):
+                        del row[key]
+        assert after == before, (
+            'Проверьте, что addcsv загружает выгрузку exportdata без потерь'
+        )
+
+    def test_ndjson_and_datasets(self, tmp_path, title):
+        call_command('exportdata', 'category', 'genre', '--format',
+                     'ndjson', '--path', str(tmp_path))
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            'category.ndjson', 'genre.ndjson',
+        ]
+        lines = (tmp_path / 'genre.ndjson').read_text(
+            encoding='utf-8'
+        ).splitlines()
+        assert [json.loads(line)['slug'] for line in lines] == [
+            'drama', 'comedy',
+        ]
+        with pytest.raises(CommandError):
+            call_command('exportdata', 'unknown', '--path', str(tmp_path))
+
+    def test_path_required(self, tmp_path):
+        with pytest.raises(CommandError):
+            call_command('exportdata', 'category')
+
+    @pytest.mark.parametrize('root', ['STATIC_ROOT', 'MEDIA_ROOT'])
+    def test_public_directories_refused(self, tmp_path, settings, root):
+        setattr(settings, root, str(tmp_path / 'public'))
+        for path in (tmp_path / 'public', tmp_path / 'public' / 'data'):
+            with pytest.raises(CommandError):
+                call_command('exportdata', '--path', str(path))
+        assert not (tmp_path / 'public').exists(), (
+            'Проверьте, что exportdata не пишет в каталоги, которые '
+            'раздаёт nginx'
+        )
+        call_command('exportdata', 'category', '--path',
+                     str(tmp_path / 'public-export'))
@@ -0,0 +1,58 @@
+import os
+import runpy
+
+import pytest
+from django.conf import settings
+
+CONFIG = os.path.join(settings.BASE_DIR, 'gunicorn.conf.py')
+
+
+@pytest.fixture
+def many_cpus(monkeypatch):
+    monkeypatch.setattr(os, 'sched_getaffinity', lambda pid: set(range(64)),
+                        raising=False)
+    for name in ('GUNICORN_WORKERS', 'GUNICORN_THREADS',
+                 'GUNICORN_DB_CONNECTIONS', 'GUNICORN_WORKER_CLASS'):
+        monkeypatch.delenv(name, raising=False)
+
+
+class TestGunicornConfig:
+
+    @pytest.mark.parametrize('worker_class', [
+        'gthread', 'uvicorn.workers.UvicornWorker',
+    ])
+    def test_workers_fit_connection_budget(self, many_cpus, monkeypatch,
+                                           worker_class):
+        monkeypatch.setenv('GUNICORN_WORKER_CLASS', worker_class)
+        config = runpy.run_path(CONFIG)
+        if worker_class == 'gthread':
+            connections = config['workers'] * config['threads']
+        else:
+            connections = config['workers'] * (
+                settings.ASGI_READ_THREADS + settings.ASGI_THREADS
+            )
+        assert config['workers'] >= 1
+        assert connections <= config['DB_CONNECTIONS'] < 100, (
+            'Проверьте, что соединения всех потоков помещаются в '
+            'max_connections PostgreSQL'
+        )
+
+    def test_gevent_connections_fit_budget(self, many_cpus, monkeypatch):
+        monkeypatch.setenv('GUNICORN_WORKER_CLASS', 'gevent')
+        config = runpy.run_path(CONFIG)
+        assert (config['workers'] * config['worker_connections']
+                <= config['DB_CONNECTIONS'])
+
+    def test_cpu_count_respects_quota(self, many_cpus, monkeypatch):
+        config = runpy.run_path(CONFIG)
+        monkeypatch.setitem(config['get_cpu_count'].__globals__,
+                            'get_cgroup_quota', lambda: 1.5)
+        assert config['get_cpu_count']() == 2, (
+            'Проверьте, что число CPU учитывает квоту cgroup контейнера'
+        )
+
+    def test_connections_closed_before_fork(self):
+        config = runpy.run_path(CONFIG)
+        assert 'pre_fork' in config, (
+            'Проверьте, что соединения мастера закрываются до fork'
+        )
@@ -0,0 +1,61 @@
+from itertools import combinations
+
+import pytest
+from django.db import IntegrityError, connection, transaction
+
+from api.filters import TitleFilter
+from reviews.models import Category, Genre, GenreTitle, Title
+
+from .utils import assert_uses_indexes
+
+FILTER_VALUES = {
+    'year': '2003',
+    'category': 'category-3',
+    'genre': 'genre-3',
+    'name': 'Произведение 3',
+}
+FILTER_COMBINATIONS = [
+    combination
+    for size in range(1, len(FILTER_VALUES) + 1)
+    for combination in combinations(FILTER_VALUES, size)
+]
+
+
+@pytest.fixture
+def catalogue():
+    categories = [
+        Category.objects.create(name=f'Категория {i}', slug=f'category-{i}')
+        for i in range(10)
+    ]
+    genres = [
+        Genre.objects.create(name=f'Жанр {i}', slug=f'genre-{i}')
+        for i in range(10)
+    ]
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {i}', year=2000 + i % 20,
+              category=categories[i % 10])
+        for i in range(300)
+    )
+    GenreTitle.objects.bulk_create(
+        GenreTitle(title_id_id=title_id, genre_id=genres[i % 10])
+        for i, title_id in enumerate(
+            Title.objects.values_list('id', flat=True))
+    )
+
+
+@pytest.mark.django_db
+class TestTitleFilterIndexes:
+
+    @pytest.mark.parametrize('fields', FILTER_COMBINATIONS,
+                             ids=lambda fields: '+'.join(fields))
+    def test_filter_uses_indexes(self, catalogue, fields):
+        if fields == ('name',) and connection.vendor != 'postgresql':
+            pytest.skip('Триграммный индекс по названию есть только '
+                        'в PostgreSQL')
+        params = {field: FILTER_VALUES[field] for field in fields}
+        queryset = TitleFilter(params, queryset=Title.objects.all()).qs
+        assert_uses_indexes(queryset, f'с фильтрами {params}')
+
+    def test_duplicate_genre_rejected(self, title, genres):
+        with pytest.raises(IntegrityError), transaction.atomic():
+            GenreTitle.objects.create(title_id=title, genre_id=genres[0])
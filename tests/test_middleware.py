@@ -0,0 +1,67 @@
+import json
+import logging
+
+import pytest
+from rest_framework.serializers import BaseSerializer
+
+
+@pytest.mark.django_db
+class TestPerformanceMiddleware:
+
+    def test_server_timing_header(self, client, title, settings):
+        settings.PERFORMANCE_SERVER_TIMING = True
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+        timing = response['Server-Timing']
+        assert 'db;dur=' in timing and '2 queries' in timing, (
+            'Проверьте, что в Server-Timing передаётся число запросов к БД'
+        )
+        assert 'serializer;dur=' in timing
+        assert 'total;dur=' in timing
+
+    def test_query_budget(self, client, title, settings):
+        settings.PERFORMANCE_QUERY_BUDGET = 1
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert response['X-Query-Budget-Exceeded'] == '2'
+
+    def test_metrics_histogram(self, client, admin_client, title):
+        client.get(f'/api/v1/titles/{title.id}/')
+        assert client.get('/api/v1/metrics/').status_code == 401
+        response = admin_client.get('/api/v1/metrics/')
+        assert response.status_code == 200
+        assert response.json()['title-detail']['count'] >= 1
+
+    def test_server_timing_disabled_by_default(self, client, title):
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert not response.has_header('Server-Timing'), (
+            'Проверьте, что Server-Timing по умолчанию выключен'
+        )
+
+    def test_serializer_not_patched(self, client, title):
+        data = BaseSerializer.__dict__['data']
+        client.get('/api/v1/titles/')
+        assert BaseSerializer.__dict__['data'] is data, (
+            'Проверьте, что middleware не подменяет BaseSerializer.data'
+        )
+
+    @pytest.mark.parametrize('url', ['/api/v1/titles/', '/api/v1/genres/'])
+    def test_serializer_time(self, client, title, caplog, url):
+        with caplog.at_level(logging.INFO, logger='api.performance'):
+            assert client.get(url).status_code == 200
+        metrics = json.loads(caplog.records[-1].getMessage())
+        assert metrics['serializer_ms'] > 0, (
+            'Проверьте замер времени сериализации'
+        )
+
+    def test_streaming_queries(self, admin_client, title, caplog, settings):
+        settings.PERFORMANCE_SERVER_TIMING = True
+        with caplog.at_level(logging.INFO, logger='api.performance'):
+            response = admin_client.get('/api/v1/export/titles.ndjson')
+            assert not caplog.records, (
+                'Проверьте, что метрики потока пишутся после его чтения'
+            )
+            b''.join(response.streaming_content)
+        metrics = json.loads(caplog.records[-1].getMessage())
+        assert metrics['streaming']
+        assert f'"{metrics["queries"]} queries"' not in (
+            response['Server-Timing']
+        ), 'Проверьте, что запросы при чтении потока учитываются'
@@ -0,0 +1,102 @@
+import os
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews.models import OutgoingEmail
+from reviews.outbox import send_pending
+
+
+@pytest.fixture
+def file_backend(settings, tmp_path):
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+    settings.EMAIL_FILE_PATH = str(tmp_path)
+    return tmp_path
+
+
+def read_sent(path):
+    return ''.join(
+        (path / name).read_text() for name in sorted(os.listdir(path))
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestEmailOutbox:
+
+    def test_signup_queues_email(self, client, file_backend):
+        response = client.post('/api/v1/auth/signup/', data={
+            'email': 'new@yamdb.fake', 'username': 'new_user',
+        })
+        assert response.status_code == 200
+        assert not os.listdir(file_backend), (
+            'Проверьте, что регистрация не отправляет письмо в запросе'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == 'new@yamdb.fake'
+        assert email.sent is None
+
+    def test_command_drains_queue(self, client, file_backend):
+        for number in range(3):
+            client.post('/api/v1/auth/signup/', data={
+                'email': f'user{number}@yamdb.fake',
+                'username': f'user{number}',
+            })
+        call_command('send_emails', batch_size=2, stdout=mock.MagicMock())
+        assert not OutgoingEmail.objects.filter(sent__isnull=True).exists(), (
+            'Проверьте, что команда send_emails отправляет всю очередь'
+        )
+        sent = read_sent(file_backend)
+        for number in range(3):
+            assert f'user{number}@yamdb.fake' in sent
+
+    def test_failed_email_retried_with_backoff(self, file_backend):
+        OutgoingEmail.objects.create(subject='Тема', body='Текст',
+                                     from_email='from@yamdb.com',
+                                     recipient='to@yamdb.fake')
+        with mock.patch(
+            'django.core.mail.EmailMessage.send',
+            side_effect=ConnectionError('SMTP недоступен'),
+        ):
+            assert send_pending(backoff=60) == (0, 1)
+        email = OutgoingEmail.objects.get()
+        assert email.attempts == 1
+        assert 'SMTP недоступен' in email.last_error
+        assert send_pending(backoff=60) == (0, 0), (
+            'Проверьте, что повторная попытка откладывается на время паузы'
+        )
+        OutgoingEmail.objects.update(next_attempt=email.created)
+        assert send_pending(backoff=60) == (1, 0)
+        assert 'to@yamdb.fake' in read_sent(file_backend)
+
+    def test_sent_body_cleared(self, client, file_backend):
+        client.post('/api/v1/auth/signup/', data={
+            'email': 'new@yamdb.fake', 'username': 'new_user',
+        })
+        assert OutgoingEmail.objects.get().body
+        assert send_pending() == (1, 0)
+        assert OutgoingEmail.objects.get().body == '', (
+            'Проверьте, что код подтверждения не хранится после отправки'
+        )
+        assert 'new@yamdb.fake' in read_sent(file_backend)
+
+    def test_command_purges_old_emails(self, file_backend):
+        old = timezone.now() - timedelta(days=8)
+        for sent, attempts in ((old, 1), (None, 5), (None, 0),
+                               (timezone.now(), 1)):
+            OutgoingEmail.objects.create(
+                subject='Тема', body='Текст', from_email='from@yamdb.com',
+                recipient='to@yamdb.fake', sent=sent, attempts=attempts,
+                next_attempt=timezone.now() + timedelta(days=1),
+            )
+        OutgoingEmail.objects.update(created=old)
+        call_command('send_emails', retention_days=7,
+                     stdout=mock.MagicMock())
+        assert sorted(OutgoingEmail.objects.values_list(
+            'attempts', flat=True
+        )) == [0, 1], (
+            'Проверьте, что send_emails удаляет отправленные и брошенные '
+            'письма старше срока хранения'
+        )
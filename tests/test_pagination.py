@@ -0,0 +1,43 @@
+import pytest
+
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+
+    def test_titles_cursor_walks_all_pages(self, client, category):
+        Title.objects.bulk_create([
+            Title(name=f'Произведение {i}', year=2000, category=category)
+            for i in range(7)
+        ])
+        response = client.get('/api/v1/titles/', {'cursor': '', 'limit': 3})
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что в курсорном режиме не выполняется COUNT(*)'
+        )
+        ids = [item['id'] for item in data['results']]
+        while data['next']:
+            data = client.get(data['next']).json()
+            ids += [item['id'] for item in data['results']]
+        assert ids == list(
+            Title.objects.order_by('id').values_list('id', flat=True)
+        )
+
+    def test_reviews_cursor_ordered_by_pub_date(self, client, title, user,
+                                                 another_user):
+        Review.objects.create(title=title, author=user, text='Первый',
+                              score=5)
+        Review.objects.create(title=title, author=another_user,
+                              text='Второй', score=5)
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/',
+                              {'cursor': ''})
+        texts = [item['text'] for item in response.json()['results']]
+        assert texts == list(
+            title.reviews.order_by('pub_date', 'id')
+            .values_list('text', flat=True)
+        )
+
+    def test_limit_offset_is_default(self, client, title):
+        response = client.get('/api/v1/titles/')
+        assert response.json()['count'] == 1
@@ -0,0 +1,59 @@
+import pytest
+
+from api.cache import TITLES_LIST, get_state
+from reviews.models import Comment, GenreTitle, Review, Title
+
+from .utils import assert_constant_queries, count_queries
+
+
+@pytest.fixture
+def catalogue(category, genres, django_user_model):
+    authors = [
+        django_user_model.objects.create_user(
+            username=f'author{i}', email=f'author{i}@yamdb.fake'
+        )
+        for i in range(20)
+    ]
+    titles = [
+        Title.objects.create(name=f'Произведение {i}', year=2000,
+                             category=category)
+        for i in range(20)
+    ]
+    for title in titles:
+        for genre in genres:
+            GenreTitle.objects.create(title_id=title, genre_id=genre)
+    title = titles[0]
+    for author in authors:
+        review = Review.objects.create(title=title, author=author,
+                                       text='Отзыв', score=5)
+    for author in authors:
+        Comment.objects.create(review=review, author=author, text='Ок')
+    return title, review
+
+
+@pytest.mark.django_db
+class TestQueryCount:
+
+    def test_titles_list(self, client, catalogue):
+        # Версии групп кеша читаются из кеша версий, а не из БД
+        get_state([TITLES_LIST])
+        assert_constant_queries(client, '/api/v1/titles/', expected=3)
+
+    def test_titles_list_cold_versions(self, client, catalogue):
+        # Без кеша версий — один запрос к CacheVersion для ETag и ключа
+        count, _ = count_queries(client, '/api/v1/titles/')
+        assert count == 4
+
+    def test_reviews_list(self, client, catalogue):
+        title, _ = catalogue
+        assert_constant_queries(
+            client, f'/api/v1/titles/{title.id}/reviews/', expected=3
+        )
+
+    def test_comments_list(self, client, catalogue):
+        title, review = catalogue
+        assert_constant_queries(
+            client,
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+            expected=3,
+        )
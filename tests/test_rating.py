@@ -0,0 +1,51 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db
+class TestTitleRating:
+
+    def test_rating_follows_review_writes(self, title, user, another_user):
+        review = Review.objects.create(title=title, author=user,
+                                       text='Отзыв', score=4)
+        Review.objects.create(title=title, author=another_user,
+                              text='Отзыв', score=9)
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (13, 2), (
+            'Проверьте, что создание отзыва обновляет рейтинг произведения'
+        )
+        assert title.rating == 6.5
+
+        review.score = 10
+        review.save()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (19, 2), (
+            'Проверьте, что изменение оценки обновляет рейтинг произведения'
+        )
+
+        Review.objects.all().delete()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (0, 0), (
+            'Проверьте, что удаление отзыва обновляет рейтинг произведения'
+        )
+        assert title.rating is None
+
+    def test_titles_endpoint_returns_stored_rating(self, client, title,
+                                                   user):
+        Review.objects.create(title=title, author=user,
+                              text='Отзыв', score=7)
+        response = client.get('/api/v1/titles/')
+        assert response.json()['results'][0]['rating'] == 7
+
+    def test_rebuild_ratings_command(self, title, user):
+        Review.objects.create(title=title, author=user,
+                              text='Отзыв', score=8)
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+        with pytest.raises(CommandError):
+            call_command('rebuild_ratings', '--check')
+        call_command('rebuild_ratings')
+        call_command('rebuild_ratings', '--check')
+        title.refresh_from_db()
+        assert title.rating == 8
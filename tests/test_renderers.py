@@ -0,0 +1,94 @@
+import io
+import uuid
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api import parsers, renderers
+from reviews.models import Review
+
+PAYLOADS = [
+    {'text': 'Отзыв с разделителем строк ', 'score': 10},
+    [{'id': 2 ** 70, 'rating': 7.25}, {'rating': None, 'ok': True}],
+    {'pub_date': timezone.now(), 'date': timezone.now().date(),
+     'duration': timezone.timedelta(seconds=90)},
+    {'price': Decimal('1.50'), 'uuid': uuid.uuid4(),
+     'lazy': gettext_lazy('Оценка'), 'tuple': (1, 2)},
+    {'escape': '"\\\n\t\x00\x1f', 1: 'int key'},
+    [1e16, -1.5e16, 1e22, 1e-7, 5e-05, -1e-05, 0.0001, 0.00012, 1e15],
+    {'text': '1e5 и 0.00001 в строке', 'rating': None},
+]
+
+
+@pytest.fixture(params=[True, False], ids=['orjson', 'stdlib'])
+def orjson_installed(request, monkeypatch):
+    if request.param:
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr(renderers, 'orjson', None)
+        monkeypatch.setattr(parsers, 'orjson', None)
+
+
+class TestFastJSON:
+
+    @pytest.mark.parametrize('data', PAYLOADS)
+    def test_renderer_output_identical(self, orjson_installed, data):
+        assert (renderers.FastJSONRenderer().render(data)
+                == JSONRenderer().render(data)), (
+            'Проверьте, что FastJSONRenderer выводит те же байты, '
+            'что и JSONRenderer'
+        )
+
+    @pytest.mark.parametrize('value', [
+        float('nan'), float('inf'), -float('inf'),
+    ])
+    def test_non_finite_rejected(self, orjson_installed, value):
+        data = {'rating': None, 'mean': [value]}
+        with pytest.raises(ValueError):
+            JSONRenderer().render(data)
+        with pytest.raises(ValueError):
+            renderers.FastJSONRenderer().render(data)
+
+    def test_non_finite_allowed(self, orjson_installed, monkeypatch):
+        monkeypatch.setattr(JSONRenderer, 'strict', False)
+        data = {'rating': None, 'mean': float('nan'), 'max': float('inf')}
+        assert (renderers.FastJSONRenderer().render(data)
+                == JSONRenderer().render(data)), (
+            'Проверьте, что NaN выводится так же, как в JSONRenderer'
+        )
+
+    def test_indent_falls_back(self, orjson_installed):
+        data = {'a': [1, 2]}
+        context = {'indent': 4}
+        assert (renderers.FastJSONRenderer().render(data, None, context)
+                == JSONRenderer().render(data, None, context))
+
+    @pytest.mark.parametrize('body', [
+        b'{"text": "\\u041e\\u0442\\u0437\\u044b\\u0432", "score": 5}',
+        b'[1, 2.5, null, true, "\xd0\xbe"]',
+        b'{"big": 123456789012345678901234567890}',
+    ])
+    def test_parser_result_identical(self, orjson_installed, body):
+        assert (parsers.FastJSONParser().parse(io.BytesIO(body))
+                == JSONParser().parse(io.BytesIO(body)))
+
+    @pytest.mark.parametrize('body', [b'{"a": ', b'{"a": NaN}'])
+    def test_parser_rejects_invalid(self, orjson_installed, body):
+        with pytest.raises(ParseError):
+            parsers.FastJSONParser().parse(io.BytesIO(body))
+
+
+@pytest.mark.django_db
+class TestFastJSONEndpoints:
+
+    def test_titles_response_identical(self, client, title, user):
+        Review.objects.create(title=title, author=user, text='Отзыв',
+                              score=7)
+        for url in ('/api/v1/titles/', f'/api/v1/titles/{title.id}/reviews/'):
+            response = client.get(url)
+            assert response.content == JSONRenderer().render(response.data)
@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+import pytest
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.serializers import ModelSerializer
+
+from api.serializers import ReviewSerializer
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db
+class TestReviewsAndComments:
+
+    def test_duplicate_review_rejected(self, user_client, title):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        data = {'text': 'Отзыв', 'score': 7}
+        assert user_client.post(url, data=data).status_code == 201
+        response = user_client.post(url, data=data)
+        assert response.status_code == 400, (
+            'Проверьте, что повторный отзыв на произведение отклоняется'
+        )
+        assert Review.objects.count() == 1
+
+    def test_other_integrity_errors_propagate(self, monkeypatch, title,
+                                              user):
+        def fail(self, validated_data):
+            raise IntegrityError('CHECK constraint failed')
+
+        monkeypatch.setattr(ModelSerializer, 'create', fail)
+        serializer = ReviewSerializer(data={'text': 'Отзыв', 'score': 7})
+        assert serializer.is_valid()
+        with pytest.raises(IntegrityError):
+            serializer.save(title=title, author=user)
+
+    def test_title_looked_up_once_on_create(self, user_client, title):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            user_client.post(url, data={'text': 'Отзыв', 'score': 7})
+        title_queries = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_title"' in query['sql']
+        ]
+        assert len(title_queries) == 1, (
+            'Проверьте, что произведение запрашивается один раз за запрос'
+        )
+
+    def test_comments_require_matching_title(self, client, title, user,
+                                             category):
+        review = Review.objects.create(title=title, author=user,
+                                       text='Отзыв', score=5)
+        other = Title.objects.create(name='Другое', year=2000,
+                                     category=category)
+        response = client.get(
+            f'/api/v1/titles/{other.id}/reviews/{review.id}/comments/'
+        )
+        assert response.status_code == 404, (
+            'Проверьте, что отзыв должен принадлежать произведению из URL'
+        )
+
+    def test_pub_date_set_on_each_insert(self, title, user, another_user):
+        before = timezone.now()
+        first = Review.objects.create(title=title, author=user,
+                                      text='Первый', score=5)
+        second = Review.objects.create(title=title, author=another_user,
+                                       text='Второй', score=5)
+        assert before <= first.pub_date < second.pub_date, (
+            'Проверьте, что дата публикации вычисляется при каждой вставке'
+        )
+
+    def test_reviews_listed_by_pub_date(self, client, title, user,
+                                        another_user):
+        now = timezone.now()
+        Review.objects.create(title=title, author=user, text='Новый',
+                              score=5, pub_date=now)
+        Review.objects.create(title=title, author=another_user,
+                              text='Старый', score=5,
+                              pub_date=now - timedelta(days=1))
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert [review['text'] for review in response.json()['results']] == [
+            'Старый', 'Новый'
+        ], 'Проверьте, что отзывы упорядочены по дате публикации'
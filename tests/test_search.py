@@ -0,0 +1,34 @@
+import pytest
+
+from reviews.models import Category, Title
+
+
+@pytest.mark.django_db
+class TestSearch:
+
+    def test_title_name_filter_matches_substring(self, client, category):
+        Title.objects.create(name='Властелин колец', year=1954,
+                             category=category)
+        Title.objects.create(name='Хоббит', year=1937, category=category)
+        response = client.get('/api/v1/titles/', {'name': 'колец'})
+        names = [item['name'] for item in response.json()['results']]
+        assert names == ['Властелин колец'], (
+            'Проверьте, что фильтр name ищет по подстроке названия'
+        )
+
+    def test_category_search(self, client, category):
+        Category.objects.create(name='Книга', slug='books')
+        response = client.get('/api/v1/categories/', {'search': 'Фил'})
+        slugs = [item['slug'] for item in response.json()['results']]
+        assert slugs == ['films']
+
+    def test_category_search_matches_each_term(self, client, category):
+        Category.objects.create(name='Научный фильм', slug='science-films')
+        Category.objects.create(name='Научная книга', slug='science-books')
+        response = client.get('/api/v1/categories/',
+                              {'search': 'фильм Науч'})
+        slugs = [item['slug'] for item in response.json()['results']]
+        assert slugs == ['science-films'], (
+            'Проверьте, что поиск из нескольких слов находит строки, '
+            'содержащие каждое слово'
+        )
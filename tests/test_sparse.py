@@ -0,0 +1,195 @@
+import json
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.serializers import TitleSerializer
+from api.values import ValuesSerializer, get_values_plan
+from reviews.models import Comment, Review, Title
+
+
+@pytest.fixture
+def review(title, user, another_user):
+    review = Review.objects.create(title=title, author=user, text='Отзыв',
+                                   score=7)
+    Comment.objects.create(review=review, author=another_user, text='Ок')
+    return review
+
+
+def get_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f'Эндпоинт `{url}` вернул код {response.status_code}'
+    )
+    return response.json(), [query['sql'] for query in context]
+
+
+def get_columns(queries, table):
+    """Столбцы (таблица, столбец) SELECT-запроса к таблице table."""
+    for sql in queries:
+        match = re.match(r'SELECT (.*?) FROM "(\w+)"', sql)
+        if match and match.group(2) == table and '"."' in match.group(1):
+            return re.findall(r'"(\w+)"\."(\w+)"', match.group(1))
+    assert False, f'Не найден запрос к таблице {table}'
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+
+    def test_title_list_fields(self, client, title):
+        data, queries = get_queries(
+            client, '/api/v1/titles/?fields=id,name,rating'
+        )
+        assert list(data['results'][0]) == ['id', 'name', 'rating']
+        assert get_columns(queries, 'reviews_title') == [
+            ('reviews_title', 'id'),
+            ('reviews_title', 'name'),
+            ('reviews_title', 'rating'),
+        ], 'Проверьте, что ?fields= сужает список столбцов'
+        assert not [sql for sql in queries if 'reviews_genre' in sql
+                    or 'reviews_category' in sql], (
+            'Проверьте, что без genre и category нет JOIN и prefetch'
+        )
+
+    def test_title_list_collapsed(self, client, title):
+        data, queries = get_queries(
+            client, '/api/v1/titles/?fields=id,genre,category&expand='
+        )
+        assert data['results'][0] == {
+            'id': title.id, 'genre': ['drama', 'comedy'],
+            'category': 'films',
+        }, 'Проверьте, что без expand связи выводятся slug'
+        assert get_columns(queries, 'reviews_title') == [
+            ('reviews_title', 'id'), ('reviews_category', 'slug'),
+        ]
+        assert ('reviews_genre', 'slug') in get_columns(
+            queries, 'reviews_genre'
+        )
+        assert ('reviews_genre', 'name') not in get_columns(
+            queries, 'reviews_genre'
+        )
+
+    def test_title_list_expand(self, client, title):
+        data, queries = get_queries(
+            client, '/api/v1/titles/?fields=id,genre,category&expand=genre'
+        )
+        assert data['results'][0]['genre'] == [
+            {'name': 'Драма', 'slug': 'drama'},
+            {'name': 'Комедия', 'slug': 'comedy'},
+        ]
+        assert data['results'][0]['category'] == 'films'
+        assert ('reviews_genre', 'name') in get_columns(
+            queries, 'reviews_genre'
+        )
+
+    def test_title_retrieve_fields(self, client, title):
+        data, queries = get_queries(
+            client, f'/api/v1/titles/{title.id}/?fields=id,name'
+        )
+        assert data == {'id': title.id, 'name': title.name}
+        assert get_columns(queries, 'reviews_title') == [
+            ('reviews_title', 'id'), ('reviews_title', 'name'),
+        ], 'Проверьте, что retrieve с ?fields= использует only()'
+
+    def test_title_retrieve_default_columns(self, client, title):
+        _, queries = get_queries(client, f'/api/v1/titles/{title.id}/')
+        columns = get_columns(queries, 'reviews_title')
+        assert ('reviews_title', 'description') in columns
+        assert ('reviews_title', 'reviews_version') not in columns, (
+            'Проверьте, что retrieve читает только выводимые столбцы'
+        )
+
+    def test_review_and_comment_fields(self, client, title, review):
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        data, queries = get_queries(client, url + '?fields=id,score')
+        assert data['results'] == [{'id': review.id, 'score': 7}]
+        assert get_columns(queries, 'reviews_review') == [
+            ('reviews_review', 'id'), ('reviews_review', 'score'),
+        ]
+
+        data, queries = get_queries(
+            client, f'{url}{review.id}/comments/?fields=text,author'
+        )
+        assert data['results'] == [{'text': 'Ок',
+                                    'author': 'TestUserAnother'}]
+        assert get_columns(queries, 'reviews_comment') == [
+            ('reviews_comment', 'id'), ('reviews_comment', 'text'),
+            ('reviews_user', 'username'),
+        ]
+        assert len(queries) == 3, (
+            'Проверьте, что авторы, загруженные только с username, '
+            'не догружают остальные поля'
+        )
+
+        data, queries = get_queries(client, f'{url}{review.id}/?fields=id')
+        assert data == {'id': review.id}
+        assert get_columns(queries, 'reviews_review') == [
+            ('reviews_review', 'id'),
+        ]
+
+    @pytest.mark.parametrize('query', [
+        'fields=id,unknown', 'expand=description', 'expand=unknown',
+    ])
+    def test_unknown_fields(self, client, title, query):
+        response = client.get(f'/api/v1/titles/?{query}')
+        assert response.status_code == 400, (
+            'Проверьте, что неизвестные поля в ?fields= и ?expand= '
+            'возвращают 400'
+        )
+
+    def test_writes_ignore_fieldset(self, admin_client, title):
+        response = admin_client.patch(
+            f'/api/v1/titles/{title.id}/?fields=id', {'name': 'Новое'},
+            format='json',
+        )
+        assert response.status_code == 200
+        assert response.json()['name'] == 'Новое'
+
+    def test_collapsed_values_plan(self, title):
+        queryset = Title.objects.order_by('id')
+        plan = get_values_plan(TitleSerializer, (('expand', ()),))
+        fast = ValuesSerializer(plan.values(queryset), plan=plan).data
+        slow = TitleSerializer(queryset, many=True, expand=()).data
+        assert json.dumps(fast) == json.dumps(slow)
+
+
+@pytest.mark.django_db
+class TestDeferredReviews:
+
+    def test_deferred_review_keeps_rating(self, title, review):
+        deferred = Review.objects.only('id', 'text').get()
+        deferred.score = 3
+        deferred.save()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (3, 1), (
+            'Проверьте, что отзыв, загруженный через only(), '
+            'правильно обновляет рейтинг'
+        )
+        Review.objects.only('id').get().delete()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (0, 0)
+
+    @pytest.mark.parametrize('url', [
+        '/api/v1/titles/{title}/reviews/',
+        '/api/v1/titles/{title}/reviews/{review}/comments/',
+    ])
+    def test_cursor_with_fields(self, client, title, review, another_user,
+                                url):
+        Review.objects.create(title=title, author=another_user, text='Ещё',
+                              score=5)
+        Comment.objects.create(review=review, author=another_user,
+                               text='Ещё')
+        url = url.format(title=title.id, review=review.id)
+        response = client.get(url, {'cursor': '', 'fields': 'id,text',
+                                    'limit': 1})
+        assert response.status_code == 200, (
+            'Проверьте, что курсорная пагинация работает с ?fields='
+        )
+        data = response.json()
+        assert [list(item) for item in data['results']] == [['id', 'text']], (
+            'Проверьте, что поля курсора не попадают в ответ'
+        )
+        assert data['next'], 'Проверьте ссылку на следующую страницу'
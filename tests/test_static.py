@@ -0,0 +1,167 @@
+import gzip
+import json
+import os
+import re
+
+import pytest
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+
+from api import staticfiles
+
+from .conftest import infra_dir_path
+
+# Каталог проекта в контейнере: WORKDIR в Dockerfile
+APP_DIR = '/app/'
+
+
+def read_infra(name):
+    with open(os.path.join(infra_dir_path, name), encoding='utf-8') as file:
+        return file.read()
+
+
+def get_locations():
+    """Блоки location из default.conf: (модификатор, шаблон, директивы)."""
+    locations = []
+    for modifier, quoted, pattern, body in re.findall(
+        r'location\s+(?:([~=])\s+)?(?:"([^"]+)"|([^\s{]+))\s*\{([^}]*)\}',
+        read_infra(os.path.join('nginx', 'default.conf')),
+    ):
+        directives = dict(re.findall(r'(\w+)\s+([^;]+);', body))
+        locations.append((modifier, quoted or pattern, directives))
+    return locations
+
+
+def get_volumes(service):
+    """Тома сервиса docker-compose в виде {путь в контейнере: том}."""
+    block = re.search(
+        rf'^  {service}:\n((?:    .*\n|\s*\n)+)',
+        read_infra('docker-compose.yaml'), re.MULTILINE,
+    ).group(1)
+    volumes = re.search(r'volumes:\n((?:\s+- .*\n)+)', block).group(1)
+    return {
+        path: name for name, path in re.findall(
+            r'- (\w+):(\S+)', volumes
+        )
+    }
+
+
+def resolve(uri):
+    """Путь к файлу и директивы location, как их выберет nginx."""
+    locations = get_locations()
+    for modifier, pattern, directives in locations:
+        if modifier == '~':
+            match = re.search(pattern, uri)
+            if match:
+                return match.expand(
+                    directives['alias'].replace('$1', r'\1')
+                ), directives
+    prefix, directives = max(
+        ((pattern, directives) for modifier, pattern, directives
+         in locations if not modifier and uri.startswith(pattern)),
+        key=lambda location: len(location[0]),
+    )
+    if 'alias' not in directives:
+        return None, directives
+    path = directives['alias'] + uri[len(prefix):]
+    return (path + 'index.html' if path.endswith('/') else path), directives
+
+
+class TestNginxPaths:
+
+    @pytest.mark.parametrize('url, root', [
+        (settings.STATIC_URL, settings.STATIC_ROOT),
+        (settings.MEDIA_URL, settings.MEDIA_ROOT),
+    ])
+    def test_aliases_match_volumes(self, url, root):
+        path, _ = resolve(url + 'file.txt')
+        container_root = APP_DIR + os.path.relpath(
+            root, settings.BASE_DIR
+        ) + '/'
+        assert path == container_root + 'file.txt', (
+            f'Проверьте, что nginx отдаёт {url} из {container_root}'
+        )
+        nginx_volumes = get_volumes('nginx')
+        web_volumes = get_volumes('web')
+        assert container_root in nginx_volumes, (
+            f'Проверьте, что {container_root} подключён к контейнеру nginx'
+        )
+        assert web_volumes.get(container_root) == (
+            nginx_volumes[container_root]
+        ), (
+            f'Проверьте, что web и nginx используют один том для '
+            f'{container_root}'
+        )
+
+    def test_api_is_proxied(self):
+        path, directives = resolve('/api/v1/titles/')
+        assert path is None
+        assert directives['proxy_pass'] == 'http://web:8000'
+
+
+@pytest.mark.django_db
+class TestBuildStatic:
+
+    @pytest.fixture
+    def static_root(self, tmp_path, settings):
+        settings.STATIC_ROOT = str(tmp_path / 'app' / 'static')
+        call_command('buildstatic', interactive=False, verbosity=0)
+        return tmp_path
+
+    def local_path(self, static_root, container_path):
+        assert container_path.startswith(APP_DIR)
+        return str(static_root / 'app' / container_path[len(APP_DIR):])
+
+    def test_hashed_files_are_cached_forever(self, static_root):
+        with open(os.path.join(settings.STATIC_ROOT,
+                               'staticfiles.json')) as manifest:
+            paths = json.load(manifest)['paths']
+        assert paths, 'Проверьте, что buildstatic пишет манифест'
+        for name, hashed_name in paths.items():
+            path, directives = resolve(settings.STATIC_URL + hashed_name)
+            assert os.path.isfile(self.local_path(static_root, path)), (
+                f'nginx не найдёт {hashed_name} по пути {path}'
+            )
+            assert directives.get('expires') == 'max', (
+                f'Проверьте, что {hashed_name} кешируется навсегда'
+            )
+            _, directives = resolve(settings.STATIC_URL + name)
+            assert directives.get('expires') != 'max', (
+                f'Файл без хеша {name} не должен кешироваться навсегда'
+            )
+        assert staticfiles_storage.url('admin/css/base.css') == (
+            settings.STATIC_URL + paths['admin/css/base.css']
+        )
+
+    def test_files_are_precompressed(self, static_root):
+        path, _ = resolve(
+            settings.STATIC_URL + staticfiles_storage.stored_name(
+                'admin/css/base.css'
+            )
+        )
+        path = self.local_path(static_root, path)
+        with open(path, 'rb') as source, gzip.open(path + '.gz') as copy:
+            assert copy.read() == source.read(), (
+                'Проверьте, что рядом с файлом лежит его копия .gz'
+            )
+        if staticfiles.brotli is not None:
+            with open(path, 'rb') as source, open(path + '.br',
+                                                  'rb') as copy:
+                assert staticfiles.brotli.decompress(copy.read()) == (
+                    source.read()
+                )
+        assert not [
+            name for _, _, names in os.walk(settings.STATIC_ROOT)
+            for name in names
+            if name.endswith('.png.gz') or name.endswith('.gz.gz')
+        ], 'Сжимать нужно только текстовые файлы'
+
+    def test_redoc_is_rendered(self, client, static_root):
+        path, _ = resolve('/redoc/')
+        with open(self.local_path(static_root, path),
+                  encoding='utf-8') as page:
+            assert page.read() == client.get('/redoc/').content.decode(), (
+                'Проверьте, что buildstatic сохраняет страницу redoc'
+            )
+        assert os.path.exists(self.local_path(static_root, path) + '.gz')
@@ -0,0 +1,138 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, ScoreHistogram, Title
+
+
+def get_counts(title):
+    return ScoreHistogram.objects.get(title=title).counts
+
+
+@pytest.mark.django_db
+class TestScoreHistogram:
+
+    def test_histogram_follows_review_writes(self, category, title, user,
+                                             another_user):
+        review = Review.objects.create(title=title, author=user,
+                                       text='Отзыв', score=4)
+        Review.objects.create(title=title, author=another_user,
+                              text='Отзыв', score=9)
+        counts = get_counts(title)
+        assert (counts[4], counts[9]) == (1, 1), (
+            'Проверьте, что создание отзыва обновляет распределение оценок'
+        )
+
+        review.score = 10
+        review.save()
+        counts = get_counts(title)
+        assert (counts[4], counts[10]) == (0, 1), (
+            'Проверьте, что изменение оценки переносит её в распределении'
+        )
+
+        other = Title.objects.create(name='Аватар', year=2009,
+                                     category=category)
+        review.title = other
+        review.save()
+        assert get_counts(title)[10] == 0
+        assert get_counts(other)[10] == 1, (
+            'Проверьте, что перенос отзыва переносит оценку между '
+            'произведениями'
+        )
+
+        Review.objects.all().delete()
+        assert get_counts(title) == dict.fromkeys(range(1, 11), 0)
+        assert get_counts(other) == dict.fromkeys(range(1, 11), 0), (
+            'Проверьте, что удаление отзыва обновляет распределение оценок'
+        )
+
+    @pytest.mark.parametrize('scores, mean, median', [
+        ([], None, None),
+        ([7], 7, 7),
+        ([2, 9], 5.5, 5.5),
+        ([1, 3, 3, 10], 4.25, 3),
+        ([5, 5, 6, 8, 10], 6.8, 6),
+    ])
+    def test_mean_and_median(self, scores, mean, median):
+        histogram = ScoreHistogram()
+        for score in scores:
+            field = f'score_{score}'
+            setattr(histogram, field, getattr(histogram, field) + 1)
+        assert histogram.count == len(scores)
+        assert histogram.mean == mean
+        assert histogram.median == median, (
+            'Проверьте расчёт медианы по распределению оценок'
+        )
+
+    def test_rebuild_command_backfills_histograms(self, title, user,
+                                                  another_user):
+        Review.objects.create(title=title, author=user,
+                              text='Отзыв', score=8)
+        Review.objects.create(title=title, author=another_user,
+                              text='Отзыв', score=3)
+        ScoreHistogram.objects.all().delete()
+        with pytest.raises(CommandError):
+            call_command('rebuild_ratings', '--check')
+        call_command('rebuild_ratings')
+        call_command('rebuild_ratings', '--check')
+        counts = get_counts(title)
+        assert (counts[3], counts[8], sum(counts.values())) == (1, 1, 2)
+
+        ScoreHistogram.objects.update(score_3=5)
+        with pytest.raises(CommandError):
+            call_command('rebuild_ratings', '--check')
+        call_command('rebuild_ratings')
+        assert get_counts(title)[3] == 1, (
+            'Проверьте, что rebuild_ratings исправляет распределения оценок'
+        )
+
+
+@pytest.mark.django_db
+class TestTitleStats:
+
+    def test_stats_endpoint(self, client, title, user, another_user):
+        Review.objects.create(title=title, author=user,
+                              text='Отзыв', score=4)
+        Review.objects.create(title=title, author=another_user,
+                              text='Отзыв', score=9)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(f'/api/v1/titles/{title.id}/stats/')
+        assert response.status_code == 200
+        assert len(queries) == 2, (
+            'Проверьте, что статистика читается одним запросом '
+            'после версии кеша'
+        )
+        data = response.json()
+        assert data['count'] == 2
+        assert data['mean'] == 6.5
+        assert data['median'] == 6.5
+        assert {int(score): count
+                for score, count in data['histogram'].items()} == {
+            score: int(score in (4, 9)) for score in range(1, 11)
+        }
+
+    def test_stats_without_reviews(self, client, title):
+        response = client.get(f'/api/v1/titles/{title.id}/stats/')
+        assert response.status_code == 200
+        data = response.json()
+        assert (data['count'], data['mean'], data['median']) == (
+            0, None, None
+        )
+
+    def test_stats_not_found(self, client, title):
+        for pk in (title.id + 1, 'abc'):
+            response = client.get(f'/api/v1/titles/{pk}/stats/')
+            assert response.status_code == 404
+
+    def test_stats_conditional_get(self, client, title, user):
+        url = f'/api/v1/titles/{title.id}/stats/'
+        etag = client.get(url)['ETag']
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        Review.objects.create(title=title, author=user,
+                              text='Отзыв', score=5)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что новый отзыв меняет ETag статистики'
+        )
+        assert response.json()['count'] == 1
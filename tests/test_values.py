@@ -0,0 +1,95 @@
+import json
+
+import pytest
+from rest_framework import serializers as drf_serializers
+
+from api import serializers
+from api.cache import get_cache
+from api.values import ValuesSerializer, get_values_plan
+from reviews.models import Comment, Review, Title
+
+
+@pytest.fixture
+def catalogue(title, category, user, another_user):
+    Title.objects.create(name='Без жанров', year=2000, category=category,
+                         description='Описание\nв две строки')
+    review = Review.objects.create(title=title, author=user, text='Отзыв',
+                                   score=7)
+    Review.objects.create(title=title, author=another_user, text='Ещё',
+                          score=10)
+    Comment.objects.create(review=review, author=another_user, text='Ок')
+    Comment.objects.create(review=review, author=user, text='Спасибо')
+    return title, review
+
+
+def assert_same_output(serializer_class, queryset):
+    plan = get_values_plan(serializer_class)
+    assert plan is not None, (
+        f'Проверьте, что для {serializer_class.__name__} '
+        f'строится план values()'
+    )
+    fast = ValuesSerializer(plan.values(queryset), plan=plan).data
+    slow = serializer_class(queryset, many=True).data
+    assert json.dumps(fast) == json.dumps(slow), (
+        f'Проверьте, что вывод {serializer_class.__name__} по values() '
+        f'совпадает с ModelSerializer'
+    )
+
+
+@pytest.mark.django_db
+class TestValuesSerializers:
+
+    def test_titles(self, catalogue):
+        assert_same_output(serializers.TitleSerializer,
+                           Title.objects.order_by('id'))
+
+    def test_reviews(self, catalogue):
+        title, _ = catalogue
+        assert_same_output(serializers.ReviewSerializer, title.reviews.all())
+
+    def test_comments(self, catalogue):
+        _, review = catalogue
+        assert_same_output(serializers.CommentSerializer,
+                           review.comments.all())
+
+    def test_unsupported_fields_fall_back(self):
+        class MethodSerializer(drf_serializers.ModelSerializer):
+            extra = drf_serializers.SerializerMethodField()
+
+            class Meta:
+                model = Title
+                fields = ('id', 'extra')
+
+            def get_extra(self, obj):
+                return obj.id
+
+        assert get_values_plan(MethodSerializer) is None
+
+    @pytest.mark.parametrize('url', [
+        '/api/v1/titles/',
+        '/api/v1/titles/?limit=1&offset=1',
+        '/api/v1/titles/?cursor=',
+        '/api/v1/titles/?genre=drama',
+    ])
+    def test_list_endpoints(self, client, catalogue, url, monkeypatch):
+        fast = client.get(url).content
+        # Второй ответ не должен прийти из кеша первого
+        get_cache().clear()
+        monkeypatch.setattr('api.values.get_values_plan',
+                            lambda *args: None)
+        assert client.get(url).content == fast, (
+            f'Проверьте, что ответ {url} не изменился'
+        )
+
+    def test_review_and_comment_endpoints(self, client, catalogue,
+                                          monkeypatch):
+        title, review = catalogue
+        urls = [
+            f'/api/v1/titles/{title.id}/reviews/',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+            f'/api/v1/titles/{title.id}/reviews/?cursor=&limit=1',
+        ]
+        fast = [client.get(url).content for url in urls]
+        monkeypatch.setattr('api.values.get_values_plan',
+                            lambda *args: None)
+        assert [client.get(url).content for url in urls] == fast
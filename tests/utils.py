@@ -0,0 +1,48 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def count_queries(client, url, **params):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, params)
+    assert response.status_code == 200, (
+        f'Эндпоинт `{url}` вернул код {response.status_code}'
+    )
+    return len(context), response
+
+
+def assert_constant_queries(client, url, expected, limits=(1, 5, 50)):
+    """Проверяет, что число запросов к БД не зависит от размера страницы."""
+    counts = {
+        limit: count_queries(client, url, limit=limit)[0]
+        for limit in limits
+    }
+    assert set(counts.values()) == {expected}, (
+        f'Эндпоинт `{url}` должен выполнять {expected} запроса(ов) к БД '
+        f'при любом размере страницы, получено: {counts}'
+    )
+
+
+def get_plan(queryset):
+    """План запроса; на PostgreSQL с запретом полного сканирования.
+
+    На маленьких таблицах PostgreSQL выбирает Seq Scan даже при наличии
+    индекса, поэтому проверяется, что индексный план вообще возможен.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        cursor.execute('ANALYZE')
+    return queryset.explain()
+
+
+def assert_uses_indexes(queryset, description):
+    plan = get_plan(queryset)
+    full_scans = [
+        line.strip() for line in plan.splitlines()
+        if 'Seq Scan' in line or line.split(maxsplit=3)[-1].startswith('SCAN')
+    ]
+    assert not full_scans, (
+        f'Запрос {description} должен читать таблицы по индексам, '
+        f'а не полным сканированием: {full_scans}'
+    )